@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+
+"""Benchmarks für das Bruchzahl-Modul.
+
+Aufruf: python bench_brueche.py [name ...]
+
+Ohne Argumente werden alle Benchmarks ausgeführt, sonst nur die
+angegebenen (z.B. "gcd").
+"""
+
+import sys
+import math
+import random
+import timeit
+import tracemalloc
+import numpy as np
+
+from brueche import Fraction, FractionArray, gcd, binary_gcd, gcd_array, normalize_arrays
+from brueche import FractionMatrix
+
+
+def best_time(func, repeat=3, number=1):
+    """Beste Laufzeit (in Sekunden) für einen Aufruf von func.
+    """
+    return min(timeit.repeat(func, repeat=repeat, number=number))/number
+
+
+def bench_gcd():
+    """Vergleiche die ggT-Varianten mit math.gcd.
+
+    Gemessen wird jeweils die Zeit für 100000 Paare zufälliger Zahlen
+    der angegebenen Größe, für die Array-Variante ein einziger Aufruf
+    über alle Paare.
+    """
+    rng = random.Random(42)
+    count = 100000
+    print(f"{'Bits':>6} {'math.gcd':>10} {'gcd':>10} {'binary_gcd':>11} "
+          f"{'gcd_array':>10} {'normalize':>10}")
+    for bits in [16, 62, 256]:
+        pairs = [(rng.getrandbits(bits), rng.getrandbits(bits))
+                 for i in range(count)]
+        dtype = 'int64' if bits < 63 else object
+        a = np.array([p[0] for p in pairs], dtype=dtype)
+        b = np.array([p[1] | 1 for p in pairs], dtype=dtype)
+        t_math = best_time(lambda: [math.gcd(x, y) for x, y in pairs])
+        t_gcd = best_time(lambda: [gcd(x, y) for x, y in pairs])
+        t_binary = best_time(lambda: [binary_gcd(x, y) for x, y in pairs])
+        t_array = best_time(lambda: gcd_array(a, b))
+        t_norm = best_time(lambda: normalize_arrays(a, b))
+        print(f"{bits:>6} {t_math:>10.4f} {t_gcd:>10.4f} {t_binary:>11.4f} "
+              f"{t_array:>10.4f} {t_norm:>10.4f}")
+
+
+def bench_fraction_array():
+    """Summe und elementweises Produkt vieler Brüche.
+
+    Vergleicht eine Schleife über Fraction-Objekte mit FractionArray.
+    """
+    rng = np.random.default_rng(42)
+    print(f"{'n':>8} {'sum loop':>10} {'sum array':>10} {'mul loop':>10} {'mul array':>10}")
+    for n in [1000, 10000, 100000]:
+        num = rng.integers(-1000, 1000, n)
+        den = rng.integers(1, 1000, n)
+        fracs = [Fraction(int(z), int(d)) for z, d in zip(num, den)]
+        arr = FractionArray(num, den)
+
+        def loop_sum():
+            total = Fraction(0, 1)
+            for f in fracs:
+                total = total + f
+            return total
+
+        t_loop = best_time(loop_sum, 1) if n <= 10000 else float('nan')
+        t_array = best_time(arr.sum)
+        t_mloop = best_time(lambda: [f * f for f in fracs], 1)
+        t_marray = best_time(lambda: arr * arr)
+        print(f"{n:>8} {t_loop:>10.4f} {t_array:>10.4f} {t_mloop:>10.4f} {t_marray:>10.4f}")
+
+
+def bench_compare():
+    """Sortieren und Duplikate entfernen mit Fraction-Objekten.
+    """
+    rng = random.Random(42)
+    print(f"{'n':>8} {'sorted':>10} {'set':>10}")
+    for n in [10000, 100000, 1000000]:
+        fracs = [Fraction(rng.randint(-1000, 1000), rng.randint(1, 1000))
+                 for i in range(n)]
+        t_sort = best_time(lambda: sorted(fracs), 1)
+        t_set = best_time(lambda: set(fracs), 1)
+        print(f"{n:>8} {t_sort:>10.4f} {t_set:>10.4f}")
+
+
+class DictFraction:
+    """Vergleichsklasse mit dem früheren Layout (Attribute im __dict__).
+    """
+    def __init__(self, numerator, denominator):
+        self.numerator = numerator
+        self.denominator = denominator
+
+
+def bytes_per_instance(factory, n=100000):
+    """Mittlerer Speicherbedarf pro Objekt, gemessen mit tracemalloc.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Die Liste selbst nicht mitzählen
+    return (after - before - sys.getsizeof(objects))/len(objects)
+
+
+def bench_memory():
+    """Speicher pro Bruch: __dict__ gegenüber __slots__.
+
+    Zähler und Nenner sind große Zahlen (keine gecachten kleinen
+    ints), gemessen wird also Objekt plus Attribute. Bei kleinen
+    Werten kommt die Wiederverwendung gemeinsamer Objekte hinzu.
+    """
+    base = 10**6
+    print(f"{'Layout':>24} {'Bytes/Bruch':>12}")
+    print(f"{'__dict__ (vorher)':>24} "
+          f"{bytes_per_instance(lambda i: DictFraction(base + 2*i, base + 2*i + 1)):>12.1f}")
+    print(f"{'__slots__':>24} "
+          f"{bytes_per_instance(lambda i: Fraction(base + 2*i, base + 2*i + 1)):>12.1f}")
+    print(f"{'__dict__, kleine Werte':>24} "
+          f"{bytes_per_instance(lambda i: DictFraction(i % 3, 2)):>12.1f}")
+    print(f"{'__slots__, kleine Werte':>24} "
+          f"{bytes_per_instance(lambda i: Fraction(i % 3, 2)):>12.1f}")
+
+
+def solve_with_fractions(rows, rhs):
+    """Gauß-Jordan mit Fraction-Objekten (Vergleich für bench_matrix).
+    """
+    n = len(rows)
+    work = [[Fraction(int(x), 1) for x in row] + [Fraction(int(b), 1)]
+            for row, b in zip(rows, rhs)]
+    for c in range(n):
+        p = next(i for i in range(c, n) if work[i][c])
+        work[c], work[p] = work[p], work[c]
+        pivot = work[c][c]
+        work[c] = [x / pivot for x in work[c]]
+        for i in range(n):
+            factor = work[i][c]
+            if i != c and factor:
+                work[i] = [x - factor * y for x, y in zip(work[i], work[c])]
+    return [row[n] for row in work]
+
+
+def bench_matrix():
+    """Exaktes Lösen ganzzahliger Gleichungssysteme A*x = b.
+
+    Verglichen werden Gauß-Jordan mit Fraction-Objekten (nur bis
+    n = 40) und die bruchfreie Bareiss-Elimination von FractionMatrix,
+    dazu Determinante und Inverse. Die Einträge liegen in [-99, 99].
+    """
+    rng = np.random.default_rng(11)
+    print(f"{'n':>5} {'Fraction':>10} {'solve':>10} {'det':>10} {'inverse':>10} {'Stellen':>8}")
+    for n in [10, 20, 40, 70, 100]:
+        rows = rng.integers(-99, 100, (n, n))
+        rhs = rng.integers(-99, 100, n)
+        a = FractionMatrix(rows)
+        t_objects = best_time(lambda: solve_with_fractions(rows, rhs), 1) \
+            if n <= 40 else float('nan')
+        if n <= 40:
+            x = a.solve(rhs)
+            assert x.to_fractions() == solve_with_fractions(rows, rhs)
+        t_solve = best_time(lambda: a.solve(rhs), 1)
+        t_det = best_time(a.det, 1)
+        t_inverse = best_time(a.inverse, 1)
+        digits = len(str(abs(a.det().get_numerator())))
+        print(f"{n:>5} {t_objects:>10.4f} {t_solve:>10.4f} {t_det:>10.4f} "
+              f"{t_inverse:>10.4f} {digits:>8}")
+
+
+BENCHMARKS = {
+    "gcd": bench_gcd,
+    "fraction_array": bench_fraction_array,
+    "compare": bench_compare,
+    "memory": bench_memory,
+    "matrix": bench_matrix,
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"### {name}")
+        BENCHMARKS[name]()
+        print()
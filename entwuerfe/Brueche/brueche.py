@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class FractionError(Exception):
     """
     Für eigene Fehler, die mit Bruchzahlen auftreten können.
@@ -7,48 +10,136 @@ class FractionError(Exception):
 def gcd(a, b):
     """
     Berechne den größten gemeinsamen Teiler (greatest common divisor)
-    von zwei positiven Ganzzahlen mit dem Algorithmus von Euklid.
+    von zwei Ganzzahlen mit dem Algorithmus von Euklid.
+
+    Iterativ und mit Rest-Division statt Subtraktion, damit die
+    Laufzeit logarithmisch in der Größe der Zahlen ist und auch
+    gcd(10**12, 1) nicht an die Rekursionsgrenze stößt. Das Ergebnis
+    ist nie negativ.
+    """
+    a = abs(a)
+    b = abs(b)
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def binary_gcd(a, b):
+    """
+    Größter gemeinsamer Teiler mit dem binären Algorithmus von Stein.
+
+    Kommt ohne Division aus: gemeinsame Zweierpotenzen werden
+    abgespalten, danach wird nur noch subtrahiert und geshiftet.
     """
+    a = abs(a)
+    b = abs(b)
     if a == 0:
         return b
     if b == 0:
         return a
-    c = a - b
+    # Anzahl der gemeinsamen Faktoren 2 (niedrigstes gesetztes Bit)
+    shift = ((a | b) & -(a | b)).bit_length() - 1
+    a >>= (a & -a).bit_length() - 1
+    while b:
+        b >>= (b & -b).bit_length() - 1
+        if a > b:
+            a, b = b, a
+        b -= a
+    return a << shift
+
+
+def gcd_array(a, b):
+    """
+    Elementweiser größter gemeinsamer Teiler zweier Arrays.
 
-    if a < 0:
-        a = a * -1
-    if b < 0:
-        b = b * -1
-    if c < 0:
-        c = c * -1
+    Verwendet den ufunc np.gcd, der sowohl für int64- als auch für
+    object-Arrays mit Python-ints funktioniert.
+    """
+    return np.gcd(np.asarray(a), np.asarray(b))
 
-    if a <= b:
-        return gcd(c, a)
-    else:
-        return gcd(c, b)
 
+def normalize_arrays(numerators, denominators):
+    """
+    Normalisiere viele Brüche auf einmal.
 
-class Fraction:
-    def __init__(self, numerator, denominator):
-        self.numerator = numerator
-        self.denominator = denominator
+    Gibt zwei neue Arrays zurück, in denen jeder Bruch gekürzt ist,
+    der Nenner positiv ist und 0 als 0/1 dargestellt wird.
+    """
+    numerators = np.asarray(numerators)
+    denominators = np.asarray(denominators)
+    if np.any(denominators == 0):
+        raise FractionError("Denominator cannot be zero")
+    divisor = gcd_array(numerators, denominators)
+    divisor = np.where(denominators < 0, -divisor, divisor)
+    return numerators // divisor, denominators // divisor
 
-        gcd_value = gcd(self.numerator, self.denominator)
 
-        if gcd_value != 1:
-            self.numerator //= gcd_value
-            self.denominator //= gcd_value
+# Kleine Werte (0, ±1, 1/2, ...) werden nur einmal erzeugt und dann
+# wiederverwendet, wenn Fraction.intern_small gesetzt ist
+_INTERN_LIMIT = 16
+_interned = {}
 
-        if self.denominator < 0:
-            self.denominator *= -1
-            self.numerator *= -1
 
-        if self.numerator == 0:
-            self.denominator = 1
+class Fraction:
+    """
+    Unveränderliche, immer normalisierte Bruchzahl.
 
-        if self.denominator == 0:
+    Statt eines __dict__ pro Objekt gibt es nur die beiden Slots für
+    Zähler und Nenner.
+    """
+    __slots__ = ('numerator', 'denominator')
+
+    # Kleine Brüche (|Zähler|, Nenner <= _INTERN_LIMIT) wiederverwenden
+    intern_small = True
+
+    def __new__(cls, numerator, denominator):
+        if denominator == 0:
             raise FractionError("Denominator cannot be zero")
 
+        gcd_value = gcd(numerator, denominator)
+
+        if gcd_value != 1:
+            numerator //= gcd_value
+            denominator //= gcd_value
+
+        if denominator < 0:
+            denominator *= -1
+            numerator *= -1
+
+        if numerator == 0:
+            denominator = 1
+
+        return cls._from_normalized(numerator, denominator)
+
+    @classmethod
+    def _from_normalized(cls, numerator, denominator):
+        """
+        Erzeuge einen Bruch aus bereits normalisiertem Zähler und
+        Nenner, ohne erneut zu kürzen.
+        """
+        small = cls.intern_small and denominator <= _INTERN_LIMIT and \
+            -_INTERN_LIMIT <= numerator <= _INTERN_LIMIT
+        if small:
+            key = (cls, numerator, denominator)
+            cached = _interned.get(key)
+            if cached is not None:
+                return cached
+        res = object.__new__(cls)
+        object.__setattr__(res, 'numerator', numerator)
+        object.__setattr__(res, 'denominator', denominator)
+        if small:
+            _interned[key] = res
+        return res
+
+    def __setattr__(self, name, value):
+        raise FractionError("Fractions are immutable")
+
+    def __delattr__(self, name):
+        raise FractionError("Fractions are immutable")
+
+    def __reduce__(self):
+        return (type(self), (self.numerator, self.denominator))
+
     def get_numerator(self):
         return self.numerator
 
@@ -62,7 +153,11 @@ class Fraction:
         return f"{self.numerator}/{self.denominator}"
 
     def reciprocal(self):
-        return Fraction(self.denominator, self.numerator)
+        if self.numerator == 0:
+            raise FractionError("Denominator cannot be zero")
+        if self.numerator < 0:
+            return self._from_normalized(-self.denominator, -self.numerator)
+        return self._from_normalized(self.denominator, self.numerator)
 
     def same_denominator(self, self_numerator, self_denominator, other_numerator, other_denominator):
         if self_denominator != other_denominator:
@@ -76,24 +171,42 @@ class Fraction:
             return self_numerator, other_numerator, self_denominator
 
     def __lt__(self, other):
-        new_self_numerator, new_other_numerator, new_denominator = self.same_denominator(self.numerator, self.denominator, other.numerator, other.denominator)
-        return new_self_numerator < new_other_numerator
+        """
+        Vergleich ohne gemeinsamen Nenner: bei gleichem Nenner reicht
+        der Vergleich der Zähler, bei unterschiedlichen Vorzeichen das
+        Vorzeichen. Erst danach wird über Kreuz multipliziert (die
+        Nenner sind immer positiv). Die anderen Vergleiche werden auf
+        __lt__ zurückgeführt.
+        """
+        self_denominator = self.denominator
+        other_denominator = other.denominator
+        if self_denominator == other_denominator:
+            return self.numerator < other.numerator
+        self_numerator = self.numerator
+        other_numerator = other.numerator
+        if (self_numerator < 0) != (other_numerator < 0):
+            return self_numerator < other_numerator
+        return self_numerator * other_denominator < other_numerator * self_denominator
 
     def __le__(self, other):
-        new_self_numerator, new_other_numerator, new_denominator = self.same_denominator(self.numerator, self.denominator, other.numerator, other.denominator)
-        return new_self_numerator <= new_other_numerator
+        return not other < self
 
     def __gt__(self, other):
-        new_self_numerator, new_other_numerator, new_denominator = self.same_denominator(self.numerator, self.denominator, other.numerator, other.denominator)
-        return new_self_numerator > new_other_numerator
+        return other < self
 
     def __ge__(self, other):
-        new_self_numerator, new_other_numerator, new_denominator = self.same_denominator(self.numerator, self.denominator, other.numerator, other.denominator)
-        return new_self_numerator >= new_other_numerator
+        return not self < other
 
     def __eq__(self, other):
+        if not isinstance(other, Fraction):
+            return NotImplemented
         return self.numerator == other.numerator and self.denominator == other.denominator
 
+    def __hash__(self):
+        # Brüche sind immer normalisiert, gleiche Werte haben also
+        # gleiche Zähler und Nenner
+        return hash((self.numerator, self.denominator))
+
     def __add__(self, other):
         new_self_numerator, new_other_numerator, new_denominator = self.same_denominator(self.numerator, self.denominator, other.numerator, other.denominator)
 
@@ -117,8 +230,9 @@ class Fraction:
         return Fraction(result_numerator, result_denominator)
 
     def __truediv__(self, other):
-        result_numerator = self.numerator * other.reciprocal().numerator
-        result_denominator = self.denominator * other.reciprocal().denominator
+        # Multiplikation mit dem Kehrwert, ohne ihn als Objekt zu erzeugen
+        result_numerator = self.numerator * other.denominator
+        result_denominator = self.denominator * other.numerator
 
         return Fraction(result_numerator, result_denominator)
 
@@ -129,4 +243,610 @@ class Fraction:
         return float(self.numerator) / float(self.denominator)
 
     def __neg__(self):
-        return Fraction(-self.numerator, self.denominator)
+        return self._from_normalized(-self.numerator, self.denominator)
+
+
+# Grenze, unter der Produkte zweier int64-Werte (plus eine Addition)
+# sicher nicht überlaufen
+_INT64_SAFE_PRODUCT = 2.0**62
+
+
+def _as_int_array(values):
+    """
+    Wandle values in ein 1d-Array ganzer Zahlen um (int64, oder
+    object mit Python-ints, falls die Werte nicht in int64 passen).
+    """
+    try:
+        res = np.asarray(values)
+    except OverflowError:
+        res = np.asarray(values, dtype=object)
+    if res.size == 0:
+        res = res.astype(np.int64)
+    elif res.dtype.kind == 'u':
+        res = res.astype(object) if res.size and res.max() > np.iinfo(np.int64).max \
+            else res.astype(np.int64)
+    elif res.dtype.kind in 'ib':
+        res = res.astype(np.int64)
+    elif res.dtype.kind == 'O':
+        if not all(isinstance(x, (int, np.integer)) for x in res.flat):
+            raise FractionError("Numerators and denominators must be integers")
+        res = np.array([int(x) for x in res.flat], dtype=object).reshape(res.shape)
+    else:
+        raise FractionError("Numerators and denominators must be integers")
+    return res
+
+
+def _compact(*arrays):
+    """
+    Wandle object-Arrays zurück nach int64, wenn alle Werte passen.
+    """
+    if all(a.dtype != object for a in arrays):
+        return arrays
+    limit = np.iinfo(np.int64).max
+    if all(a.size == 0 or np.abs(a).max() <= limit for a in arrays):
+        return tuple(a.astype(np.int64) for a in arrays)
+    return tuple(a.astype(object) for a in arrays)
+
+
+def _products_safe(*pairs):
+    """
+    Können alle elementweisen Produkte x*y der Paare in int64
+    berechnet werden (mit Reserve für eine anschließende Addition)?
+    """
+    for x, y in pairs:
+        if x.dtype == object or y.dtype == object:
+            return False
+        bound = np.abs(x.astype(np.float64)) * np.abs(y.astype(np.float64))
+        if bound.size and bound.max() >= _INT64_SAFE_PRODUCT:
+            return False
+    return True
+
+
+def _widen(*arrays):
+    """
+    Alle Arrays als object-Arrays mit Python-ints (kein Überlauf).
+    """
+    return tuple(a.astype(object) for a in arrays)
+
+
+def _add_arrays(a, b, c, d, sign=1):
+    """
+    Elementweise a/b + sign*c/d, normalisiert.
+    """
+    if not _products_safe((a, d), (c, b), (b, d)):
+        a, b, c, d = _widen(a, b, c, d)
+    return _compact(*normalize_arrays(a * d + sign * (c * b), b * d))
+
+
+def _mul_arrays(a, b, c, d):
+    """
+    Elementweise (a/b) * (c/d), normalisiert.
+    """
+    if not _products_safe((a, c), (b, d)):
+        a, b, c, d = _widen(a, b, c, d)
+    return _compact(*normalize_arrays(a * c, b * d))
+
+
+class FractionArray:
+    """
+    Ein Array von Bruchzahlen, gespeichert als zwei Arrays für Zähler
+    und Nenner (int64, bei Bedarf object-Arrays mit Python-ints).
+
+    Alle Operationen arbeiten elementweise auf dem ganzen Array, die
+    Normalisierung erfolgt in einem vektorisierten Durchlauf. Der
+    zweite Operand kann auch ein einzelner Fraction oder ein int sein.
+    """
+    def __init__(self, numerators, denominators=None):
+        numerators = _as_int_array(numerators)
+        if denominators is None:
+            denominators = np.ones_like(numerators)
+        denominators = _as_int_array(denominators)
+        if numerators.ndim != 1 or numerators.shape != denominators.shape:
+            raise FractionError("Numerators and denominators must be 1d arrays of equal length")
+        self.numerators, self.denominators = \
+            _compact(*normalize_arrays(numerators, denominators))
+
+    @staticmethod
+    def _from_normalized(numerators, denominators):
+        """
+        Erzeuge ein FractionArray ohne erneute Normalisierung.
+        """
+        res = FractionArray.__new__(FractionArray)
+        res.numerators = numerators
+        res.denominators = denominators
+        return res
+
+    @staticmethod
+    def from_fractions(fractions):
+        """
+        Erzeuge ein FractionArray aus einer Liste von Fraction-Objekten.
+        """
+        return FractionArray([f.get_numerator() for f in fractions],
+                             [f.get_denominator() for f in fractions])
+
+    def to_fractions(self):
+        """
+        Wandle in eine Liste von Fraction-Objekten um.
+        """
+        return [Fraction(int(n), int(d)) for n, d in
+                zip(self.numerators, self.denominators)]
+
+    def __len__(self):
+        return len(self.numerators)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return Fraction(int(self.numerators[key]), int(self.denominators[key]))
+        return FractionArray._from_normalized(self.numerators[key],
+                                              self.denominators[key])
+
+    def __repr__(self):
+        return f"FractionArray({list(self.numerators)},{list(self.denominators)})"
+
+    def __str__(self):
+        return "[" + ", ".join(f"{n}/{d}" for n, d in
+                               zip(self.numerators, self.denominators)) + "]"
+
+    def _operand(self, other):
+        """
+        Zähler und Nenner des zweiten Operanden als Arrays.
+        """
+        if isinstance(other, FractionArray):
+            if len(other) != len(self):
+                raise FractionError("Both arrays need to be the same length")
+            return other.numerators, other.denominators
+        if isinstance(other, Fraction):
+            return _as_int_array(other.get_numerator()), \
+                _as_int_array(other.get_denominator())
+        if isinstance(other, (int, np.integer)):
+            return _as_int_array(other), _as_int_array(1)
+        raise FractionError("Operand must be a FractionArray, a Fraction or an integer")
+
+    def __add__(self, other):
+        c, d = self._operand(other)
+        return FractionArray._from_normalized(
+            *_add_arrays(self.numerators, self.denominators, c, d))
+
+    def __sub__(self, other):
+        c, d = self._operand(other)
+        return FractionArray._from_normalized(
+            *_add_arrays(self.numerators, self.denominators, c, d, -1))
+
+    def __mul__(self, other):
+        c, d = self._operand(other)
+        return FractionArray._from_normalized(
+            *_mul_arrays(self.numerators, self.denominators, c, d))
+
+    def __truediv__(self, other):
+        c, d = self._operand(other)
+        if np.any(c == 0):
+            raise FractionError("Division by zero")
+        return FractionArray._from_normalized(
+            *_mul_arrays(self.numerators, self.denominators, d, c))
+
+    def __radd__(self, other):
+        return self + other
+
+    def __rsub__(self, other):
+        c, d = self._operand(other)
+        return FractionArray._from_normalized(
+            *_add_arrays(c, d, self.numerators, self.denominators, -1))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __rtruediv__(self, other):
+        c, d = self._operand(other)
+        if np.any(self.numerators == 0):
+            raise FractionError("Division by zero")
+        return FractionArray._from_normalized(
+            *_mul_arrays(c, d, self.denominators, self.numerators))
+
+    def __neg__(self):
+        return FractionArray._from_normalized(-self.numerators, self.denominators)
+
+    def _cross(self, other):
+        """
+        Über Kreuz multiplizierte Zähler für Vergleiche: a/b < c/d
+        genau dann, wenn a*d < c*b (Nenner sind positiv).
+        """
+        a, b = self.numerators, self.denominators
+        c, d = self._operand(other)
+        if not _products_safe((a, d), (c, b)):
+            a, b, c, d = _widen(a, b, c, d)
+        return a * d, c * b
+
+    def __eq__(self, other):
+        c, d = self._operand(other)
+        return (self.numerators == c) & (self.denominators == d)
+
+    def __ne__(self, other):
+        return ~(self == other)
+
+    def __lt__(self, other):
+        left, right = self._cross(other)
+        return np.asarray(left < right, dtype=bool)
+
+    def __le__(self, other):
+        left, right = self._cross(other)
+        return np.asarray(left <= right, dtype=bool)
+
+    def __gt__(self, other):
+        left, right = self._cross(other)
+        return np.asarray(left > right, dtype=bool)
+
+    def __ge__(self, other):
+        left, right = self._cross(other)
+        return np.asarray(left >= right, dtype=bool)
+
+    def _reduce(self, combine, neutral):
+        """
+        Paarweise Reduktion: in jedem Schritt werden die Elemente
+        0+1, 2+3, ... gleichzeitig verknüpft, nach log2(n) Schritten
+        bleibt ein Bruch übrig.
+        """
+        num, den = self.numerators, self.denominators
+        if len(num) == 0:
+            return Fraction(neutral, 1)
+        while len(num) > 1:
+            if len(num) % 2:
+                num = np.append(num, np.array([neutral], dtype=num.dtype))
+                den = np.append(den, np.array([1], dtype=den.dtype))
+            num, den = combine(num[0::2], den[0::2], num[1::2], den[1::2])
+        return Fraction(int(num[0]), int(den[0]))
+
+    def sum(self):
+        """
+        Exakte Summe aller Elemente als Fraction.
+        """
+        return self._reduce(_add_arrays, 0)
+
+    def prod(self):
+        """
+        Exaktes Produkt aller Elemente als Fraction.
+        """
+        return self._reduce(_mul_arrays, 1)
+
+    def to_float(self):
+        """
+        Gleitkommawerte aller Elemente als float64-Array.
+        """
+        if self.numerators.dtype == object:
+            # int/int rundet bei Python-ints korrekt
+            return np.array([n / d for n, d in
+                             zip(self.numerators, self.denominators)],
+                            dtype=np.float64)
+        return self.numerators / self.denominators
+
+    def argsort(self):
+        """
+        Indizes, die das Array aufsteigend sortieren.
+
+        Sortiert wird nach den Gleitkommawerten, danach wird die
+        Reihenfolge benachbarter Elemente exakt geprüft. Nur wenn die
+        Rundung die Reihenfolge verfälscht hat, wird exakt sortiert.
+        """
+        order = np.argsort(self.to_float(), kind='stable')
+        ordered = self[order]
+        if len(order) < 2 or not np.any(ordered[1:] < ordered[:-1]):
+            return order
+        keys = self.to_fractions()
+        return np.array(sorted(range(len(keys)), key=lambda i: keys[i]),
+                        dtype=np.intp)
+
+    def sort(self):
+        """
+        Aufsteigend sortierte Kopie.
+        """
+        return self[self.argsort()]
+
+
+def _row_lcm(denominators):
+    """
+    Kleinstes gemeinsames Vielfaches der Nenner jeder Zeile (als
+    Python-ints, damit nichts überläuft).
+    """
+    if denominators.shape[1] == 0:
+        return np.ones(denominators.shape[0], dtype=object)
+    return np.lcm.reduce(denominators.astype(object), axis=1)
+
+
+def bareiss_reduce(work, columns=None):
+    """
+    Bruchfreie Gauß-Jordan-Elimination nach Bareiss, direkt auf dem
+    ganzzahligen object-Array work (mit Python-ints).
+
+    Pivots werden nur in den ersten columns Spalten gesucht (Standard:
+    alle), Spalten ohne Pivot werden übersprungen. In jedem Schritt
+    wird mit dem neuen Pivot p multipliziert und durch den vorigen
+    Pivot q geteilt:
+
+        work[i, j] = (p*work[i, j] - work[i, c]*work[r, j]) // q
+
+    Die Division geht immer auf, denn alle Einträge sind
+    Unterdeterminanten der Ausgangsmatrix. Es entstehen also nie
+    Brüche, und die Zahlen wachsen nur so stark wie die Determinanten.
+    Am Ende ist work = p*RREF für den letzten Pivot p (bei voller
+    Rangzahl einer quadratischen Matrix die Determinante bis auf das
+    Vorzeichen).
+
+    Gibt (Pivotspalten, letzter Pivot, Vorzeichen der
+    Zeilenvertauschungen) zurück.
+    """
+    m, n = work.shape
+    if columns is None:
+        columns = n
+    pivots = []
+    skipped = []
+    previous = 1
+    sign = 1
+    row = 0
+    for col in range(columns):
+        if row == m:
+            break
+        candidates = np.flatnonzero(work[row:, col] != 0)
+        if len(candidates) == 0:
+            skipped.append(col)
+            continue
+        r = row+candidates[0]
+        if r != row:
+            work[[row, r]] = work[[r, row]]
+            sign = -sign
+        pivot = work[row, col]
+        factors = work[:, col].copy()
+        # Alle noch nicht fertigen Spalten: rechts vom Pivot und die
+        # übersprungenen Spalten links davon
+        for part in (slice(col+1, n), skipped):
+            if isinstance(part, list) and not part:
+                continue
+            pivot_row = work[row, part].copy()
+            work[:, part] = (pivot*work[:, part] - np.outer(factors, pivot_row)) // previous
+            work[row, part] = pivot_row
+        work[:, col] = 0
+        pivots.append(col)
+        previous = pivot
+        row += 1
+    # Pivot-Einträge wurden nicht mitgerechnet, sie sind alle gleich
+    # dem letzten Pivot
+    work[np.arange(len(pivots)), pivots] = previous
+    return pivots, previous, sign
+
+
+class FractionMatrix:
+    """
+    Eine Matrix von Bruchzahlen für exakte lineare Algebra,
+    gespeichert wie FractionArray als zwei 2d-Arrays für Zähler und
+    Nenner.
+
+    Determinante, Rang, reduzierte Stufenform, Inverse und das Lösen
+    von Gleichungssystemen laufen über bareiss_reduce(): Jede Zeile
+    wird mit dem kgV ihrer Nenner ganzzahlig gemacht, eliminiert wird
+    nur mit ganzen Zahlen, und erst das Ergebnis wird in einem
+    vektorisierten Durchlauf zu Brüchen gekürzt.
+    """
+    def __init__(self, numerators, denominators=None):
+        numerators = _as_int_array(numerators)
+        if denominators is None:
+            denominators = np.ones_like(numerators)
+        denominators = _as_int_array(denominators)
+        if numerators.ndim != 2 or numerators.shape != denominators.shape:
+            raise FractionError("Numerators and denominators must be 2d arrays of equal shape")
+        self.numerators, self.denominators = \
+            _compact(*normalize_arrays(numerators, denominators))
+        self.shape = self.numerators.shape
+
+    @staticmethod
+    def _from_normalized(numerators, denominators):
+        """
+        Erzeuge eine FractionMatrix ohne erneute Normalisierung.
+        """
+        res = FractionMatrix.__new__(FractionMatrix)
+        res.numerators, res.denominators = _compact(numerators, denominators)
+        res.shape = res.numerators.shape
+        return res
+
+    @staticmethod
+    def _from_integers(numerators, denominators):
+        """
+        Kürze ganzzahlige Ergebnisse (object-Arrays) zu einer
+        FractionMatrix, das ist der abschließende Normalisierungsschritt.
+        """
+        numerators = np.asarray(numerators, dtype=object)
+        denominators = np.broadcast_to(np.asarray(denominators, dtype=object),
+                                       numerators.shape)
+        return FractionMatrix._from_normalized(*normalize_arrays(numerators, denominators))
+
+    @staticmethod
+    def from_fractions(rows):
+        """
+        Erzeuge eine FractionMatrix aus einer Liste von Zeilen mit
+        Fraction-Objekten oder ganzen Zahlen.
+        """
+        rows = [[Fraction(x, 1) if isinstance(x, (int, np.integer)) else x for x in row]
+                for row in rows]
+        return FractionMatrix([[x.get_numerator() for x in row] for row in rows],
+                              [[x.get_denominator() for x in row] for row in rows])
+
+    @staticmethod
+    def identity(n):
+        """
+        Einheitsmatrix der Dimension n.
+        """
+        return FractionMatrix._from_normalized(np.eye(n, dtype=np.int64),
+                                               np.ones((n, n), dtype=np.int64))
+
+    def to_fractions(self):
+        """
+        Wandle in eine Liste von Zeilen mit Fraction-Objekten um.
+        """
+        return [[Fraction(int(n), int(d)) for n, d in zip(num_row, den_row)]
+                for num_row, den_row in zip(self.numerators, self.denominators)]
+
+    def to_float(self):
+        """
+        Gleitkommawerte aller Elemente als float64-Array.
+        """
+        if self.numerators.dtype == object:
+            return np.array([[n / d for n, d in zip(num_row, den_row)]
+                             for num_row, den_row in zip(self.numerators, self.denominators)],
+                            dtype=np.float64).reshape(self.shape)
+        return self.numerators / self.denominators
+
+    def __getitem__(self, key):
+        """
+        m[i, j] ist ein Fraction, eine Zeile m[i] oder Spalte m[:, j]
+        ein FractionArray, Teilbereiche mit Slices eine FractionMatrix.
+        """
+        numerators, denominators = self.numerators[key], self.denominators[key]
+        if numerators.ndim == 0:
+            return Fraction(int(numerators), int(denominators))
+        if numerators.ndim == 1:
+            return FractionArray._from_normalized(numerators, denominators)
+        return FractionMatrix._from_normalized(numerators, denominators)
+
+    def __repr__(self):
+        return f"FractionMatrix({self.numerators.tolist()},{self.denominators.tolist()})"
+
+    def __str__(self):
+        return "\n".join("[" + ", ".join(f"{n}/{d}" for n, d in zip(num_row, den_row)) + "]"
+                         for num_row, den_row in zip(self.numerators, self.denominators))
+
+    def __eq__(self, other):
+        if not isinstance(other, FractionMatrix):
+            return NotImplemented
+        return self.shape == other.shape and \
+            bool(np.all(self.numerators == other.numerators)) and \
+            bool(np.all(self.denominators == other.denominators))
+
+    def transpose(self):
+        return FractionMatrix._from_normalized(self.numerators.T.copy(), self.denominators.T.copy())
+
+    def _same_shape(self, other):
+        if not isinstance(other, FractionMatrix) or other.shape != self.shape:
+            raise FractionError("Both matrices need to be the same shape")
+
+    def __add__(self, other):
+        self._same_shape(other)
+        return FractionMatrix._from_normalized(*_add_arrays(
+            self.numerators, self.denominators, other.numerators, other.denominators))
+
+    def __sub__(self, other):
+        self._same_shape(other)
+        return FractionMatrix._from_normalized(*_add_arrays(
+            self.numerators, self.denominators, other.numerators, other.denominators, -1))
+
+    def __neg__(self):
+        return FractionMatrix._from_normalized(-self.numerators, self.denominators)
+
+    def __mul__(self, other):
+        """
+        Matrixprodukt, oder Multiplikation mit einem Fraction/int.
+
+        Für das Matrixprodukt werden die Zeilen von self und die
+        Spalten von other ganzzahlig gemacht, multipliziert wird dann
+        nur mit ganzen Zahlen.
+        """
+        if isinstance(other, (Fraction, int, np.integer)):
+            if not isinstance(other, Fraction):
+                other = Fraction(int(other), 1)
+            return FractionMatrix._from_normalized(*_mul_arrays(
+                self.numerators, self.denominators,
+                _as_int_array(other.get_numerator()), _as_int_array(other.get_denominator())))
+        if not isinstance(other, FractionMatrix):
+            raise FractionError("Can only multiply with a FractionMatrix, a Fraction or an integer")
+        if self.shape[1] != other.shape[0]:
+            raise FractionError("Matrices are not compatible for multiplication")
+        left, row_scale = self._integer_rows()
+        right, col_scale = other.transpose()._integer_rows()
+        return FractionMatrix._from_integers(np.dot(left, right.T),
+                                             np.outer(row_scale, col_scale))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def _integer_rows(self, extra=None):
+        """
+        Ganzzahliges object-Array [self | extra], jede Zeile mit dem
+        kgV ihrer Nenner multipliziert, und die Faktoren der Zeilen.
+        """
+        numerators, denominators = self.numerators, self.denominators
+        if extra is not None:
+            numerators = np.hstack((numerators.astype(object), extra.numerators.astype(object)))
+            denominators = np.hstack((denominators.astype(object), extra.denominators.astype(object)))
+        scale = _row_lcm(denominators)
+        work = numerators.astype(object) * (scale[:, np.newaxis] // denominators.astype(object))
+        return work, scale
+
+    def _check_square(self):
+        if self.shape[0] != self.shape[1]:
+            raise FractionError("Matrix needs to be square")
+
+    def det(self):
+        """
+        Exakte Determinante als Fraction.
+        """
+        self._check_square()
+        n = self.shape[0]
+        if n == 0:
+            return Fraction(1, 1)
+        work, scale = self._integer_rows()
+        pivots, last, sign = bareiss_reduce(work)
+        if len(pivots) < n:
+            return Fraction(0, 1)
+        return Fraction(sign*last, int(np.prod(scale)))
+
+    def rank(self):
+        """
+        Rang der Matrix (Anzahl der Pivotspalten).
+        """
+        work, scale = self._integer_rows()
+        return len(bareiss_reduce(work)[0])
+
+    def rref(self):
+        """
+        Reduzierte Zeilenstufenform und die Liste der Pivotspalten.
+        """
+        work, scale = self._integer_rows()
+        pivots, last, sign = bareiss_reduce(work)
+        if not pivots:
+            return FractionMatrix._from_integers(work, 1), pivots
+        return FractionMatrix._from_integers(work, last), pivots
+
+    def inverse(self):
+        """
+        Exakte Inverse über die Elimination von [A | I].
+        """
+        self._check_square()
+        n = self.shape[0]
+        work, scale = self._integer_rows(FractionMatrix.identity(n))
+        pivots, last, sign = bareiss_reduce(work, n)
+        if len(pivots) < n:
+            raise FractionError("Matrix is singular")
+        # Aus [S*A | S*I] mit den Zeilenfaktoren S wird
+        # last*[I | (S*A)^-1*S] = last*[I | A^-1]
+        return FractionMatrix._from_integers(work[:, n:], last)
+
+    def solve(self, b):
+        """
+        Löse A*x = b exakt. b ist ein FractionArray (Ergebnis ebenso),
+        eine Liste ganzer Zahlen oder eine FractionMatrix mit mehreren
+        rechten Seiten als Spalten (Ergebnis FractionMatrix).
+        """
+        self._check_square()
+        n = self.shape[0]
+        single = not isinstance(b, FractionMatrix)
+        if single:
+            if not isinstance(b, FractionArray):
+                b = FractionArray(b)
+            b = FractionMatrix._from_normalized(b.numerators[:, np.newaxis],
+                                                b.denominators[:, np.newaxis])
+        if b.shape[0] != n:
+            raise FractionError("Right-hand side does not match the matrix")
+        work, scale = self._integer_rows(b)
+        pivots, last, sign = bareiss_reduce(work, n)
+        if len(pivots) < n:
+            raise FractionError("Matrix is singular")
+        res = FractionMatrix._from_integers(work[:, n:], last)
+        if single:
+            return res[:, 0]
+        return res
@@ -18,7 +18,13 @@ Multiplikation mit dem Kehrwert.
 
 import unittest
 import re
-from brueche import Fraction, gcd, FractionError
+import math
+import numpy as np
+import copy
+import fractions
+import pickle
+from brueche import Fraction, FractionArray, gcd, binary_gcd, gcd_array, normalize_arrays, FractionError
+from brueche import FractionMatrix, bareiss_reduce
 
 # Tests in der Reihenfolge, wie sie programmiert sind, ausführen
 unittest.TestLoader.sortTestMethodsUsing = None
@@ -184,6 +190,268 @@ class TestFractions(unittest.TestCase):
     def test_14_misc(self):
         self.assertEqual(-self.m, Fraction(-1, 1) * self.m)
 
+    def test_15_gcd(self):
+        for a, b in [(12, 18), (-12, 18), (12, -18), (0, 5), (0, -5),
+                     (0, 0), (17, 1), (10**12, 1), (2**40, 2**35 * 3)]:
+            self.assertEqual(gcd(a, b), math.gcd(a, b))
+            self.assertEqual(binary_gcd(a, b), math.gcd(a, b))
+        self.assertEqual(Fraction(10**12, 10**12 + 1).get_denominator(), 10**12 + 1)
+
+    def test_16_gcd_arrays(self):
+        a = np.array([12, -12, 0, 7, 10**12])
+        b = np.array([18, 18, -5, 3, 4])
+        self.assertEqual(list(gcd_array(a, b)), [6, 6, 5, 1, 4])
+        num, den = normalize_arrays(a, b)
+        self.assertEqual(list(num), [2, -2, 0, 7, 250000000000])
+        self.assertEqual(list(den), [3, 3, 1, 3, 1])
+        for z, n, fraction in zip(num, den, [Fraction(x, y) for x, y in zip(a, b)]):
+            self.assertEqual(z, fraction.get_numerator())
+            self.assertEqual(n, fraction.get_denominator())
+
+        big = np.array([3 * 10**30, -10**30], dtype=object)
+        num, den = normalize_arrays(big, np.array([6, 4], dtype=object))
+        self.assertEqual(list(num), [10**30 // 2, -10**30 // 4])
+        self.assertEqual(list(den), [1, 1])
+
+        testflag = False
+        try:
+            normalize_arrays(a, np.array([1, 0, 1, 1, 1]))
+        except FractionError as err:
+            testflag = True
+        self.assertTrue(testflag)
+
+    def test_17_fraction_array(self):
+        a = FractionArray.from_fractions([self.m, self.n, self.o, self.p])
+        b = FractionArray([3, -1, 7, 5], [4, 6, 2, 3])
+        self.assertEqual(len(a), 4)
+        self.assertEqual(a.to_fractions(), [self.m, self.n, self.o, self.p])
+        self.assertEqual(a[3], self.p)
+        self.assertEqual(FractionArray([2, 0], [-4, -3]).to_fractions(),
+                         [Fraction(-1, 2), Fraction(0, 1)])
+
+        pairs = list(zip(a.to_fractions(), b.to_fractions()))
+        self.assertEqual((a + b).to_fractions(), [x + y for x, y in pairs])
+        self.assertEqual((a - b).to_fractions(), [x - y for x, y in pairs])
+        self.assertEqual((a * b).to_fractions(), [x * y for x, y in pairs])
+        self.assertEqual((a / b).to_fractions(), [x / y for x, y in pairs])
+        self.assertEqual((a * 2).to_fractions(), [x * Fraction(2, 1) for x in a.to_fractions()])
+        self.assertEqual((1 - b).to_fractions(), [Fraction(1, 1) - y for y in b.to_fractions()])
+        self.assertEqual((2 / b).to_fractions(), [Fraction(2, 1) / y for y in b.to_fractions()])
+        self.assertEqual((a + self.m)[0], Fraction(1, 1))
+        self.assertEqual(list(a < b), [x < y for x, y in pairs])
+        self.assertEqual(list(a >= b), [x >= y for x, y in pairs])
+        self.assertEqual(list(a == a), [True] * 4)
+
+        testflag = False
+        try:
+            b / a
+        except FractionError as err:
+            testflag = True
+        self.assertTrue(testflag)
+
+        testflag = False
+        try:
+            1 / FractionArray([1, 0])
+        except FractionError as err:
+            testflag = True
+        self.assertTrue(testflag)
+
+    def test_18_fraction_array_reductions(self):
+        values = [(i % 7 - 3, i % 11 + 1) for i in range(1001)]
+        a = FractionArray([z for z, n in values], [n for z, n in values])
+        expected = sum(fractions.Fraction(z, n) for z, n in values)
+        total = a.sum()
+        self.assertEqual((total.get_numerator(), total.get_denominator()),
+                         (expected.numerator, expected.denominator))
+        small = a[:40][a[:40] != 0]
+        expected = math.prod(fractions.Fraction(f.get_numerator(), f.get_denominator())
+                             for f in small.to_fractions())
+        product = small.prod()
+        self.assertEqual((product.get_numerator(), product.get_denominator()),
+                         (expected.numerator, expected.denominator))
+        self.assertEqual(FractionArray([]).sum(), Fraction(0, 1))
+
+        ordered = a.sort().to_fractions()
+        self.assertTrue(all(x <= y for x, y in zip(ordered, ordered[1:])))
+        self.assertTrue(np.allclose(a.to_float(), [z / n for z, n in values]))
+
+        # Werte, die als float gleich sind, aber exakt verschieden
+        close = FractionArray([10**17 + 1, 10**17], [10**17, 10**17 - 1])
+        self.assertEqual(list(close.argsort()), [0, 1])
+
+    def test_19_fraction_array_overflow(self):
+        big = FractionArray([2**62, 3], [3, 2**61 + 1])
+        square = big * big
+        self.assertEqual(square.numerators.dtype, object)
+        self.assertEqual(square[0], Fraction(2**124, 9))
+        self.assertEqual((square / big).to_fractions(), big.to_fractions())
+        self.assertEqual((square / big).numerators.dtype, np.int64)
+        total = (big + big).sum()
+        expected = 2 * (fractions.Fraction(2**62, 3) + fractions.Fraction(3, 2**61 + 1))
+        self.assertEqual((total.get_numerator(), total.get_denominator()),
+                         (expected.numerator, expected.denominator))
+        self.assertEqual(list(big > FractionArray([2**62 - 1, 0], [3, 1])), [True, True])
+
+    def test_20_comparison_fast_paths(self):
+        values = [Fraction(z, n) for z in range(-6, 7) for n in range(1, 7)]
+        for x in values:
+            for y in values:
+                expected = x.get_numerator() * y.get_denominator() < \
+                    y.get_numerator() * x.get_denominator()
+                self.assertEqual(x < y, expected)
+                self.assertEqual(x >= y, not expected)
+        self.assertEqual(sorted([self.m, self.p, self.o, self.n]),
+                         [self.p, self.o, self.n, self.m])
+
+    def test_21_hash(self):
+        self.assertEqual(hash(Fraction(2, 4)), hash(self.m))
+        self.assertEqual(hash(Fraction(0, 7)), hash(self.o))
+        self.assertEqual(len({Fraction(1, 2), Fraction(2, 4), Fraction(-3, -6), Fraction(1, 3)}), 2)
+        counts = {}
+        for f in [self.m, Fraction(3, 6), self.n]:
+            counts[f] = counts.get(f, 0) + 1
+        self.assertEqual(counts[Fraction(1, 2)], 2)
+        self.assertFalse(self.m == 0.5)
+        self.assertFalse(self.m in {0.5, "1/2"})
+
+
+    def test_22_immutable_slots(self):
+        self.assertFalse(hasattr(self.m, "__dict__"))
+        testflag = False
+        try:
+            self.m.numerator = 7
+        except FractionError as err:
+            testflag = True
+        self.assertTrue(testflag)
+        self.assertEqual(self.m, Fraction(1, 2))
+        self.assertEqual(copy.deepcopy(self.p), self.p)
+        self.assertEqual(pickle.loads(pickle.dumps(self.p)), self.p)
+
+    def test_23_interning(self):
+        self.assertIs(Fraction(2, 4), Fraction(1, 2))
+        self.assertIs(Fraction(0, 5), Fraction(0, -3))
+        self.assertIs(-Fraction(1, 1), Fraction(-1, 1))
+        self.assertIsNot(Fraction(1000, 3), Fraction(1000, 3))
+        try:
+            Fraction.intern_small = False
+            self.assertIsNot(Fraction(1, 3), Fraction(1, 3))
+            self.assertEqual(Fraction(1, 3), Fraction(2, 6))
+        finally:
+            Fraction.intern_small = True
+
+    def test_24_reciprocal_division(self):
+        self.assertEqual(Fraction(-2, 3).reciprocal(), Fraction(-3, 2))
+        self.assertEqual(Fraction(-2, 3).reciprocal().get_denominator(), 2)
+        self.assertEqual(self.p / Fraction(-1, 2), Fraction(13, 1))
+        testflag = False
+        try:
+            self.o.reciprocal()
+        except FractionError as err:
+            testflag = True
+        self.assertTrue(testflag)
+
+    def test_25_fraction_matrix(self):
+        a = FractionMatrix([[1, 2], [3, 4]], [[2, 1], [1, 3]])
+        self.assertEqual(a[0, 0], Fraction(1, 2))
+        self.assertEqual(a[1].to_fractions(), [Fraction(3, 1), Fraction(4, 3)])
+        self.assertEqual(a.to_fractions(), [[Fraction(1, 2), Fraction(2, 1)],
+                                            [Fraction(3, 1), Fraction(4, 3)]])
+        self.assertEqual(FractionMatrix.from_fractions(a.to_fractions()), a)
+        self.assertEqual(a.transpose()[0, 1], Fraction(3, 1))
+        self.assertEqual((a + a - a), a)
+        self.assertEqual((-a)[1, 1], Fraction(-4, 3))
+        self.assertEqual((a * Fraction(2, 3))[1, 1], Fraction(8, 9))
+        product = a * FractionMatrix.identity(2)
+        self.assertEqual(product, a)
+        expected = [[sum((x * y for x, y in zip(row, col)), Fraction(0, 1))
+                     for col in zip(*a.to_fractions())] for row in a.to_fractions()]
+        self.assertEqual((a * a).to_fractions(), expected)
+        self.assertTrue(np.allclose(a.to_float(), [[0.5, 2], [3, 4 / 3]]))
+
+        testflag = False
+        try:
+            a * FractionMatrix([[1, 2, 3]])
+        except FractionError as err:
+            testflag = True
+        self.assertTrue(testflag)
+
+    def test_26_fraction_matrix_elimination(self):
+        def reference(rows):
+            # Gauß-Jordan mit fractions.Fraction als Vergleich
+            rows = [row[:] for row in rows]
+            pivots, r = [], 0
+            for c in range(len(rows[0])):
+                p = next((i for i in range(r, len(rows)) if rows[i][c] != 0), None)
+                if p is None:
+                    continue
+                rows[r], rows[p] = rows[p], rows[r]
+                rows[r] = [x / rows[r][c] for x in rows[r]]
+                for i in range(len(rows)):
+                    if i != r:
+                        rows[i] = [x - rows[i][c] * y for x, y in zip(rows[i], rows[r])]
+                pivots.append(c)
+                r += 1
+                if r == len(rows):
+                    break
+            return rows, pivots
+
+        rng = np.random.default_rng(3)
+        for m, n in [(4, 4), (3, 6), (6, 3), (5, 5)]:
+            numerators = rng.integers(-5, 6, (m, n))
+            numerators[-1] = numerators[0] - 2 * numerators[1]
+            numerators[:, 1] = 3 * numerators[:, 0]
+            a = FractionMatrix(numerators, np.ones((m, n), dtype=np.int64))
+            rows, pivots = reference([[fractions.Fraction(int(x)) for x in row]
+                                      for row in numerators])
+            rref, found = a.rref()
+            self.assertEqual(found, pivots)
+            self.assertEqual(a.rank(), len(pivots))
+            self.assertEqual([[fractions.Fraction(f.get_numerator(), f.get_denominator())
+                               for f in row] for row in rref.to_fractions()], rows)
+        self.assertEqual(FractionMatrix([[0, 0], [0, 0]]).rank(), 0)
+
+        a = FractionMatrix(rng.integers(-9, 10, (8, 8)), rng.integers(1, 5, (8, 8)))
+        expected = np.linalg.det(a.to_float())
+        self.assertAlmostEqual(float(a.det()) / expected, 1.0)
+        self.assertEqual(FractionMatrix([[2, 1], [4, 2]]).det(), Fraction(0, 1))
+        self.assertEqual(FractionMatrix([[0, 1], [1, 0]]).det(), Fraction(-1, 1))
+
+        work = np.array([[2, 4], [1, 3]], dtype=object)
+        self.assertEqual(bareiss_reduce(work), ([0, 1], 2, 1))
+        self.assertEqual(work.tolist(), [[2, 0], [0, 2]])
+
+    def test_27_fraction_matrix_solve(self):
+        rng = np.random.default_rng(4)
+        a = FractionMatrix(rng.integers(-9, 10, (6, 6)), rng.integers(1, 4, (6, 6)))
+        self.assertEqual(a * a.inverse(), FractionMatrix.identity(6))
+        self.assertEqual(a.inverse() * a, FractionMatrix.identity(6))
+        b = FractionArray(rng.integers(-9, 10, 6), rng.integers(1, 4, 6))
+        x = a.solve(b)
+        column = FractionMatrix(x.numerators[:, np.newaxis], x.denominators[:, np.newaxis])
+        self.assertEqual((a * column)[:, 0].to_fractions(), b.to_fractions())
+        several = FractionMatrix(rng.integers(-9, 10, (6, 3)))
+        self.assertEqual(a * a.solve(several), several)
+
+        # Große ganzzahlige Systeme bleiben exakt
+        big = FractionMatrix(rng.integers(-99, 100, (60, 60)))
+        rhs = list(rng.integers(-99, 100, 60))
+        x = big.solve(rhs)
+        column = FractionMatrix(x.numerators[:, np.newaxis], x.denominators[:, np.newaxis])
+        self.assertEqual((big * column)[:, 0].to_fractions(), FractionArray(rhs).to_fractions())
+
+        testflag = False
+        try:
+            FractionMatrix([[1, 2], [2, 4]]).solve([1, 1])
+        except FractionError as err:
+            testflag = True
+        self.assertTrue(testflag)
+        testflag = False
+        try:
+            FractionMatrix([[1, 2, 3]]).inverse()
+        except FractionError as err:
+            testflag = True
+        self.assertTrue(testflag)
+
 
 # Durchführung der Tests
 loader = unittest.TestLoader()
@@ -204,6 +472,19 @@ suite.addTest(TestFractions("test_11_comparison"))
 suite.addTest(TestFractions("test_12_bool"))
 suite.addTest(TestFractions("test_13_float_conversion"))
 suite.addTest(TestFractions("test_14_misc"))
+suite.addTest(TestFractions("test_15_gcd"))
+suite.addTest(TestFractions("test_16_gcd_arrays"))
+suite.addTest(TestFractions("test_17_fraction_array"))
+suite.addTest(TestFractions("test_18_fraction_array_reductions"))
+suite.addTest(TestFractions("test_19_fraction_array_overflow"))
+suite.addTest(TestFractions("test_20_comparison_fast_paths"))
+suite.addTest(TestFractions("test_21_hash"))
+suite.addTest(TestFractions("test_22_immutable_slots"))
+suite.addTest(TestFractions("test_23_interning"))
+suite.addTest(TestFractions("test_24_reciprocal_division"))
+suite.addTest(TestFractions("test_25_fraction_matrix"))
+suite.addTest(TestFractions("test_26_fraction_matrix_elimination"))
+suite.addTest(TestFractions("test_27_fraction_matrix_solve"))
 
 runner = unittest.TextTestRunner()
 runner.run(suite)
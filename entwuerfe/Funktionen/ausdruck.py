@@ -0,0 +1,450 @@
+#!/usr/bin/env python
+
+"""Ausdrücke als gerichtete azyklische Graphen (DAG) für Kapitel 7.
+
+Ein Funktionsbaum aus MFunc-Objekten wird in Knoten (Node) übersetzt.
+Jeder Knoten ist unveränderlich und wird beim Anlegen in einer Tabelle
+nachgeschlagen (hash-consing): Zwei strukturell gleiche Teilausdrücke
+sind danach derselbe Knoten. Ableitungen entstehen so als Graph, in
+dem z.B. e^x nur einmal vorkommt, egal wie oft es in der
+ausgeschriebenen Formel steht.
+
+Die Ableitung eines Knotens wird an ihm gespeichert und nur einmal
+berechnet. Bei der Berechnung auf einem Array wird jeder Knoten des
+Graphen genau einmal ausgewertet (common subexpression elimination),
+Zwischenergebnisse werden freigegeben bzw. als Puffer weiterverwendet,
+sobald sie nicht mehr gebraucht werden.
+
+Operationen: const (Zahl), var (x), scale (Zahl mal Ausdruck), add
+(Summe beliebig vieler Ausdrücke), mul (Produkt zweier Ausdrücke),
+exp, sin, cos und power (Ausdruck hoch Zahl).
+
+Ableitungswerte an einem Array von Stellen lassen sich auch ohne
+Ableitungsgraph berechnen: taylor() rechnet in einem Durchlauf mit
+abgeschnittenen Taylor-Reihen (automatisches Differenzieren im
+Vorwärtsmodus). Jeder Knoten kostet dabei O(k²) für k Ableitungen,
+unabhängig davon, wie stark die Ableitungsausdrücke wachsen.
+"""
+
+import math
+import weakref
+import numpy as np
+
+
+class Node:
+    """
+    Knoten eines Ausdrucks. Knoten werden nicht direkt, sondern über
+    die Funktionen const(), var(), scale(), add(), mul(), exp(), sin(),
+    cos() und power() angelegt. Gleiche Knoten sind identisch, == ist
+    deshalb ein Vergleich der Identität.
+    """
+    __slots__ = ('op', 'param', 'children', '_derivative', '__weakref__')
+
+    def __init__(self, op, param, children):
+        self.op = op
+        self.param = param
+        self.children = children
+        self._derivative = None
+
+    def derive(self, order=1):
+        """
+        Ableitung nach x (order-fach). Jeder Knoten berechnet seine
+        Ableitung nur einmal.
+        """
+        node = self
+        for i in range(order):
+            if node._derivative is None:
+                node._derivative = _DERIVATIVES[node.op](node)
+            node = node._derivative
+        return node
+
+    def nodes(self):
+        """
+        Alle verschiedenen Knoten des Graphen, jeder Knoten nach
+        seinen Kindern (topologische Reihenfolge).
+        """
+        order = []
+        seen = set()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            stack.append((node, True))
+            for child in reversed(node.children):
+                if id(child) not in seen:
+                    stack.append((child, False))
+        return order
+
+    def size(self):
+        """
+        Anzahl der verschiedenen Knoten im Graphen.
+        """
+        return len(self.nodes())
+
+    def tree_size(self):
+        """
+        Anzahl der Knoten, wenn der Graph als Baum ausgeschrieben würde.
+        """
+        sizes = {}
+        for node in self.nodes():
+            sizes[id(node)] = 1+sum(sizes[id(child)] for child in node.children)
+        return sizes[id(self)]
+
+    def compile(self):
+        """
+        Übersetzt den Graphen in eine Array-Funktion, die jeden Knoten
+        genau einmal berechnet. Das Ergebnis ist immer ein neues Array.
+        """
+        order = self.nodes()
+        slot = {id(node): i for i, node in enumerate(order)}
+        last_use = [0]*len(order)
+        for i, node in enumerate(order):
+            for child in node.children:
+                last_use[slot[id(child)]] = i
+        program = []
+        for i, node in enumerate(order):
+            args = tuple(slot[id(child)] for child in node.children)
+            # Puffer eines Kindes, das danach nicht mehr gebraucht wird,
+            # darf überschrieben werden (aber nie das Eingabe-Array)
+            reuse = next((a for a in args if last_use[a] == i and order[a].op != 'var'
+                          and args.count(a) == 1), None)
+            program.append((node.op, node.param, args, reuse))
+        program = tuple(program)
+        root_is_var = self.op == 'var'
+
+        def run(x):
+            values = [None]*len(program)
+            for i, (op, param, args, reuse) in enumerate(program):
+                values[i] = _EXECUTE[op](x, param, [values[a] for a in args],
+                                         None if reuse is None else values[reuse])
+                for a in args:
+                    if last_use[a] == i:
+                        values[a] = None
+            result = values[-1]
+            return result.copy() if root_is_var else result
+        return run
+
+    def evaluate(self, x):
+        """
+        Berechnet den Ausdruck für alle Stellen des Arrays x.
+        """
+        values = np.asarray(x, dtype=float)
+        with np.errstate(all='ignore'):
+            result = self.compile()(values.reshape(-1))
+        if values.ndim == 0:
+            return float(result[0])
+        return result.reshape(values.shape)
+
+    def taylor(self, x, order=1):
+        """
+        Taylor-Koeffizienten f(x), f'(x), f''(x)/2!, ...,
+        f^(order)(x)/order! für alle Stellen des Arrays x in einem
+        Durchlauf durch den Graphen. Das Ergebnis hat die Form
+        (order+1,)+x.shape.
+        """
+        if order < 0:
+            raise ValueError("Order must not be negative")
+        values = np.asarray(x, dtype=float)
+        order_nodes = self.nodes()
+        last_use = {}
+        for i, node in enumerate(order_nodes):
+            for child in node.children:
+                last_use[id(child)] = i
+        # Taylor-Reihe der Variablen: x + 1*h
+        seed = np.zeros((order+1, values.size))
+        seed[0] = values.reshape(-1)
+        if order > 0:
+            seed[1] = 1.0
+        series = {}
+        with np.errstate(all='ignore'):
+            for i, node in enumerate(order_nodes):
+                series[id(node)] = _TAYLOR[node.op](seed, node.param,
+                                                    [series[id(child)] for child in node.children])
+                for child in node.children:
+                    if last_use[id(child)] == i:
+                        series.pop(id(child), None)
+        result = series[id(self)]
+        if result is seed:
+            result = result.copy()
+        return result.reshape((order+1,)+values.shape)
+
+    def __str__(self):
+        return _FORMAT[self.op](self)
+
+    def __repr__(self):
+        return f"Node({self})"
+
+
+# Tabelle aller lebenden Knoten: (op, param, children) -> Node
+_nodes = weakref.WeakValueDictionary()
+
+
+def _make(op, param=None, children=()):
+    """
+    Knoten nachschlagen oder neu anlegen (hash-consing). Kinder sind
+    bereits eindeutig, ihre Identität reicht als Schlüssel.
+    """
+    key = (op, param, tuple(id(child) for child in children))
+    node = _nodes.get(key)
+    if node is None:
+        node = Node(op, param, tuple(children))
+        _nodes[key] = node
+    return node
+
+
+def const(value):
+    return _make('const', float(value))
+
+
+def var():
+    return _make('var')
+
+
+def scale(c, a):
+    """
+    c*a, Faktoren 0 und 1 fallen weg, Faktoren werden zusammengefasst.
+    """
+    c = float(c)
+    if c == 0.0:
+        return const(0.0)
+    if c == 1.0:
+        return a
+    if a.op == 'const':
+        return const(c*a.param)
+    if a.op == 'scale':
+        return scale(c*a.param, a.children[0])
+    return _make('scale', c, (a,))
+
+
+def add(*terms):
+    """
+    Summe, Summanden 0 fallen weg, Konstanten werden zusammengefasst.
+    """
+    constant = sum(t.param for t in terms if t.op == 'const')
+    terms = [t for t in terms if t.op != 'const']
+    if constant != 0.0 or not terms:
+        terms.append(const(constant))
+    if len(terms) == 1:
+        return terms[0]
+    return _make('add', None, terms)
+
+
+def mul(a, b):
+    """
+    Produkt, konstante Faktoren werden nach außen gezogen.
+    """
+    if a.op == 'const':
+        return scale(a.param, b)
+    if b.op == 'const':
+        return scale(b.param, a)
+    if a.op == 'scale' or b.op == 'scale':
+        c = (a.param if a.op == 'scale' else 1.0)*(b.param if b.op == 'scale' else 1.0)
+        a = a.children[0] if a.op == 'scale' else a
+        b = b.children[0] if b.op == 'scale' else b
+        return scale(c, mul(a, b))
+    return _make('mul', None, (a, b))
+
+
+def _fold(function, *args):
+    """
+    Konstante Teilausdrücke ausrechnen, None bei einem Fehler (der
+    Knoten bleibt dann stehen und liefert bei der Berechnung NaN).
+    """
+    try:
+        value = function(*args)
+    except (ArithmeticError, ValueError):
+        return None
+    return None if isinstance(value, complex) else const(value)
+
+
+def _unary(op, function, a):
+    if a.op == 'const':
+        folded = _fold(function, a.param)
+        if folded is not None:
+            return folded
+    return _make(op, None, (a,))
+
+
+def exp(a):
+    return _unary('exp', math.exp, a)
+
+
+def sin(a):
+    return _unary('sin', math.sin, a)
+
+
+def cos(a):
+    return _unary('cos', math.cos, a)
+
+
+def power(a, n):
+    n = float(n)
+    if n == 0.0:
+        return const(1.0)
+    if n == 1.0:
+        return a
+    if a.op == 'const':
+        folded = _fold(lambda base: base**n, a.param)
+        if folded is not None:
+            return folded
+    return _make('power', n, (a,))
+
+
+_DERIVATIVES = {
+    'const': lambda node: const(0.0),
+    'var': lambda node: const(1.0),
+    'scale': lambda node: scale(node.param, node.children[0].derive()),
+    'add': lambda node: add(*[child.derive() for child in node.children]),
+    'mul': lambda node: add(mul(node.children[0].derive(), node.children[1]),
+                            mul(node.children[0], node.children[1].derive())),
+    'exp': lambda node: mul(node, node.children[0].derive()),
+    'sin': lambda node: mul(cos(node.children[0]), node.children[0].derive()),
+    'cos': lambda node: scale(-1.0, mul(sin(node.children[0]), node.children[0].derive())),
+    'power': lambda node: scale(node.param, mul(power(node.children[0], node.param-1.0),
+                                                node.children[0].derive())),
+}
+
+
+def _execute_unary(ufunc):
+    def execute(x, param, args, out):
+        return ufunc(args[0], out=out)
+    return execute
+
+
+def _execute_power(x, param, args, out):
+    if param == 2.0:
+        return np.square(args[0], out=out)
+    if param == 3.0:
+        # Kleine ganze Exponenten: Multiplizieren ist schneller als pow
+        return np.multiply(np.square(args[0]), args[0], out=out)
+    if param == 4.0:
+        square = np.square(args[0], out=out)
+        return np.square(square, out=square)
+    if param == 0.5:
+        return np.sqrt(args[0], out=out)
+    if param == -1.0:
+        return np.reciprocal(args[0], out=out)
+    return np.power(args[0], param, out=out)
+
+
+def _execute_add(x, param, args, out):
+    if out is None:
+        out = np.add(args[0], args[1])
+        rest = args[2:]
+    else:
+        rest = [a for a in args if a is not out]
+    for a in rest:
+        out += a
+    return out
+
+
+_EXECUTE = {
+    'const': lambda x, param, args, out: np.full(x.shape, param),
+    'var': lambda x, param, args, out: x,
+    'scale': lambda x, param, args, out: np.multiply(args[0], param, out=out),
+    'add': _execute_add,
+    'mul': lambda x, param, args, out: np.multiply(args[0], args[1], out=out),
+    'exp': _execute_unary(np.exp),
+    'sin': _execute_unary(np.sin),
+    'cos': _execute_unary(np.cos),
+    'power': _execute_power,
+}
+
+
+def _product(a, b):
+    """
+    Taylor-Koeffizienten des Produkts (Cauchy-Produkt).
+    """
+    out = np.empty(np.broadcast_shapes(a.shape, b.shape))
+    for k in range(len(out)):
+        out[k] = (a[:k+1]*b[k::-1]).sum(axis=0)
+    return out
+
+
+def _weights(a):
+    """
+    Die Koeffizienten a_j mit j multipliziert (Koeffizienten von x*a'),
+    für die Rekursionen von exp, sin, cos und power.
+    """
+    return np.arange(len(a)).reshape((-1,)+(1,)*(a.ndim-1))*a
+
+
+def _taylor_exp(t, param, args):
+    # e' = e*a'  =>  k*e_k = sum_j j*a_j*e_(k-j)
+    a = args[0]
+    weighted = _weights(a)
+    e = np.empty_like(a)
+    e[0] = np.exp(a[0])
+    for k in range(1, len(a)):
+        e[k] = (weighted[1:k+1]*e[k-1::-1]).sum(axis=0)/k
+    return e
+
+
+def _sin_cos(a):
+    # s' = c*a', c' = -s*a'
+    weighted = _weights(a)
+    s, c = np.empty_like(a), np.empty_like(a)
+    s[0], c[0] = np.sin(a[0]), np.cos(a[0])
+    for k in range(1, len(a)):
+        s[k] = (weighted[1:k+1]*c[k-1::-1]).sum(axis=0)/k
+        c[k] = -(weighted[1:k+1]*s[k-1::-1]).sum(axis=0)/k
+    return s, c
+
+
+def _taylor_power(t, n, args):
+    a = args[0]
+    if n == int(n) and 0 < n <= 64:
+        # Ganze Exponenten durch Quadrieren, auch an der Stelle 0 exakt
+        result, base, m = None, a, int(n)
+        while m:
+            if m & 1:
+                result = base if result is None else _product(result, base)
+            m >>= 1
+            if m:
+                base = _product(base, base)
+        return result.copy() if result is a else result
+    # p' = n*p*a'/a  =>  k*a_0*p_k = sum_j ((n+1)*j-k)*a_j*p_(k-j),
+    # an Stellen mit a_0 = 0 sind die Ableitungen deshalb NaN
+    p = np.empty_like(a)
+    p[0] = np.power(a[0], n)
+    j = np.arange(len(a)).reshape((-1,)+(1,)*(a.ndim-1))
+    for k in range(1, len(a)):
+        p[k] = (((n+1)*j[1:k+1]-k)*a[1:k+1]*p[k-1::-1]).sum(axis=0)/(k*a[0])
+    return p
+
+
+def _taylor_const(t, param, args):
+    series = np.zeros_like(t)
+    series[0] = param
+    return series
+
+
+_TAYLOR = {
+    'const': _taylor_const,
+    'var': lambda t, param, args: t,
+    'scale': lambda t, param, args: param*args[0],
+    'add': lambda t, param, args: sum(args[1:], args[0].copy()),
+    'mul': lambda t, param, args: _product(args[0], args[1]),
+    'exp': _taylor_exp,
+    'sin': lambda t, param, args: _sin_cos(args[0])[0],
+    'cos': lambda t, param, args: _sin_cos(args[0])[1],
+    'power': _taylor_power,
+}
+
+
+_FORMAT = {
+    'const': lambda node: f"{node.param}",
+    'var': lambda node: "x",
+    'scale': lambda node: f"{node.param}*{node.children[0]}",
+    'add': lambda node: "(" + "+".join(str(child) for child in node.children) + ")",
+    'mul': lambda node: f"{node.children[0]}*{node.children[1]}",
+    'exp': lambda node: f"e^({node.children[0]})",
+    'sin': lambda node: f"sin({node.children[0]})",
+    'cos': lambda node: f"cos({node.children[0]})",
+    'power': lambda node: f"({node.children[0]})^{node.param}",
+}
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+
+"""Benchmarks für die Funktionen aus Kapitel 7.
+
+Aufruf: python bench_funktionen.py [name ...]
+
+Ohne Argumente werden alle Benchmarks ausgeführt, sonst nur die
+angegebenen (z.B. "sample").
+"""
+
+import sys
+import copy
+import math
+import timeit
+import numpy as np
+
+from funktionen import (Plottable, ConstFunc, ExpFunc, SinFunc, CosFunc, PowerFunc,
+                        SumFunc, ProdFunc, NestedFunc)
+from numerik import newton, brent, integrate
+
+
+def best_time(func, repeat=3, number=1):
+    """Beste Laufzeit (in Sekunden) für einen Aufruf von func.
+    """
+    return min(timeit.repeat(func, repeat=repeat, number=number))/number
+
+
+def test_functions():
+    """Die zusammengesetzten Funktionen aus den Unittests.
+    """
+    return {
+        "sum": SumFunc("f", [PowerFunc("", 2.5, 2.0), PowerFunc("", -4.0, 1.0), ConstFunc("", 3.0)]),
+        "prod": ProdFunc("g", ExpFunc("", 2.0, 2.0), CosFunc("", 3.0)),
+        "nested": NestedFunc("h", ExpFunc("", 2.0, 1.0), SumFunc("", [SinFunc(), CosFunc()])),
+        "nested''": NestedFunc("k", CosFunc("", 3.0),
+                               ProdFunc("", PowerFunc("", 1.0, 1.0), ExpFunc("", 1.0, 1.0))).derive().derive(),
+    }
+
+
+def bench_sample():
+    """Abtasten mit Einzelaufrufen gegenüber dem Array-Pfad.
+
+    Die Einzelaufrufe werden nur für 10^5 Stellen gemessen, die Zeit
+    pro Stelle ist unabhängig von der Anzahl.
+    """
+    print(f"{'Funktion':>10} {'scalar 1e5':>11} {'array 1e5':>10} {'array 1e7':>10} {'Faktor':>8}")
+    for name, f in test_functions().items():
+        x = np.linspace(-2.0, 2.0, 10**5)
+        t_scalar = best_time(lambda: [f(xi) for xi in x.tolist()], 1)
+        t_array = best_time(lambda: f.sample(-2.0, 2.0, 10**5))
+        t_large = best_time(lambda: f.sample(-2.0, 2.0, 10**7))
+        print(f"{name:>10} {t_scalar:>11.4f} {t_array:>10.4f} {t_large:>10.4f} "
+              f"{t_scalar/t_array:>8.0f}")
+
+
+def bench_derive():
+    """Fünfte Ableitung: MFunc-Bäume gegenüber dem Ausdrucksgraphen.
+
+    Der Graph wird einmal ohne (kalt) und einmal mit gespeicherten
+    Ableitungen gemessen. Dazu die Größe als ausgeschriebener Baum,
+    die Anzahl verschiedener Knoten und die Zeit für die Berechnung
+    an 10^6 Stellen.
+    """
+    x = np.linspace(-2.0, 2.0, 10**6)
+    print(f"{'Funktion':>10} {'Baum':>6} {'Graph':>6} {'MFunc':>8} {'kalt':>8} "
+          f"{'gespeichert':>12} {'eval':>8}")
+    for name, f in test_functions().items():
+        def derive_tree():
+            d = f
+            for i in range(5):
+                d = d.derive()
+            return d
+
+        t_tree = best_time(derive_tree, 1)
+        start = timeit.default_timer()
+        node = f.to_node().derive(5)
+        t_cold = timeit.default_timer()-start
+        t_memo = best_time(lambda: f.to_node().derive(5))
+        t_eval = best_time(lambda: node.evaluate(x))
+        print(f"{name:>10} {node.tree_size():>6} {node.size():>6} {t_tree:>8.4f} {t_cold:>8.4f} "
+              f"{t_memo:>12.5f} {t_eval:>8.4f}")
+
+
+def unsimplified_functions():
+    """Funktionsbäume, wie sie beim Zusammenbauen von Hand entstehen:
+    lange Produktketten mit Konstanten und wiederholten Faktoren,
+    verschachtelte Summen mit gleichen Termen und Verkettungen mit x^1.
+    """
+    chain = ConstFunc("", 1.0)
+    for i in range(60):
+        factor = [SinFunc(), PowerFunc("", 1.0, 1.0), ExpFunc("", 1.0, 0.5), ConstFunc("", 1.01)][i % 4]
+        chain = ProdFunc("", chain, factor)
+    terms = SumFunc("", [])
+    for i in range(40):
+        terms = SumFunc("", [terms, ProdFunc("", PowerFunc("", 1.0, 2.0), PowerFunc("", 0.5, 1.0)),
+                             ProdFunc("", CosFunc(), ConstFunc("", 2.0))])
+    nested = SinFunc()
+    for i in range(30):
+        nested = NestedFunc("", PowerFunc("", 1.0, 1.0),
+                            SumFunc("", [nested, NestedFunc("", ExpFunc(), ConstFunc("", 0.0))]))
+    return {"chain": chain, "sum": terms, "nested": nested}
+
+
+def bench_simplify():
+    """Berechnung vor und nach simplify().
+
+    Einzelaufrufe an 10^4 Stellen, Array-Pfad an 10^6 Stellen.
+    """
+    x = np.linspace(0.1, 2.0, 10**6)
+    xs = x[:10**4].tolist()
+    print(f"{'Funktion':>10} {'Knoten':>7} {'danach':>7} {'simplify':>9} "
+          f"{'scalar':>8} {'danach':>8} {'array':>8} {'danach':>8}")
+    for name, f in unsimplified_functions().items():
+        g = f.simplify()
+        t_simplify = best_time(f.simplify, 1)
+        t_scalar = best_time(lambda: [f(xi) for xi in xs], 1)
+        t_scalar_s = best_time(lambda: [g(xi) for xi in xs], 1)
+        t_array = best_time(lambda: f.evaluate(x))
+        t_array_s = best_time(lambda: g.evaluate(x))
+        print(f"{name:>10} {f.size():>7} {g.size():>7} {t_simplify:>9.4f} "
+              f"{t_scalar:>8.4f} {t_scalar_s:>8.4f} {t_array:>8.4f} {t_array_s:>8.4f}")
+
+
+def build_deep(depth, share=True):
+    """Drei Bäume der Tiefe depth: Produktkette, Verkettung und
+    verschachtelte Summe. Mit share=False wird vor jedem Schritt das
+    bisherige Ergebnis tief kopiert, wie es die Konstruktoren früher
+    mit clone() getan haben.
+    """
+    keep = (lambda f: f) if share else copy.deepcopy
+    prod, nested, total = SinFunc(), PowerFunc(), ConstFunc("", 1.0)
+    for i in range(depth):
+        prod = ProdFunc("", keep(prod), CosFunc("", 2.0, 1.0 + i % 3))
+        nested = NestedFunc("", SinFunc("", 1.5), keep(nested))
+        total = SumFunc("", [keep(total), PowerFunc("", 1.0, float(i))])
+    return prod, nested, total
+
+
+def bench_construct():
+    """Aufbau tiefer Bäume mit geteilten Teilfunktionen gegenüber
+    Kopieren auf jeder Ebene.
+
+    Für die tiefen Kopien wird das Rekursionslimit erhöht.
+    """
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 20000))
+    print(f"{'Tiefe':>6} {'geteilt':>9} {'kopiert':>9} {'Faktor':>7}")
+    for depth in [100, 250, 500, 1000]:
+        t_share = best_time(lambda: build_deep(depth))
+        t_copy = best_time(lambda: build_deep(depth, share=False), 1)
+        print(f"{depth:>6} {t_share:>9.4f} {t_copy:>9.4f} {t_copy/t_share:>7.0f}")
+
+
+def bench_adaptive():
+    """Adaptive Abtastung gegenüber einem gleichverteilten Gitter mit
+    gleich vielen Punkten.
+
+    Fehler ist die größte Abweichung der linearen Interpolation von
+    der Funktion an 10^6 Stellen, relativ zum Wertebereich (ohne die
+    Umgebung von Polstellen, die im Plot abgeschnitten wird). Zum Schluss die gemeinsame Abtastung aller Funktionen in einem
+    Gitter gegenüber einzelnen Gittern.
+    """
+    cases = dict(test_functions())
+    cases["exp"] = ExpFunc("f")
+    cases["1/x"] = PowerFunc("f", 1.0, -1.0)
+    cases["sin(8x)"] = SinFunc("f", 1.0, 8.0)
+    minimum, maximum = -3.0, 3.0
+    fine = np.linspace(minimum, maximum, 10**6)
+
+    def error(f, x, y):
+        exact = f.evaluate(fine)
+        low, high = np.nanpercentile(exact, [5, 95])
+        span = high-low
+        valid = (exact > low-2*span) & (exact < high+2*span)
+        return np.nanmax(np.abs(np.interp(fine, x, y)-exact)[valid])/span
+
+    print(f"{'Funktion':>10} {'Punkte':>7} {'Fehler adaptiv':>15} {'Fehler gleich':>14} "
+          f"{'Zeit':>8}")
+    for name, f in cases.items():
+        x, y = f.sample_adaptive(minimum, maximum)
+        uniform = np.linspace(minimum, maximum, len(x))
+        t = best_time(lambda: f.sample_adaptive(minimum, maximum))
+        print(f"{name:>10} {len(x):>7} {error(f, x, y):>15.2e} "
+              f"{error(f, uniform, f.evaluate(uniform)):>14.2e} {t:>8.4f}")
+    funcs = list(cases.values())
+    t_multi = best_time(lambda: Plottable.multi_sample(funcs, minimum, maximum))
+    t_single = best_time(lambda: [f.sample_adaptive(minimum, maximum) for f in funcs])
+    print(f"gemeinsam {len(Plottable.multi_sample(funcs, minimum, maximum)[0])} Punkte "
+          f"{t_multi:.4f} s, einzeln {t_single:.4f} s")
+
+
+def bench_taylor():
+    """Ableitungen bis zur Ordnung k an 10^5 Stellen: symbolisch
+    (derive() der MFunc bzw. des Ausdrucksgraphen, dann evaluate)
+    gegenüber automatischem Differenzieren mit derivatives().
+
+    "chain" ist eine Verkettung von 10 Sinusfunktionen um e^x, dafür
+    wird symbolisch nur die erste Ableitung gemessen.
+    """
+    x = np.linspace(-1.0, 1.0, 10**5)
+    cases = dict(test_functions())
+    chain = ExpFunc("f")
+    for i in range(10):
+        chain = NestedFunc("f", SinFunc(), chain)
+    cases["chain"] = chain
+    print(f"{'Funktion':>10} {'k':>3} {'MFunc':>9} {'Graph':>9} {'Taylor':>9}")
+    for name, f in cases.items():
+        for k in (1, 4, 8):
+            def symbolic():
+                d = f
+                values = [d.evaluate(x)]
+                for i in range(k):
+                    d = d.derive()
+                    values.append(d.evaluate(x))
+                return values
+
+            def graph():
+                # Der Graph wird nicht gespeichert, jeder Aufruf leitet neu ab
+                node = f.to_node()
+                return [node.derive(i).evaluate(x) for i in range(k+1)]
+
+            # Die MFunc-Ableitungen der Verkettung wachsen zu stark
+            t_symbolic = best_time(symbolic, 1) if k == 1 or name != "chain" else math.nan
+            t_graph = best_time(graph, 1)
+            t_taylor = best_time(lambda: f.derivatives(x, k))
+            print(f"{name:>10} {k:>3} {t_symbolic:>9.4f} {t_graph:>9.4f} {t_taylor:>9.4f}")
+
+
+def bench_solve():
+    """Newton für 10^4 Startwerte: Python-Schleife mit f(x) und
+    f.derive()(x) gegenüber newton(). Dazu brent() für 10^4 Intervalle
+    und integrate() mit beiden Regeln, jeweils mit Aufrufen und
+    berechneten Stellen.
+    """
+    f = ProdFunc("g", ExpFunc("", 1.0, -0.1), SinFunc("", 1.0, 3.0))
+    starts = np.linspace(0.1, 50.0, 10**4)
+
+    def loop():
+        df = f.derive()
+        roots = []
+        for x in starts.tolist():
+            for i in range(50):
+                step = f(x)/df(x)
+                x -= step
+                if abs(step) <= 1e-12*(1.0+abs(x)):
+                    break
+            roots.append(x)
+        return roots
+
+    t_loop = best_time(loop, 1)
+    t_newton = best_time(lambda: newton(f, starts))
+    result = newton(f, starts)
+    print(f"Newton:  Schleife {t_loop:.4f} s, newton() {t_newton:.4f} s "
+          f"({result.calls} Aufrufe, {result.points} Stellen)")
+    t_brent = best_time(lambda: brent(f, starts, starts+0.005))
+    result = brent(f, starts, starts+0.005)
+    print(f"Brent:   {t_brent:.4f} s, {np.count_nonzero(result.converged)} Nullstellen "
+          f"({result.calls} Aufrufe, {result.points} Stellen)")
+    for rule in ("kronrod", "simpson"):
+        t = best_time(lambda: integrate(f, 0.0, 50.0, rule=rule))
+        result = integrate(f, 0.0, 50.0, rule=rule)
+        print(f"{rule:>8} {t:.4f} s, {result.intervals} Intervalle "
+              f"({result.calls} Aufrufe, {result.points} Stellen), Fehler {result.error:.1e}")
+
+
+BENCHMARKS = {
+    "sample": bench_sample,
+    "derive": bench_derive,
+    "simplify": bench_simplify,
+    "construct": bench_construct,
+    "adaptive": bench_adaptive,
+    "taylor": bench_taylor,
+    "solve": bench_solve,
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"### {name}")
+        BENCHMARKS[name]()
+        print()
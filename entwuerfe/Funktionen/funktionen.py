@@ -0,0 +1,1017 @@
+#!/usr/bin/env python
+
+"""Funktionen als Objekte (Kapitel 7).
+
+Eine MFunc ist eine mathematische Funktion einer Variablen mit einem
+konstanten Faktor, z.B. f(x)=3.0sin(2.0x). Aus den Grundfunktionen
+(ConstFunc, ExpFunc, SinFunc, CosFunc, PowerFunc) werden mit SumFunc,
+ProdFunc und NestedFunc zusammengesetzte Funktionen gebaut. Jede
+Funktion kann sich als String ausgeben, an einer Stelle berechnen und
+ihre Ableitungsfunktion bilden.
+
+Neben der Berechnung an einer einzelnen Stelle (__call__) gibt es
+einen Array-Pfad: compile() übersetzt den ganzen Funktionsbaum über
+einen Ausdrucksgraphen (ausdruck.py), in dem gleiche Teilausdrücke
+nur einmal vorkommen, in eine Folge von NumPy-ufuncs, evaluate()
+berechnet damit alle Stellen eines Arrays auf einmal. Fehler (z.B.
+Teilen durch Null, Überlauf, Wurzel aus negativen Zahlen) werden dabei
+nicht pro Stelle abgefangen, sondern am Ende als NaN markiert.
+derivatives() berechnet auf dieselbe Weise Funktionswerte und
+Ableitungen bis zu einer Ordnung k, ohne die Ableitungsfunktionen zu
+bilden.
+
+Zum Plotten wird adaptiv abgetastet (Plottable.multi_sample): Wo eine
+Funktion stark gekrümmt ist, springt oder undefiniert wird, werden
+Intervalle halbiert, alle Funktionen eines Plots teilen sich ein
+Gitter.
+"""
+
+from abc import ABC, abstractmethod
+import copy
+import math
+import numpy as np
+import matplotlib.pyplot as plt
+
+import ausdruck
+
+
+# Höchstzahl besuchter Knoten für MFunc.simplify()
+SIMPLIFY_BUDGET = 100000
+
+# Am Objekt gespeicherte Zwischenergebnisse, gelten nur für genau
+# dieses Objekt (siehe MFunc._replace)
+_CACHES = ('_text_cache', '_order_cache', '_simplified_cache')
+
+
+def _unchanged(func):
+    '''
+    Für _simplify_step(): übernimmt die Teilfunktion unverändert.
+    '''
+    return func
+
+
+# Adaptive Abtastung (Plottable.multi_sample): Punktbudget, erlaubte
+# Abweichung von der Sehne und Sprunghöhe relativ zum Wertebereich,
+# kleinste Intervallbreite relativ zum x-Bereich
+ADAPTIVE_MAX_SAMPLES = 2000
+ADAPTIVE_TOLERANCE = 1e-3
+ADAPTIVE_JUMP = 0.05
+ADAPTIVE_MIN_WIDTH = 1e-6
+
+
+class FunctionError(Exception):
+    """
+    Für eigene Fehler bei den Funktionen.
+    """
+    pass
+
+
+class Plottable():
+    """
+    Basisklasse für alles, was sich als Funktion von x plotten lässt.
+    Unterklassen müssen nur __call__ für einzelne Stellen anbieten.
+    """
+
+    def evaluate(self, x):
+        """
+        Funktionswerte für alle Stellen des Arrays x. Unterklassen mit
+        einem Array-Pfad überschreiben diese Methode.
+        """
+        x = np.asarray(x, dtype=float)
+        return np.fromiter((self(xi) for xi in x.ravel().tolist()),
+                           dtype=float, count=x.size).reshape(x.shape)
+
+    def sample(self, minimum: float, maximum: float, samples: int) -> np.ndarray:
+        """
+        Funktionswerte an samples gleichverteilten Stellen zwischen
+        minimum und maximum.
+        """
+        return self.evaluate(Plottable._get_x_values(minimum, maximum, samples))
+
+    def sample_adaptive(self, minimum: float, maximum: float, samples: int = 100,
+                        max_samples: int = None, tolerance: float = None):
+        """
+        Stellen und Funktionswerte (x, y) mit adaptiver Verfeinerung,
+        siehe Plottable.multi_sample().
+        """
+        x, ys = Plottable.multi_sample([self], minimum, maximum, samples,
+                                       max_samples, tolerance)
+        return x, ys[0]
+
+    @staticmethod
+    def _get_x_values(minimum: float, maximum: float, samples: int) -> np.ndarray:
+        return np.linspace(minimum, maximum, samples)
+
+    @staticmethod
+    def multi_sample(plottables: [], minimum: float, maximum: float, samples: int = 100,
+                     max_samples: int = None, tolerance: float = None):
+        """
+        Gemeinsames adaptives Gitter für mehrere Funktionen.
+
+        Ausgehend von samples gleichverteilten Stellen wird in jeder
+        Runde jedes Intervall halbiert, an dessen Enden eine der
+        Funktionen von der Sehne durch die Nachbarpunkte um mehr als
+        tolerance (relativ zum Wertebereich der Funktion) abweicht oder
+        an dem eine Funktion von endlich nach NaN wechselt. Die
+        schlechtesten Intervalle kommen zuerst, bis max_samples Stellen
+        erreicht sind. Neue Stellen werden pro Runde gemeinsam mit
+        evaluate() berechnet.
+
+        Springt eine Funktion über ein Intervall, das nicht weiter
+        verfeinert werden kann (Sprungstelle, Polstelle), wird dort eine
+        Stelle mit dem Wert NaN eingefügt, damit der Plot die Punkte
+        nicht verbindet.
+
+        Gibt (x, ys) zurück: x ist das aufsteigende Gitter, ys hat eine
+        Zeile pro Funktion. Ohne Funktionen bleibt es beim Startgitter.
+        """
+        if max_samples is None:
+            max_samples = ADAPTIVE_MAX_SAMPLES
+        if tolerance is None:
+            tolerance = ADAPTIVE_TOLERANCE
+        if samples < 3:
+            raise FunctionError("Need at least three samples")
+        if not minimum < maximum:
+            raise FunctionError("Minimum must be less than maximum")
+        x = Plottable._get_x_values(minimum, maximum, samples)
+        if len(plottables) == 0:
+            return x, np.empty((0, len(x)))
+        ys = np.array([plottable.evaluate(x) for plottable in plottables], dtype=float)
+        ys = ys.reshape(len(plottables), len(x))
+        ys[~np.isfinite(ys)] = np.nan
+        low, high = Plottable._value_range(ys)
+        scale = high-low
+        min_width = (maximum-minimum)*ADAPTIVE_MIN_WIDTH
+
+        while len(x) < max_samples:
+            errors = Plottable._interval_errors(x, Plottable._clip(ys, low, high), scale)
+            errors[np.diff(x) < 2*min_width] = 0.0
+            refine = np.flatnonzero(errors > tolerance)
+            if len(refine) == 0:
+                break
+            budget = max_samples-len(x)
+            if len(refine) > budget:
+                refine = np.sort(refine[np.argsort(errors[refine])[::-1][:budget]])
+            x, ys = Plottable._insert(plottables, x, ys, refine)
+
+        # Sprünge: kleinste Intervalle, deren Änderung viel größer als
+        # bei beiden Nachbarn ist, werden aufgetrennt
+        steps = np.abs(np.diff(Plottable._clip(ys, low, high), axis=1))
+        steps[np.isnan(steps)] = 0.0
+        neighbours = np.zeros_like(steps)
+        neighbours[:, 1:] = steps[:, :-1]
+        neighbours[:, :-1] = np.maximum(neighbours[:, :-1], steps[:, 1:])
+        jumps = (steps > ADAPTIVE_JUMP*scale[:, np.newaxis]) & (steps > 2*neighbours)
+        jumps &= (np.diff(x) < 4*min_width)[np.newaxis, :]
+        split = np.flatnonzero(jumps.any(axis=0))
+        if len(split) > 0:
+            x, ys = Plottable._insert(plottables, x, ys, split, jumps[:, split])
+        return x, ys
+
+    @staticmethod
+    def _value_range(ys: np.ndarray):
+        """
+        Wertebereich (low, high) jeder Zeile ohne Ausreißer (5%- bis
+        95%-Quantil), damit Polstellen den Maßstab nicht bestimmen.
+        """
+        low, high = np.zeros(len(ys)), np.ones(len(ys))
+        for i, row in enumerate(ys):
+            finite = row[np.isfinite(row)]
+            if len(finite) == 0:
+                continue
+            low[i], high[i] = np.percentile(finite, [5, 95])
+            if high[i] <= low[i]:
+                # (fast) konstant
+                spread = max(abs(low[i]), 1.0)
+                low[i], high[i] = low[i]-spread/2, high[i]+spread/2
+        return low, high
+
+    @staticmethod
+    def _clip(ys: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """
+        Werte weit außerhalb des Wertebereichs abschneiden: Dort ist im
+        Plot nichts zu sehen, was eine Verfeinerung lohnen würde.
+        """
+        margin = 2*(high-low)
+        return np.clip(ys, (low-margin)[:, np.newaxis], (high+margin)[:, np.newaxis])
+
+    @staticmethod
+    def _interval_errors(x: np.ndarray, ys: np.ndarray, scale: np.ndarray) -> np.ndarray:
+        """
+        Fehlerschätzung je Intervall: größte relative Abweichung eines
+        Randpunktes von der Sehne durch seine beiden Nachbarn (ein Maß
+        für die Krümmung), unendlich bei einem Wechsel zwischen endlich
+        und NaN.
+        """
+        dx = np.diff(x)
+        weight = dx[:-1]/(dx[:-1]+dx[1:])
+        chord = ys[:, :-2]+(ys[:, 2:]-ys[:, :-2])*weight
+        deviation = np.abs(ys[:, 1:-1]-chord)/scale[:, np.newaxis]
+        deviation = np.where(np.isnan(deviation), 0.0, deviation).max(axis=0)
+        errors = np.zeros(len(dx))
+        errors[:-1] = deviation
+        errors[1:] = np.maximum(errors[1:], deviation)
+        finite = np.isfinite(ys)
+        errors[(finite[:, :-1] != finite[:, 1:]).any(axis=0)] = np.inf
+        return errors
+
+    @staticmethod
+    def _insert(plottables: [], x: np.ndarray, ys: np.ndarray, intervals: np.ndarray,
+                gaps: np.ndarray = None):
+        """
+        Mittelpunkte der (aufsteigenden) Intervalle einfügen und alle
+        Funktionen dort berechnen. Wo gaps True ist, wird NaN
+        eingetragen.
+        """
+        middle = (x[intervals]+x[intervals+1])/2
+        values = np.array([plottable.evaluate(middle) for plottable in plottables],
+                          dtype=float).reshape(len(plottables), len(middle))
+        values[~np.isfinite(values)] = np.nan
+        if gaps is not None:
+            values[gaps] = np.nan
+        return (np.insert(x, intervals+1, middle),
+                np.insert(ys, intervals+1, values, axis=1))
+
+    @staticmethod
+    def multi_plot(plottables: [], minimum: float, maximum: float, samples: int = 100,
+                   adaptive: bool = True, max_samples: int = None) -> None:
+        plt.figure(figsize=(8, 6))
+        if adaptive:
+            x, ys = Plottable.multi_sample(plottables, minimum, maximum, samples, max_samples)
+        else:
+            x = Plottable._get_x_values(minimum, maximum, samples)
+            ys = [plottable.evaluate(x) for plottable in plottables]
+        for plottable, y in zip(plottables, ys):
+            plt.plot(x, y, label=f"{plottable}")
+        Plottable._configure_plot_and_show()
+
+    def plot(self, minimum: float, maximum: float, samples: int = 100,
+             adaptive: bool = True, max_samples: int = None) -> None:
+        if adaptive:
+            x, y = self.sample_adaptive(minimum, maximum, samples, max_samples)
+        else:
+            x = Plottable._get_x_values(minimum, maximum, samples)
+            y = self.evaluate(x)
+        plt.plot(x, y, label=f"{self}")
+        Plottable._configure_plot_and_show()
+
+    @staticmethod
+    def _configure_plot_and_show() -> None:
+        # Axes and labels
+        plt.axhline(0, color='black', linestyle='--', linewidth=0.8)
+        plt.axvline(0, color='black', linestyle='--', linewidth=0.8)
+        plt.grid(color='gray', linestyle='--', linewidth=0.5, alpha=0.5)
+        plt.xlabel('x')
+        plt.ylabel('y')
+        plt.legend()
+        plt.show()
+
+
+class MFunc(ABC, Plottable):
+    '''
+    Abstrakte Basisklasse für Funktionen.
+
+    Funktionen sind unveränderlich: Attribute werden nur im Konstruktor
+    gesetzt. Zusammengesetzte Funktionen verweisen deshalb direkt auf
+    ihre Teilfunktionen, statt sie zu kopieren. Der Faktor einer
+    Teilfunktion wird zum Faktor der zusammengesetzten Funktion, die
+    Teilfunktion selbst wird dafür durch eine flache Kopie mit Faktor 1
+    ersetzt (_rescaled), die wiederum ihre Kinder teilt.
+    '''
+    def __init__(self, name: str = '', factor: float = 1.0, operand: str = "x"):
+        '''
+        Konstruktor mit Funktionsname (z.B. f), konstantem Faktor, und Operand.
+        '''
+        self.name = name
+        self.factor = factor
+        self.operand = operand
+
+    def _factor_str(self, factor: float) -> str:
+        '''
+        Hilfsmethode, die einen Faktor in einen String umwandelt:
+        Faktor 1.0 kann weggelassen werden.
+        Faktor -1.0 kann als Minus geschrieben werden.
+        Alle anderen Faktoren werden als Zahl angegeben.
+        '''
+        return f"{'' if factor == 1.0 else '-' if factor == -1.0 else factor}"
+
+    @abstractmethod
+    def _str_internal(self) -> str:
+        '''
+        Wandelt die eigentliche Funktion in einen String um, ohne Faktor und Funktionssymbol.
+        z.B. __str__: f(x)=3.0cos(x) -> _str_internal: cos(x)
+        '''
+        pass
+
+    def _text(self) -> str:
+        '''
+        Ergebnis von _str_internal(), wird beim ersten Aufruf gespeichert.
+        Die Texte der Teilfunktionen werden vorher von unten nach oben
+        berechnet, so dass _str_internal() nur auf gespeicherte Texte
+        zugreift (keine Rekursion, auch bei tiefen Bäumen).
+        '''
+        text = self.__dict__.get('_text_cache')
+        if text is None:
+            for func in self._postorder(lambda f: '_text_cache' in f.__dict__):
+                object.__setattr__(func, '_text_cache', func._str_internal())
+            text = self.__dict__['_text_cache']
+        return text
+
+    def _term_str(self) -> str:
+        '''
+        Die Funktion mit Faktor, aber ohne Funktionssymbol, z.B. 3.0cos(x).
+        '''
+        return f"{self._factor_str(self.factor)}{self._text()}"
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__:
+            raise FunctionError("MFunc objects are immutable")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise FunctionError("MFunc objects are immutable")
+
+    def __str__(self) -> str:
+        '''
+        Wandelt die Funktion in einen menschenlesbaren String um.
+        '''
+        return f"{self.name}({self.operand})={self._term_str()}"
+
+    @abstractmethod
+    def _call_internal(self, x: float) -> float:
+        '''
+        Berechnet die eigentliche Funktion ohne Faktor.
+        Ein Error wird als NaN (not a number) interpretiert.
+        '''
+        pass
+
+    def _call_step(self, x: float, values: dict) -> float:
+        '''
+        Wie _call_internal(), die Werte der Teilfunktionen (ohne Faktor)
+        stehen schon in values (Schlüssel id). Zusammengesetzte
+        Funktionen überschreiben diese Methode.
+        '''
+        return self._call_internal(x)
+
+    def _value(self, x: float) -> float:
+        '''
+        Funktionswert ohne Faktor, von unten nach oben berechnet. Ein
+        Fehler in einer Teilfunktion wird dort zu NaN.
+        '''
+        values = {}
+        for func in self._arg_order():
+            try:
+                values[id(func)] = func._call_step(x, values)
+            except (ArithmeticError, ValueError):  # z.B. durch Teilen durch Null
+                values[id(func)] = math.nan
+        return values[id(self)]
+
+    def __call__(self, x: float) -> float:
+        '''
+        Berechnet den Funktionswert an Stelle x. Arrays (und Listen)
+        werden über den Array-Pfad berechnet.
+        '''
+        if isinstance(x, (np.ndarray, list, tuple)):
+            return self.evaluate(x)
+        return self.factor * self._value(x)
+
+    @abstractmethod
+    def _node_internal(self, arg):
+        '''
+        Übersetzt die eigentliche Funktion (ohne Faktor) in einen
+        Ausdrucksknoten, arg ist der Knoten für den Operanden.
+        '''
+        pass
+
+    def _node_step(self, arg, nodes: dict):
+        '''
+        Wie _node_internal(), die Knoten der Teilfunktionen (ohne
+        Faktor) stehen schon in nodes (Schlüssel id). Zusammengesetzte
+        Funktionen überschreiben diese Methode.
+        '''
+        return self._node_internal(arg)
+
+    def _internal_node(self, arg):
+        '''
+        Knoten der Funktion ohne Faktor, von unten nach oben aufgebaut.
+        '''
+        nodes = {}
+        for func in self._arg_order():
+            nodes[id(func)] = func._node_step(arg, nodes)
+        return nodes[id(self)]
+
+    def to_node(self, arg=None):
+        '''
+        Die Funktion mit Faktor als Knoten eines Ausdrucksgraphen
+        (siehe ausdruck.py). Gleiche Teilausdrücke sind darin nur
+        einmal enthalten.
+        '''
+        if arg is None:
+            arg = ausdruck.var()
+        return ausdruck.scale(self.factor, self._internal_node(arg))
+
+    def compile(self):
+        '''
+        Übersetzt die Funktion in eine Array-Funktion aus NumPy-ufuncs,
+        die jeden verschiedenen Teilausdruck nur einmal berechnet.
+        '''
+        return self.to_node().compile()
+
+    def evaluate(self, x):
+        '''
+        Berechnet die Funktionswerte für alle Stellen des Arrays x auf
+        einmal. Stellen, an denen die Berechnung scheitert (NaN oder
+        unendlich, z.B. bei Polstellen oder Überlauf), werden als NaN
+        zurückgegeben. Für einen Skalar x ist das Ergebnis ein float.
+        '''
+        values = np.asarray(x, dtype=float)
+        with np.errstate(all='ignore'):
+            # Immer mit (mindestens) eindimensionalen Arrays rechnen
+            result = self.compile()(values.reshape(-1))
+        result[np.isinf(result)] = math.nan
+        if values.ndim == 0:
+            return float(result[0])
+        return result.reshape(values.shape)
+
+    def derivatives(self, x, order: int = 1) -> np.ndarray:
+        '''
+        Funktionswert und die ersten order Ableitungen für alle Stellen
+        des Arrays x: Zeile k des Ergebnisses ist die k-te Ableitung.
+        Statt die Ableitungsfunktionen mit derive() zu bilden, wird in
+        einem Durchlauf mit Taylor-Reihen gerechnet (automatisches
+        Differenzieren im Vorwärtsmodus). Ungültige Stellen sind NaN.
+        '''
+        if order < 0:
+            raise FunctionError("Order must not be negative")
+        result = self.to_node().taylor(x, order)
+        factorials = np.cumprod(np.arange(order+1, dtype=float).clip(1.0))
+        result *= factorials.reshape((-1,)+(1,)*(result.ndim-1))
+        result[~np.isfinite(result)] = math.nan
+        return result
+
+    @abstractmethod
+    def derive(self):
+        '''
+        Gibt die Ableitungsfunktion dieser FUnktion zurück.
+        '''
+        pass
+
+    def _derive_step(self, derived: dict):
+        '''
+        Wie derive(), die Ableitungen der Teilfunktionen stehen schon
+        in derived (Schlüssel id). Zusammengesetzte Funktionen
+        überschreiben diese Methode.
+        '''
+        return self.derive()
+
+    def _derived(self):
+        '''
+        Ableitung von unten nach oben, jede (geteilte) Teilfunktion wird
+        nur einmal abgeleitet.
+        '''
+        derived = {}
+        for func in self._postorder(lambda f: False):
+            derived[id(func)] = func._derive_step(derived)
+        return derived[id(self)]
+
+    def clone(self):
+        '''
+        Gibt die Funktion selbst zurück: Funktionen sind unveränderlich,
+        eine Kopie wird nie gebraucht.
+        '''
+        return self
+
+    def _replace(self, **changes):
+        '''
+        Flache Kopie mit geänderten Attributen, Kinder werden geteilt.
+        '''
+        result = copy.copy(self)
+        for name in _CACHES:
+            result.__dict__.pop(name, None)
+        for name, value in changes.items():
+            object.__setattr__(result, name, value)
+        return result
+
+    def _rescaled(self, name: str, factor: float):
+        '''
+        Die Funktion mit anderem Namen und Faktor.
+        '''
+        if name == self.name and factor == self.factor:
+            return self
+        return self._replace(name=name, factor=factor)
+
+    def _key(self) -> str:
+        '''
+        Schlüssel für gleiche Terme (bis auf den Faktor).
+        '''
+        return self._text()
+
+    def _children(self) -> tuple:
+        '''
+        Die direkten Teilfunktionen (Grundfunktionen haben keine).
+        '''
+        return ()
+
+    def _arg_children(self) -> tuple:
+        '''
+        Die Teilfunktionen, die am selben Operanden berechnet werden
+        (bei NestedFunc nur die innere Funktion).
+        '''
+        return self._children()
+
+    def _postorder(self, done, children=None) -> list:
+        '''
+        Alle verschiedenen Knoten unterhalb der Funktion (sie selbst
+        eingeschlossen), jeder nach seinen Kindern. Knoten, für die
+        done(func) wahr ist, werden samt ihren Kindern ausgelassen.
+        Iterativ mit einem eigenen Stack, damit auch sehr tiefe Bäume
+        nicht an die Rekursionsgrenze stoßen.
+        '''
+        if children is None:
+            children = lambda f: f._children()
+        order = []
+        seen = set()
+        stack = [(self, False)]
+        while stack:
+            func, expanded = stack.pop()
+            if expanded:
+                order.append(func)
+                continue
+            if id(func) in seen or done(func):
+                continue
+            seen.add(id(func))
+            stack.append((func, True))
+            for child in reversed(children(func)):
+                if id(child) not in seen:
+                    stack.append((child, False))
+        return order
+
+    def _arg_order(self) -> list:
+        '''
+        Reihenfolge für die Berechnung von Werten und Knoten (siehe
+        _arg_children), wird am Objekt gespeichert.
+        '''
+        order = self.__dict__.get('_order_cache')
+        if order is None:
+            order = self._postorder(lambda f: False, lambda f: f._arg_children())
+            object.__setattr__(self, '_order_cache', order)
+        return order
+
+    def size(self) -> int:
+        '''
+        Anzahl der verschiedenen Knoten im Funktionsbaum (geteilte
+        Teilfunktionen werden nur einmal gezählt).
+        '''
+        return len(self._postorder(lambda f: False))
+
+    def _simplify_step(self, simplify):
+        '''
+        Die Vereinfachungsregeln für diesen Knoten, simplify(child)
+        liefert die (vereinfachte) Teilfunktion. Grundfunktionen sind
+        schon einfach.
+        '''
+        return self
+
+    def _simplified(self):
+        '''
+        Ein Durchlauf der Vereinfachungsregeln von unten nach oben. Das
+        Ergebnis wird an jedem Knoten gespeichert, geteilte
+        Teilfunktionen werden also nur einmal vereinfacht.
+        '''
+        result = self.__dict__.get('_simplified_cache')
+        if result is None:
+            for func in self._postorder(lambda f: '_simplified_cache' in f.__dict__):
+                object.__setattr__(func, '_simplified_cache',
+                                   func._simplify_step(MFunc._simplified))
+            result = self.__dict__['_simplified_cache']
+        return result
+
+    def simplify(self, budget: int = None):
+        '''
+        Vereinfacht die Funktion, bis sich nichts mehr ändert
+        (Fixpunkt): Konstanten werden ausgerechnet, verschachtelte
+        Summen und Produkte aufgelöst, gleiche Summanden addiert, gleiche
+        Basen in Produkten zu Potenzen zusammengefasst und Faktoren 0
+        und 1 entfernt. budget begrenzt die Anzahl der insgesamt
+        besuchten Knoten (Standard: SIMPLIFY_BUDGET), ist es erschöpft,
+        wird das bisherige Ergebnis zurückgegeben.
+        '''
+        if budget is None:
+            budget = SIMPLIFY_BUDGET
+        result = self
+        current = result._term_str()
+        while budget >= result.size():
+            budget -= result.size()
+            simplified = result._simplified()
+            text = simplified._term_str()
+            if text == current:
+                return simplified
+            result, current = simplified, text
+        return result
+
+    def call_verbose(self, x: float):
+        '''
+        Berechnet den Funktionswert an Stelle x und gibt ihn schön als String formatiert zurück.
+        '''
+        return f"{self.name}({x})={self(x)}"
+
+
+class ConstFunc(MFunc):
+
+    def _str_internal(self) -> str:
+        return f"{'1.0' if abs(self.factor) == 1.0 else ''}"
+
+    def _key(self) -> str:
+        # Alle Konstanten sind gleiche Terme
+        return "1.0"
+
+    def _call_internal(self, x: float) -> float:
+        '''
+        Gibt immer 1 zurück, der Faktor kommt später hinzu.
+        '''
+        return 1
+
+    def _node_internal(self, arg):
+        return ausdruck.const(1.0)
+
+    def derive(self):
+        return ConstFunc(self.name + "'", 0.0, self.operand)
+
+
+class ExpFunc(MFunc):
+
+    def __init__(self, name: str = '', factor: float = 1.0, exp_factor: float = 1.0, operand: str = "x"):
+        super().__init__(name, factor, operand)
+        self.exp_factor = exp_factor
+
+    def _str_internal(self) -> str:
+        exponent = f"{self._factor_str(self.exp_factor)}{self.operand}"
+        if (abs(self.exp_factor) != 1.0 or len(self.operand) > 1):
+            exponent = f"({exponent})"
+        return f"e^{exponent}"
+
+    def _call_internal(self, x: float) -> float:
+        return math.exp(self.exp_factor * x)
+
+    def _node_internal(self, arg):
+        return ausdruck.exp(ausdruck.scale(self.exp_factor, arg))
+
+    def derive(self) -> MFunc:
+        return ExpFunc(
+            self.name + "'",
+            self.factor * self.exp_factor,
+            self.exp_factor,
+            self.operand)
+
+
+class SinFunc(MFunc):
+
+    def __init__(self, name: str = '', factor: float = 1.0, sin_factor: float = 1.0, operand: str = "x"):
+        super().__init__(name, factor, operand)
+        self.sin_factor = sin_factor
+
+    def _str_internal(self) -> str:
+        return f"sin({self._factor_str(self.sin_factor)}{self.operand})"
+
+    def _call_internal(self, x: float) -> float:
+        return math.sin(self.sin_factor * x)
+
+    def _node_internal(self, arg):
+        return ausdruck.sin(ausdruck.scale(self.sin_factor, arg))
+
+    def derive(self) -> MFunc:
+        return CosFunc(
+            self.name + "'",
+            self.factor * self.sin_factor,
+            self.sin_factor,
+            self.operand)
+
+
+class CosFunc(MFunc):
+
+    def __init__(self, name: str = '', factor: float = 1.0, cos_factor: float = 1.0, operand: str = "x"):
+        super().__init__(name, factor, operand)
+        self.cos_factor = cos_factor
+
+    def _str_internal(self) -> str:
+        return f"cos({self._factor_str(self.cos_factor)}{self.operand})"
+
+    def _call_internal(self, x: float) -> float:
+        return math.cos(self.cos_factor * x)
+
+    def _node_internal(self, arg):
+        return ausdruck.cos(ausdruck.scale(self.cos_factor, arg))
+
+    def derive(self) -> MFunc:
+        return SinFunc(
+            self.name + "'",
+            -self.factor * self.cos_factor,
+            self.cos_factor,
+            self.operand)
+
+
+class PowerFunc(MFunc):
+
+    def __init__(self, name: str = '', factor: float = 1.0, exponent: float = 1.0, operand: str = "x"):
+        super().__init__(name, factor, operand)
+        self.exponent = exponent
+
+    def _str_internal(self) -> str:
+        if self.exponent == 1.0:
+            return f"{self.operand}"
+        else:
+            return f"{self.operand}^{self.exponent}"
+
+    def _call_internal(self, x: float) -> float:
+        result = x ** self.exponent
+        if isinstance(result, complex):
+            # z.B. Wurzel aus einer negativen Zahl
+            raise ValueError("complex result")
+        return result
+
+    def _node_internal(self, arg):
+        return ausdruck.power(arg, self.exponent)
+
+    def derive(self):
+        # Ableitung: f(x) = a*x^n -> f'(x) = a*n*x^(n-1)
+        if self.exponent == 1.0:
+            # Ableitung einer linearen Funktion ist eine Konstante
+            return ConstFunc(self.name + "'", self.factor * self.exponent, self.operand)
+        elif self.exponent == 0.0:
+            # Ableitung einer Konstanten ist 0
+            return ConstFunc(self.name + "'", 0.0, self.operand)
+        else:
+            return PowerFunc(self.name + "'", self.factor * self.exponent, self.exponent - 1, self.operand)
+
+    def _simplify_step(self, simplify) -> MFunc:
+        if self.exponent == 0.0:
+            # x^0 = 1
+            return ConstFunc(self.name, self.factor, self.operand)
+        return self
+
+
+class SumFunc(MFunc):
+
+    def __init__(self, name: str, terms: [MFunc], factor: float = 1.0):
+        operand = terms[0].operand if terms else "x"
+        super().__init__(name, factor, operand)
+        self.terms = tuple(SumFunc._collect(terms))
+
+    @staticmethod
+    def _collect(terms: [MFunc]) -> [MFunc]:
+        '''
+        Fasst die Summanden zusammen: Verschachtelte Summen werden
+        aufgelöst, gleiche Terme (bis auf den Faktor) addiert und Terme
+        mit Faktor 0 weggelassen. Die Reihenfolge des ersten Auftretens
+        bleibt erhalten.
+        '''
+        collected = {}
+        for term in terms:
+            if isinstance(term, SumFunc) and term.factor == 1.0:
+                flat = term.terms
+            elif isinstance(term, SumFunc):
+                flat = [t._rescaled(t.name, t.factor * term.factor) for t in term.terms]
+            else:
+                flat = [term]
+            for t in flat:
+                key = t._key()
+                if key in collected:
+                    first, factor = collected[key]
+                    collected[key] = (first, factor + t.factor)
+                else:
+                    collected[key] = (t, t.factor)
+        return [first._rescaled(first.name, factor)
+                for first, factor in collected.values() if factor != 0.0]
+
+    def _str_internal(self) -> str:
+        if not self.terms:
+            return "(0.0)"
+        result = ""
+        for term in self.terms:
+            term_str = term._term_str()
+            if result and not term_str.startswith('-'):
+                result += '+'
+            result += term_str
+        return f"({result})"
+
+    def _call_internal(self, x: float) -> float:
+        return self._value(x)
+
+    def _call_step(self, x: float, values: dict) -> float:
+        return sum(term.factor * values[id(term)] for term in self.terms)
+
+    def _node_internal(self, arg):
+        return self._internal_node(arg)
+
+    def _node_step(self, arg, nodes: dict):
+        return ausdruck.add(*[ausdruck.scale(term.factor, nodes[id(term)])
+                              for term in self.terms])
+
+    def _children(self) -> tuple:
+        return self.terms
+
+    def _collapse(self) -> MFunc:
+        '''
+        Eine Summe mit höchstens einem Term als diesen Term.
+        '''
+        if not self.terms:
+            return ConstFunc(self.name, 0.0, self.operand)
+        if len(self.terms) == 1:
+            term = self.terms[0]
+            return term._rescaled(self.name, term.factor * self.factor)
+        return self
+
+    def _simplify_step(self, simplify) -> MFunc:
+        terms = [simplify(term) for term in self.terms]
+        return SumFunc(self.name, terms, self.factor)._collapse()
+
+    def derive(self) -> MFunc:
+        return self._derived()
+
+    def _derive_step(self, derived: dict) -> MFunc:
+        # Summenregel, abgeleitete Konstanten fallen beim Zusammenfassen weg
+        terms = [derived[id(term)] for term in self.terms]
+        return SumFunc(self.name + "'", terms, self.factor)._collapse()
+
+
+class ProdFunc(MFunc):
+    def __init__(self, name: str, left: MFunc, right: MFunc, factor: float = 1.0):
+        # Extract factors from the input functions and combine them
+        combined_factor = factor * left.factor * right.factor
+        super().__init__(name, combined_factor, left.operand)
+
+        # Die Faktoren stecken jetzt im Produkt, die Teilfunktionen
+        # werden mit Faktor 1 geteilt statt kopiert
+        self.left = left._rescaled(left.name, 1.0)
+        self.right = right._rescaled(right.name, 1.0)
+
+    def _str_internal(self) -> str:
+        # Konstanten stecken schon im Faktor und werden nicht ausgegeben
+        parts = [f._text() for f in (self.left, self.right)
+                 if not isinstance(f, ConstFunc)]
+        if not parts:
+            return f"{'1.0' if abs(self.factor) == 1.0 else ''}"
+        # No need for extra parentheses due to operator precedence
+        return "*".join(parts)
+
+    def _call_internal(self, x: float) -> float:
+        return self._value(x)
+
+    def _call_step(self, x: float, values: dict) -> float:
+        # Compute the product of the functions
+        return values[id(self.left)] * values[id(self.right)]
+
+    def _node_internal(self, arg):
+        return self._internal_node(arg)
+
+    def _node_step(self, arg, nodes: dict):
+        return ausdruck.mul(nodes[id(self.left)], nodes[id(self.right)])
+
+    def _children(self) -> tuple:
+        return (self.left, self.right)
+
+    @staticmethod
+    def _power_base(func: MFunc):
+        '''
+        Zerlegt einen Faktor (ohne eigenen Faktor) in Basis und
+        Exponent: x^n -> (None, n), g(x)^n -> (g, n), sonst (func, 1).
+        Die Basis None steht für den Operanden selbst.
+        '''
+        if isinstance(func, PowerFunc):
+            return None, func.exponent
+        if isinstance(func, NestedFunc) and isinstance(func.outer, PowerFunc):
+            return func.inner, func.outer.exponent
+        return func, 1
+
+    def _simplify_step(self, simplify) -> MFunc:
+        # Produkt flach machen, Faktoren und Konstanten nach vorne ziehen
+        factor = self.factor
+        factors = []
+        pending = [simplify(self.right), simplify(self.left)]
+        while pending:
+            f = pending.pop()
+            factor *= f.factor
+            if isinstance(f, ProdFunc):
+                pending += [f.right, f.left]
+            elif not isinstance(f, ConstFunc):
+                factors.append(f._rescaled(f.name, 1.0))
+        if factor == 0.0 or not factors:
+            return ConstFunc(self.name, factor, self.operand)
+
+        # Gleiche Basen zusammenfassen: g^a*g^b = g^(a+b)
+        powers = {}
+        for f in factors:
+            base, exponent = ProdFunc._power_base(f)
+            key = None if base is None else base._term_str()
+            if key in powers:
+                powers[key] = (powers[key][0], powers[key][1] + exponent)
+            else:
+                powers[key] = (base, exponent)
+        factors = []
+        for base, exponent in powers.values():
+            if exponent == 0:
+                continue
+            if base is None:
+                factors.append(PowerFunc("", 1.0, exponent, self.operand))
+            elif exponent == 1:
+                factors.append(base)
+            else:
+                factors.append(NestedFunc("", PowerFunc("", 1.0, exponent), base))
+
+        if not factors:
+            return ConstFunc(self.name, factor, self.operand)
+        if len(factors) == 1:
+            return factors[0]._rescaled(self.name, factor * factors[0].factor)
+        left = factors[0]
+        for f in factors[1:-1]:
+            left = ProdFunc("", left, f)
+        return ProdFunc(self.name, left, factors[-1], factor)
+
+    def derive(self) -> MFunc:
+        return self._derived()
+
+    def _derive_step(self, derived: dict) -> MFunc:
+        # Apply the product rule: (f*g)' = f'*g + f*g'
+        # Nur die neuen Produkte werden vereinfacht, die Ableitungen
+        # der Teilfunktionen sind es schon
+        first_term = ProdFunc("", derived[id(self.left)], self.right, self.factor)
+        second_term = ProdFunc("", self.left, derived[id(self.right)], self.factor)
+        return SumFunc(f"{self.name}'", [first_term._simplify_step(_unchanged),
+                                         second_term._simplify_step(_unchanged)])._collapse()
+
+
+class NestedFunc(MFunc):
+    def __init__(self, name: str, outer: MFunc, inner: MFunc, factor: float = 1.0):
+        # Der Faktor der äußeren Funktion wird zum Faktor der Verkettung
+        super().__init__(name, factor * outer.factor, inner.operand)
+        self.outer = outer._rescaled(outer.name, 1.0)
+        self.inner = inner
+
+    def _str_internal(self) -> str:
+        # Die innere Funktion ist der Operand der äußeren Funktion
+        return self.outer._replace(operand=self.inner._term_str())._str_internal()
+
+    def _call_internal(self, x: float) -> float:
+        return self._value(x)
+
+    def _call_step(self, x: float, values: dict) -> float:
+        # Calculate inner function's value first, then pass it to the outer function
+        inner_value = self.inner.factor * values[id(self.inner)]
+        return self.outer._value(inner_value)
+
+    def _node_internal(self, arg):
+        return self._internal_node(arg)
+
+    def _node_step(self, arg, nodes: dict):
+        inner_node = ausdruck.scale(self.inner.factor, nodes[id(self.inner)])
+        return self.outer._internal_node(inner_node)
+
+    def _children(self) -> tuple:
+        return (self.outer, self.inner)
+
+    def _arg_children(self) -> tuple:
+        return (self.inner,)
+
+    def _simplify_step(self, simplify) -> MFunc:
+        outer = simplify(self.outer)
+        inner = simplify(self.inner)
+        factor = self.factor * outer.factor
+        if isinstance(outer, ConstFunc):
+            return ConstFunc(self.name, factor, self.operand)
+        if isinstance(outer, PowerFunc) and outer.exponent == 1.0:
+            # g(x)^1 = g(x)
+            return inner._rescaled(self.name, factor * inner.factor)
+        if isinstance(inner, ConstFunc):
+            # Konstante einsetzen, bei einem Fehler bleibt alles stehen
+            value = outer._rescaled("", 1.0)(inner.factor)
+            if not math.isnan(value):
+                return ConstFunc(self.name, factor * value, self.operand)
+        return NestedFunc(self.name, outer._rescaled(outer.name, 1.0), inner, factor)
+
+    def derive(self) -> MFunc:
+        return self._derived()
+
+    def _derive_step(self, derived: dict) -> MFunc:
+        # Kettenregel: (g(h(x)))' = g'(h(x)) * h'(x)
+        name = self.name + "'"
+        outer_derivative = derived[id(self.outer)]
+        inner_derivative = derived[id(self.inner)]
+
+        # Sonderfall: innere Ableitung ist konstant und wird zum Faktor
+        if isinstance(inner_derivative, ConstFunc):
+            return NestedFunc(name, outer_derivative, self.inner,
+                              self.factor * inner_derivative.factor)._simplify_step(_unchanged)
+
+        derived_outer_nested = NestedFunc("", outer_derivative, self.inner)
+        return ProdFunc(name, derived_outer_nested, inner_derivative,
+                        self.factor)._simplify_step(_unchanged)
+
+
+if __name__ == '__main__':
+    f = NestedFunc("f", PowerFunc("", 1.0, 2.0), SinFunc())
+    print(f, f.derive(), f.derive().derive(), sep='\n')
+    Plottable.multi_plot([f,
+                          f.derive(),
+                          f.derive().derive(),
+                          f.derive().derive().derive()],
+                         -math.pi, math.pi, 1000)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+
+"""Nullstellen und Integrale von MFunc-Funktionen (Kapitel 7).
+
+Alle Verfahren arbeiten mit vielen Stellen gleichzeitig: newton() und
+brent() iterieren für ein ganzes Array von Startwerten bzw. Intervallen
+(in jeder Runde werden nur die noch nicht fertigen Stellen berechnet),
+integrate() berechnet in jeder Runde alle noch zu ungenauen
+Teilintervalle mit einem Aufruf. Die Funktionen werden einmal übersetzt
+(MFunc.compile()) und dann nur noch über den Array-Pfad berechnet.
+
+Jedes Ergebnis enthält die Anzahl der Funktionsaufrufe (calls) und der
+berechneten Stellen (points).
+"""
+
+import math
+import numpy as np
+
+from funktionen import MFunc, FunctionError
+
+
+# Gauss-Kronrod (7/15): Knoten und Gewichte auf [-1, 1] aus QUADPACK,
+# nur die nicht negativen Knoten, jeder zweite ist ein Gauss-Knoten
+_KRONROD_NODES = np.array([
+    0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245, 0.0])
+_KRONROD_WEIGHTS = np.array([
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714])
+_GAUSS_WEIGHTS = np.array([
+    0.0, 0.129484966168869693270611432679082,
+    0.0, 0.279705391489276667901467771423780,
+    0.0, 0.381830050505118944950369775488975,
+    0.0, 0.417959183673469387755102040816327])
+
+
+def _symmetric(values, sign):
+    """
+    Werte für die Knoten -x_0, ..., -x_6, 0, x_6, ..., x_0 aus den
+    Werten für x_0, ..., x_6, 0.
+    """
+    return np.concatenate((sign*values[:-1], values[-1:], values[-2::-1]))
+
+
+KRONROD_NODES = _symmetric(_KRONROD_NODES, -1.0)
+KRONROD_WEIGHTS = _symmetric(_KRONROD_WEIGHTS, 1.0)
+GAUSS_WEIGHTS = _symmetric(_GAUSS_WEIGHTS, 1.0)
+
+# Simpson: Stellen auf [0, 1], einmal mit drei, einmal mit fünf Stellen
+SIMPSON_NODES = np.linspace(0.0, 1.0, 5)
+SIMPSON_COARSE = np.array([1.0, 0.0, 4.0, 0.0, 1.0])/6
+SIMPSON_FINE = np.array([1.0, 4.0, 2.0, 4.0, 1.0])/12
+
+
+class CountedFunction:
+    """
+    Array-Funktion mit Zählern für Aufrufe (calls) und berechnete
+    Stellen (points). Eine MFunc wird einmal übersetzt, andere
+    Plottables werden über evaluate() berechnet. Ungültige Stellen
+    sind wie bei MFunc.evaluate() NaN.
+    """
+    def __init__(self, function):
+        self.function = function
+        self._run = function.compile() if isinstance(function, MFunc) else function.evaluate
+        self.calls = 0
+        self.points = 0
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        self.calls += 1
+        self.points += x.size
+        with np.errstate(all='ignore'):
+            y = np.asarray(self._run(x.reshape(-1)), dtype=float)
+        y[np.isinf(y)] = math.nan
+        return y.reshape(x.shape)
+
+
+class RootResult:
+    """
+    Ergebnis einer Nullstellensuche: Nullstellen x (NaN, wo das
+    Verfahren nicht konvergiert ist), converged, Anzahl der Iterationen
+    je Stelle und die Zähler für die Funktionsaufrufe.
+    """
+    def __init__(self, x, converged, iterations, calls, points):
+        self.x = x
+        self.converged = converged
+        self.iterations = iterations
+        self.calls = calls
+        self.points = points
+
+    def __repr__(self):
+        return (f"RootResult({np.count_nonzero(self.converged)}/{self.converged.size} konvergiert, "
+                f"{self.calls} Aufrufe, {self.points} Stellen)")
+
+
+class IntegralResult:
+    """
+    Ergebnis einer Integration: Wert, geschätzter Fehler, ob die
+    Genauigkeit erreicht wurde, Anzahl der Teilintervalle und die
+    Zähler für die Funktionsaufrufe.
+    """
+    def __init__(self, value, error, converged, intervals, calls, points):
+        self.value = value
+        self.error = error
+        self.converged = converged
+        self.intervals = intervals
+        self.calls = calls
+        self.points = points
+
+    def __repr__(self):
+        return (f"IntegralResult({self.value!r} +- {self.error:.1e}, {self.intervals} Intervalle, "
+                f"{self.calls} Aufrufe, {self.points} Stellen)")
+
+
+def newton(f, x0, tol=1e-12, max_iter=50):
+    """
+    Newton-Verfahren x <- x - f(x)/f'(x) für alle Startwerte x0
+    gleichzeitig, die Ableitung wird einmal mit f.derive() gebildet.
+
+    Eine Stelle ist fertig, wenn der Schritt höchstens
+    tol*(1+|x|) ist oder f(x) = 0. Wird die Ableitung 0 oder ein Wert
+    ungültig, bricht die Iteration für diese Stelle ab.
+    """
+    if not isinstance(f, MFunc):
+        raise FunctionError("Newton's method needs an MFunc")
+    function, derivative = CountedFunction(f), CountedFunction(f.derive())
+    x0 = np.asarray(x0, dtype=float)
+    x = x0.reshape(-1).copy()
+    converged = np.zeros(x.size, dtype=bool)
+    iterations = np.zeros(x.size, dtype=np.int64)
+    active = np.flatnonzero(np.isfinite(x))
+    for i in range(max_iter):
+        if len(active) == 0:
+            break
+        xa = x[active]
+        fx = function(xa)
+        with np.errstate(all='ignore'):
+            step = fx/derivative(xa)
+        root = fx == 0.0
+        step[root] = 0.0
+        failed = ~np.isfinite(step)
+        xa = xa-step
+        done = ~failed & (np.abs(step) <= tol*(1.0+np.abs(xa)))
+        x[active[~failed]] = xa[~failed]
+        iterations[active] += 1
+        converged[active[done]] = True
+        active = active[~(done | failed)]
+    x[~converged] = math.nan
+    return RootResult(x.reshape(x0.shape), converged.reshape(x0.shape),
+                      iterations.reshape(x0.shape), function.calls+derivative.calls,
+                      function.points+derivative.points)
+
+
+def brent(f, a, b, tol=1e-12, max_iter=200):
+    """
+    Nullstellen in den Intervallen [a, b] (Arrays, alle Intervalle
+    gleichzeitig) nach Brent: inverse quadratische Interpolation bzw.
+    Sekantenschritt, wenn er im Intervall bleibt und schnell genug
+    kleiner wird, sonst Bisektion. Das Intervall schließt die
+    Nullstelle immer ein.
+
+    Intervalle ohne Vorzeichenwechsel von f gelten als nicht
+    konvergiert, ebenso Intervalle, bei denen |f| an der gefundenen
+    Stelle größer als an beiden Intervallenden ist (Vorzeichenwechsel
+    an einer Polstelle wie bei 1/x). An einfachen Nullstellen reichen wenige Schritte, an
+    mehrfachen konvergiert das Verfahren nur linear: x^3 braucht auf
+    [-1, 2] etwa 125, auf [-10^6, 2*10^6] etwa 185 Schritte. Für noch
+    breitere Intervalle oder kleineres tol muss max_iter größer sein.
+    """
+    counted = CountedFunction(f)
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    shape = a.shape
+    a, b = a.reshape(-1).copy(), b.reshape(-1).copy()
+    values = counted(np.concatenate((a, b)))
+    fa, fb = values[:len(a)], values[len(a):]
+    bound = np.minimum(np.abs(fa), np.abs(fb))
+    root = np.full(len(a), math.nan)
+    converged = np.zeros(len(a), dtype=bool)
+    iterations = np.zeros(len(a), dtype=np.int64)
+    # c ist das Gegenende des Intervalls, d der letzte, e der vorletzte Schritt
+    c, fc = b.copy(), fb.copy()
+    d = b-a
+    e = d.copy()
+    active = np.flatnonzero((np.sign(fa)*np.sign(fb) <= 0.0) & np.isfinite(fa) & np.isfinite(fb))
+    eps = np.finfo(float).eps
+    for i in range(max_iter+1):
+        A, B, C, D, E = a[active], b[active], c[active], d[active], e[active]
+        FA, FB, FC = fa[active], fb[active], fc[active]
+        # Gleiches Vorzeichen von f(b) und f(c): a wird das Gegenende
+        same = np.sign(FB) == np.sign(FC)
+        C, FC = np.where(same, A, C), np.where(same, FA, FC)
+        D, E = np.where(same, B-A, D), np.where(same, B-A, E)
+        # b ist der bessere Endpunkt, a der vorige
+        swap = np.abs(FC) < np.abs(FB)
+        A, FA = np.where(swap, B, A), np.where(swap, FB, FA)
+        B, C = np.where(swap, C, B), np.where(swap, A, C)
+        FB, FC = np.where(swap, FC, FB), np.where(swap, FA, FC)
+        tol1 = 2.0*eps*np.abs(B)+0.5*tol
+        xm = 0.5*(C-B)
+        done = (np.abs(xm) <= tol1) | (FB == 0.0)
+        # Bei einer Polstelle wächst |f| beim Einschließen, das ist
+        # keine Nullstelle
+        found = done & (np.abs(FB) <= bound[active])
+        root[active[found]] = B[found]
+        converged[active[found]] = True
+        keep = ~done
+        active = active[keep]
+        if len(active) == 0 or i == max_iter:
+            break
+        A, B, C, D, E = A[keep], B[keep], C[keep], D[keep], E[keep]
+        FA, FB, FC, tol1, xm = FA[keep], FB[keep], FC[keep], tol1[keep], xm[keep]
+
+        # Interpolationsschritt p/q (Sekante, wenn a = c, sonst invers quadratisch)
+        with np.errstate(all='ignore'):
+            s = FB/FA
+            q, r = FA/FC, FB/FC
+            secant = A == C
+            p = np.where(secant, 2.0*xm*s, s*(2.0*xm*q*(q-r)-(B-A)*(r-1.0)))
+            q = np.where(secant, 1.0-s, (q-1.0)*(r-1.0)*(s-1.0))
+            q = np.where(p > 0.0, -q, q)
+            p = np.abs(p)
+            accept = ((np.abs(E) >= tol1) & (np.abs(FA) > np.abs(FB))
+                      & (2.0*p < np.minimum(3.0*xm*q-np.abs(tol1*q), np.abs(E*q))))
+            E, D = np.where(accept, D, xm), np.where(accept, p/q, xm)
+        # Mindestens tol1 weit gehen
+        step = np.where(np.abs(D) > tol1, D, np.where(xm > 0.0, tol1, -tol1))
+
+        a[active], fa[active] = B, FB
+        c[active], fc[active], d[active], e[active] = C, FC, D, E
+        b[active] = B+step
+        fb[active] = counted(b[active])
+        iterations[active] += 1
+    return RootResult(root.reshape(shape), converged.reshape(shape),
+                      iterations.reshape(shape), counted.calls, counted.points)
+
+
+def _kronrod(counted, low, high):
+    """
+    Gauss-Kronrod (7/15) auf allen Intervallen [low, high] mit einem
+    Aufruf: (Kronrod-Wert, |Kronrod-Wert - Gauss-Wert|).
+    """
+    center, half = (low+high)/2, (high-low)/2
+    y = counted(center[:, np.newaxis]+half[:, np.newaxis]*KRONROD_NODES)
+    kronrod = half*(y @ KRONROD_WEIGHTS)
+    return kronrod, np.abs(kronrod-half*(y @ GAUSS_WEIGHTS))
+
+
+def _simpson(counted, low, high):
+    """
+    Simpson auf allen Intervallen [low, high] mit einem Aufruf, einmal
+    mit einem und einmal mit zwei Teilintervallen. Der Fehler der
+    feineren Summe ist etwa ein Fünfzehntel der Differenz
+    (Richardson-Extrapolation).
+    """
+    width = high-low
+    y = counted(low[:, np.newaxis]+width[:, np.newaxis]*SIMPSON_NODES)
+    fine = width*(y @ SIMPSON_FINE)
+    difference = (fine-width*(y @ SIMPSON_COARSE))/15
+    return fine+difference, np.abs(difference)
+
+
+RULES = {
+    "kronrod": _kronrod,
+    "simpson": _simpson,
+}
+
+
+def integrate(f, a, b, tol=1e-10, rel_tol=1e-10, rule="kronrod", max_intervals=10000):
+    """
+    Integral von f über [a, b], adaptiv: Jedes Teilintervall, dessen
+    Fehlerschätzung größer als sein Anteil (nach Breite) an der
+    erlaubten Abweichung max(tol, rel_tol*|Integral|) ist, wird
+    halbiert. Alle zu ungenauen Intervalle einer Runde werden mit einem
+    Aufruf berechnet.
+
+    rule ist "kronrod" (Gauss-Kronrod 7/15) oder "simpson". Wird
+    max_intervals erreicht oder ist f an einer Stelle ungültig, ist
+    das Ergebnis nicht konvergiert.
+    """
+    if rule not in RULES:
+        raise FunctionError(f"Unknown integration rule '{rule}'")
+    a, b = float(a), float(b)
+    if not (math.isfinite(a) and math.isfinite(b)):
+        raise FunctionError("Integration limits must be finite")
+    counted = CountedFunction(f)
+    if a == b:
+        return IntegralResult(0.0, 0.0, True, 0, 0, 0)
+    sign = 1.0
+    if a > b:
+        a, b, sign = b, a, -1.0
+    low, high = np.array([a]), np.array([b])
+    value, error = RULES[rule](counted, low, high)
+    done_value, done_error, intervals = 0.0, 0.0, 1
+    converged = True
+    while True:
+        total = done_value+value.sum()
+        allowed = max(tol, rel_tol*abs(total))
+        if not np.isfinite(total):
+            converged = False
+            break
+        # Anteil jedes Intervalls an der erlaubten Abweichung
+        fine = error <= allowed*(high-low)/(b-a)
+        done_value += value[fine].sum()
+        done_error += error[fine].sum()
+        low, high = low[~fine], high[~fine]
+        value, error = value[~fine], error[~fine]
+        if len(low) == 0:
+            break
+        if intervals+len(low) > max_intervals:
+            converged = False
+            break
+        middle = (low+high)/2
+        low, high = np.concatenate((low, middle)), np.concatenate((middle, high))
+        intervals += len(middle)
+        value, error = RULES[rule](counted, low, high)
+    return IntegralResult(sign*float(done_value+value.sum()), float(done_error+error.sum()),
+                          converged, intervals, counted.calls, counted.points)
@@ -0,0 +1,121 @@
+import math
+import unittest
+import numpy as np
+from ausdruck import const, var, scale, add, mul, exp, sin, cos, power
+from funktionen import (ConstFunc, ExpFunc, SinFunc, CosFunc, PowerFunc,
+                        SumFunc, ProdFunc, NestedFunc)
+
+
+class TestAusdruck(unittest.TestCase):
+    """
+    Unittests für die Ausdrucksgraphen.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.funcs = [
+            NestedFunc("f", PowerFunc("", 1.0, 2.0), SinFunc()),
+            NestedFunc("g", CosFunc("", 3.0), ProdFunc("", PowerFunc("", 1.0, 1.0), ExpFunc("", 1.0, 1.0))),
+            NestedFunc("h", ExpFunc("", 2.0, 1.0), SumFunc("", [SinFunc(), CosFunc()])),
+            ProdFunc("p", SinFunc("", -1.0, 0.5), PowerFunc("", -3.0, 1.5)),
+            SumFunc("s", [PowerFunc("", 2.5, 2.0), PowerFunc("", -4.0, 1.0), ConstFunc("", 3.0)]),
+        ]
+        self.x = np.linspace(0.1, 2.0, 50)
+
+    def test_01_sharing(self):
+        """
+        Testet, dass gleiche Teilausdrücke derselbe Knoten sind.
+        """
+        x = var()
+        self.assertIs(exp(scale(2.0, x)), exp(scale(2.0, x)))
+        self.assertIs(add(sin(x), cos(x)), add(sin(x), cos(x)))
+        self.assertIsNot(add(sin(x), cos(x)), add(cos(x), sin(x)))
+        self.assertIs(scale(1.0, x), x)
+        self.assertIs(mul(const(0.0), x), const(0.0))
+        self.assertIs(mul(scale(2.0, x), scale(3.0, x)), scale(6.0, mul(x, x)))
+        self.assertIs(add(const(1.0), x, const(-1.0)), x)
+        g = self.funcs[1]
+        self.assertIs(g.to_node(), g.clone().to_node())
+
+    def test_02_derive(self):
+        """
+        Testet Ableitungen gegen die symbolischen Ableitungen der MFunc.
+        """
+        for f in self.funcs:
+            node = f.to_node()
+            derived = f
+            for order in range(1, 4):
+                derived = derived.derive()
+                np.testing.assert_allclose(node.derive(order).evaluate(self.x),
+                                           derived.evaluate(self.x), rtol=1e-10, atol=1e-10)
+        x = var()
+        self.assertIs(exp(x).derive(), exp(x))
+        self.assertIs(sin(x).derive(2), scale(-1.0, sin(x)))
+
+    def test_03_memo(self):
+        """
+        Testet, dass Ableitungen gespeichert werden und klein bleiben.
+        """
+        for f in self.funcs:
+            node = f.to_node()
+            fifth = node.derive(5)
+            self.assertIs(node.derive(5), fifth)
+            self.assertIs(node.derive().derive(4), fifth)
+            self.assertLess(fifth.size(), 100)
+        g = self.funcs[1].to_node().derive(5)
+        self.assertGreater(g.tree_size(), 10*g.size())
+
+    def test_04_evaluate(self):
+        """
+        Testet die Berechnung mit gemeinsamen Teilausdrücken und Fehlern.
+        """
+        x = var()
+        values = np.array([-1.0, 0.0, 2.0])
+        np.testing.assert_allclose(mul(x, x).evaluate(values), [1.0, 0.0, 4.0])
+        for n in (3.0, 4.0, 5.0, -1.0):
+            np.testing.assert_allclose(power(x, n).evaluate(values[values != 0.0]),
+                                       values[values != 0.0]**n)
+            np.testing.assert_allclose(power(exp(x), n).evaluate(values), np.exp(values)**n)
+        np.testing.assert_allclose(add(exp(x), exp(x), x).evaluate(values),
+                                   2*np.exp(values)+values)
+        self.assertEqual(x.evaluate(values).tolist(), values.tolist())
+        self.assertIsNot(x.evaluate(values), values)
+        self.assertEqual(const(2.0).evaluate(3.0), 2.0)
+        root = power(const(-1.0), 0.5)
+        self.assertEqual(root.op, 'power')
+        self.assertTrue(math.isnan(root.evaluate(1.0)))
+        self.assertEqual(add(sin(x), mul(sin(x), sin(x))).size(), 4)
+
+    def test_05_taylor(self):
+        """
+        Testet die Taylor-Koeffizienten gegen die symbolischen
+        Ableitungen des Graphen.
+        """
+        for f in self.funcs:
+            node = f.to_node()
+            series = node.taylor(self.x, 6)
+            self.assertEqual(series.shape, (7, 50))
+            for k in range(7):
+                np.testing.assert_allclose(series[k]*math.factorial(k), node.derive(k).evaluate(self.x),
+                                           rtol=1e-10, atol=1e-10)
+        x = var()
+        series = power(x, 3.0).taylor(np.array([0.0, 2.0]), 4)
+        np.testing.assert_array_equal(series, [[0.0, 8.0], [0.0, 12.0], [0.0, 6.0], [1.0, 1.0], [0.0, 0.0]])
+        np.testing.assert_array_equal(x.taylor(2.0, 2), [2.0, 1.0, 0.0])
+        np.testing.assert_array_equal(const(3.0).taylor(np.zeros((2, 2)), 1)[1], np.zeros((2, 2)))
+
+
+if __name__ == '__main__':
+    #Durchführung der Tests
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestAusdruck("test_01_sharing"))
+    suite.addTest(TestAusdruck("test_02_derive"))
+    suite.addTest(TestAusdruck("test_03_memo"))
+    suite.addTest(TestAusdruck("test_04_evaluate"))
+    suite.addTest(TestAusdruck("test_05_taylor"))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
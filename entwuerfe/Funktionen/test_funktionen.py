@@ -0,0 +1,934 @@
+import math
+import unittest
+import numpy as np
+from funktionen import (Plottable, MFunc, ConstFunc, ExpFunc, SinFunc, CosFunc,
+                        PowerFunc, SumFunc, ProdFunc, NestedFunc, FunctionError)
+
+
+class TestConstFunc(unittest.TestCase):
+    """
+    Unittests für die konstante Funktion.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.f  = ConstFunc("f", 1.0)
+        self.g  = ConstFunc("g", 3.5)
+        self.h  = ConstFunc("h", -2.0, 'y')
+        self.k  = ConstFunc("k", 0.0)
+
+    def test_01_call(self):
+        """
+        Testet korrekte Berechnung.
+        """
+        self.assertAlmostEqual(self.f(1.0), 1.0)
+        self.assertAlmostEqual(self.f(-10.0), 1.0)
+        self.assertAlmostEqual(self.g(0.0), 3.5)
+        self.assertAlmostEqual(self.h(0.0), -2.0)
+        self.assertAlmostEqual(self.k(11.5), 0.0)
+
+    def test_02_str(self):
+        """
+        Testet korrekte Ausgabe als String.
+        """
+        self.assertEqual(str(self.f),'f(x)=1.0')
+        self.assertEqual(str(self.g),'g(x)=3.5')
+        self.assertEqual(str(self.h),'h(y)=-2.0')
+        self.assertEqual(str(self.k),'k(x)=0.0')
+
+    def test_03_derive(self):
+        """
+        Testet Ableitung.
+        """
+        fd= self.f.derive()
+        hd= self.h.derive()
+        self.assertTrue(type(fd) is ConstFunc)
+        self.assertEqual(fd.factor, 0.0)
+        self.assertEqual(fd.operand, 'x')
+        self.assertEqual(str(fd), "f'(x)=0.0")
+        self.assertTrue(type(hd) is ConstFunc)
+        self.assertEqual(hd.factor, 0.0)
+        self.assertEqual(hd.operand, 'y')
+        self.assertEqual(str(hd), "h'(y)=0.0")
+
+
+class TestExpFunc(unittest.TestCase):
+    """
+    Unittests für die e-Funktion.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.f  = ExpFunc("f", 1.0)
+        self.g  = ExpFunc("g", 2.0, 3.0)
+        self.h  = ExpFunc("h", -1.0, -2.0, 'y')
+
+    def test_01_call(self):
+        """
+        Testet korrekte Berechnung.
+        """
+        self.assertAlmostEqual(self.f(0.0), 1.0)
+        self.assertAlmostEqual(self.f(1.0), math.e)
+        self.assertAlmostEqual(self.f(3.0), 20.085536923187664)
+        self.assertAlmostEqual(self.g(2.0), 806.85758698547)
+        self.assertAlmostEqual(self.g(-2.0), 0.004957504353332719)
+        self.assertAlmostEqual(self.h(4.0), -0.00033546262790251196)
+        self.assertAlmostEqual(self.h(-4.0), -2980.957987041727)
+
+    def test_02_str(self):
+        """
+        Testet korrekte Ausgabe als String.
+        """
+        self.assertEqual(str(self.f),'f(x)=e^x')
+        self.assertEqual(str(self.g),'g(x)=2.0e^(3.0x)')
+        self.assertEqual(str(self.h),'h(y)=-e^(-2.0y)')
+
+    def test_03_derive(self):
+        """
+        Testet Ableitung.
+        """
+        fd= self.f.derive()
+        gd= self.g.derive()
+        hd= self.h.derive()
+        self.assertTrue(type(fd) is ExpFunc)
+        self.assertEqual(fd.name, "f'")
+        self.assertEqual(fd.factor, 1.0)
+        self.assertEqual(fd.exp_factor, 1.0)
+        self.assertEqual(fd.operand, 'x')
+        self.assertEqual(str(gd),"g'(x)=6.0e^(3.0x)")
+        self.assertAlmostEqual(gd(2.5), 10848.254486736376)
+        self.assertEqual(str(hd),"h'(y)=2.0e^(-2.0y)")
+        self.assertAlmostEqual(hd(1.0), 0.2706705664732254)
+
+
+class TestSinCos(unittest.TestCase):
+    """
+    Unittests für die Sinus- und Cosinus-Funktionen.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.fs  = SinFunc("f", 1.0)
+        self.gs  = SinFunc("g", 3.0, 2.0, 'y')
+        self.fc  = CosFunc("f", 1.0, 1.0)
+        self.gc  = CosFunc("g", -3.0, -2.0, 'y')
+
+    def test_01_call_sin(self):
+        """
+        Testet korrekte Berechnung.
+        """
+        self.assertAlmostEqual(self.fs(0.0), 0.0)
+        self.assertAlmostEqual(self.fs(math.pi/2), 1.0)
+        self.assertAlmostEqual(self.fs(math.pi), 0.0)
+        self.assertAlmostEqual(self.fs(1.0), 0.8414709848078965)
+        self.assertAlmostEqual(self.gs(0.0), 0.0)
+        self.assertAlmostEqual(self.gs(-math.pi/2), 0.0)
+        self.assertAlmostEqual(self.gs(-math.pi), 0.0)
+        self.assertAlmostEqual(self.gs(1.0), 2.727892280477045)
+
+    def test_02_call_cos(self):
+        """
+        Testet korrekte Berechnung.
+        """
+        self.assertAlmostEqual(self.fc(0.0), 1.0)
+        self.assertAlmostEqual(self.fc(math.pi/2), 0.0)
+        self.assertAlmostEqual(self.fc(math.pi), -1.0)
+        self.assertAlmostEqual(self.gc(1.0), 1.2484405096414273)
+
+
+    def test_03_str_sin(self):
+        """
+        Testet korrekte Ausgabe als String.
+        """
+        self.assertEqual(str(self.fs),'f(x)=sin(x)')
+        self.assertEqual(str(self.gs),'g(y)=3.0sin(2.0y)')
+
+    def test_04_str_cos(self):
+        """
+        Testet korrekte Ausgabe als String.
+        """
+        self.assertEqual(str(self.fc),'f(x)=cos(x)')
+        self.assertEqual(str(self.gc),'g(y)=-3.0cos(-2.0y)')
+
+    def test_05_derive_once(self):
+        """
+        Testet Ableitung.
+        """
+        fsd= self.fs.derive()
+        gsd= self.gs.derive()
+        fcd= self.fc.derive()
+        gcd= self.gc.derive()
+        self.assertTrue(type(fsd) is CosFunc)
+        self.assertEqual(fsd.factor, 1.0)
+        self.assertEqual(fsd.cos_factor, 1.0)
+        self.assertEqual(fsd.operand, 'x')
+        self.assertEqual(fsd._str_internal(), self.fc._str_internal())
+        self.assertEqual(str(gsd), "g'(y)=6.0cos(2.0y)")
+        self.assertEqual(str(fcd), "f'(x)=-sin(x)")
+        self.assertEqual(str(gcd), "g'(y)=-6.0sin(-2.0y)")
+
+    def test_06_derive_multiple(self):
+        fsd= self.fs.derive().derive().derive().derive()
+        fcd= self.fc.derive().derive().derive().derive()
+        self.assertEqual(str(fsd), "f''''(x)=sin(x)")
+        self.assertEqual(str(fcd), "f''''(x)=cos(x)")
+
+        gsd= self.gs.derive().derive()
+        gcd= self.gc.derive().derive()
+        self.assertEqual(str(gsd), "g''(y)=-12.0sin(2.0y)")
+        self.assertEqual(str(gcd), "g''(y)=12.0cos(-2.0y)")
+
+
+class TestPowerFunc(unittest.TestCase):
+    """
+    Unittests für die Potenz-Funktion.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.f  = PowerFunc("f", 1.0, 2.0)
+        self.g  = PowerFunc("g", -3.0, 1.0)
+        self.h  = PowerFunc("h", 0.5, 3.0, 'y')
+
+    def test_01_call(self):
+        """
+        Testet korrekte Berechnung.
+        """
+        self.assertAlmostEqual(self.f(1.0), 1.0)
+        self.assertAlmostEqual(self.f(3.0), 9.0)
+        self.assertAlmostEqual(self.f(-2.5), 6.25)
+        self.assertAlmostEqual(self.g(0.0), 0.0)
+        self.assertAlmostEqual(self.g(2.0), -6.0)
+        self.assertAlmostEqual(self.h(0.5), 0.0625)
+        self.assertAlmostEqual(self.h(-1.5), -1.6875)
+
+    def test_02_str(self):
+        """
+        Testet korrekte Ausgabe als String.
+        """
+        self.assertEqual(str(self.f),'f(x)=x^2.0')
+        self.assertEqual(str(self.g),'g(x)=-3.0x')
+        self.assertEqual(str(self.h),'h(y)=0.5y^3.0')
+
+    def test_03_derive_to_power(self):
+        """
+        Testet Ableitung auf eine andere Potenzfunktion.
+        """
+        fd= self.f.derive()
+        hd= self.h.derive()
+        hdd= hd.derive()
+
+        self.assertTrue(type(fd) is PowerFunc)
+        self.assertEqual(fd.factor, 2.0)
+        self.assertEqual(fd.exponent, 1.0)
+        self.assertEqual(fd.operand, 'x')
+        self.assertEqual(str(fd), "f'(x)=2.0x")
+        self.assertEqual(str(hd), "h'(y)=1.5y^2.0")
+        self.assertEqual(str(hdd), "h''(y)=3.0y")
+
+    def test_04_derive_to_const(self):
+        """
+        Testet Ableitung zur Konstantenfunktion.
+        """
+        gd= self.g.derive()
+        gdd= self.g.derive().derive()
+        fdd= self.f.derive().derive()
+        self.assertTrue(type(gd) is ConstFunc)
+        self.assertTrue(type(gdd) is ConstFunc)
+        self.assertTrue(type(fdd) is ConstFunc)
+        self.assertEqual(str(gd), "g'(x)=-3.0")
+        self.assertEqual(str(gdd), "g''(x)=0.0")
+        self.assertEqual(str(fdd), "f''(x)=2.0")
+
+
+class TestSumFunc(unittest.TestCase):
+    """
+    Unittests für die zusammengestzte Summen-Funktion.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.f  = SumFunc("f",[PowerFunc("", 1.0, 3.0), PowerFunc("", 1.0, 2.0), PowerFunc("", 1.0, 1.0)])
+        self.g  = SumFunc("g",[PowerFunc("", 2.5, 2.0), PowerFunc("", -4.0, 1.0), ConstFunc("", 3.0)])
+        self.h  = SumFunc("h", [SinFunc(), CosFunc("",3.0, 0.5), ConstFunc("", -1.0)])
+        self.k  = SumFunc("k", [PowerFunc("", 1.0, 4.0), PowerFunc("", 5.0, 1.0)])
+
+    def test_01_call(self):
+        """
+        Testet korrekte Berechnung.
+        """
+        self.assertAlmostEqual(self.f(2.0), 14.0)
+        self.assertAlmostEqual(self.f(3.0), 39.0)
+        self.assertAlmostEqual(self.g(0.0), 3.0)
+        self.assertAlmostEqual(self.g(3.0), 13.5)
+        self.assertAlmostEqual(self.g(-1.0), 9.5)
+        self.assertAlmostEqual(self.h(math.pi), -1.0)
+        self.assertAlmostEqual(self.h(math.pi/2), 2.121320343559643)
+
+    def test_02_str(self):
+        """
+        Testet korrekte Ausgabe als String.
+        """
+        self.assertEqual(str(self.f),"f(x)=(x^3.0+x^2.0+x)")
+        self.assertEqual(str(self.g),"g(x)=(2.5x^2.0-4.0x+3.0)")
+        self.assertEqual(str(self.h),"h(x)=(sin(x)+3.0cos(0.5x)-1.0)")
+
+    def test_03_derive_once(self):
+        """
+        Testet einmalige Ableitung.
+        """
+        fd= self.f.derive()
+        gd= self.g.derive()
+        hd= self.h.derive()
+
+        self.assertTrue(type(fd) is SumFunc)
+        self.assertEqual(fd.factor, 1.0)
+        self.assertEqual(fd.operand, 'x')
+        self.assertIn("f'(x)=(", str(fd))
+        self.assertIn("3.0x^2.0", str(fd))
+        self.assertIn("2.0x", str(fd))
+        self.assertIn("1.0", str(fd))
+        self.assertAlmostEqual(fd(3.0), 34.0)
+
+        self.assertEqual(len(gd.terms), 2)
+        self.assertNotIn("0.0", str(gd))
+        self.assertIn("4.0", str(gd))
+        self.assertIn("5.0x", str(gd))
+        self.assertAlmostEqual(gd(-2.0), -14.0)
+
+        self.assertIn("cos(x)", str(hd))
+        self.assertIn("-1.5sin(0.5x)", str(hd))
+        self.assertAlmostEqual(hd(math.pi), -2.5)
+
+        #self.assertEqual(str(fd), "f'(x)=2.0x")
+        #self.assertEqual(str(hd), "h'(y)=1.5y^2.0")
+        #self.assertEqual(str(hdd), "h''(y)=3.0y")
+
+    def test_04_derive_multiple(self):
+        """
+        Testet mehrfache Ableitung und Wegfall von Konstanten.
+        """
+
+        fdd= self.f.derive().derive()
+        fddd= self.f.derive().derive().derive()
+        kdd= self.k.derive().derive()
+
+        self.assertEqual(len(fdd.terms), 2)
+        self.assertIn("f''(x)=(", str(fdd))
+        self.assertIn("6.0x", str(fdd))
+        self.assertIn("+2.0", str(fdd))
+
+        self.assertTrue(type(fddd) is ConstFunc)
+        self.assertEqual(str(fddd), "f'''(x)=6.0")
+
+        self.assertTrue(type(kdd) is PowerFunc)
+        self.assertEqual(str(kdd), "k''(x)=12.0x^2.0")
+
+    #Bonus-Aufgabe
+    def test_11_simplify(self):
+        """
+        Testet Die Vereinfachung/Zusammenfasung der Summe.
+        """
+        s1 = SumFunc("s", [ConstFunc("", 17.0), ConstFunc("", 4.0)])
+        self.assertEqual(len(s1.terms), 1)
+        self.assertEqual(str(s1), "s(x)=(21.0)")
+        self.assertEqual(s1(0.0), 21.0)
+
+        s2 = SumFunc("s", [PowerFunc("", 3.0, 2.0), PowerFunc("", 4.0, 3.0), PowerFunc("", 1.0, 2.0), PowerFunc("", -1.0, 3.0)])
+        self.assertEqual(len(s2.terms), 2)
+        self.assertIn("4.0x^2.0", str(s2))
+        self.assertIn("3.0x^3.0", str(s2))
+        self.assertEqual(s2(3.0), 117.0)
+
+        s3 = SumFunc("s", [PowerFunc("", 1.0, 3.0), PowerFunc("", -1.0, 3.0), PowerFunc("", 2.0, 1.0)])
+        self.assertEqual(len(s3.terms), 1)
+        self.assertEqual(str(s3), "s(x)=(2.0x)")
+        self.assertEqual(s3(3.0), 6.0)
+
+        s4 = SumFunc("s", [SumFunc("", [PowerFunc("", 1.0, 3.0), PowerFunc("", 2.0, 1.0)]), PowerFunc("", -1.0, 3.0), PowerFunc("", 1.0, 2.0)])
+        self.assertEqual(len(s4.terms), 2)
+        self.assertIn("2.0x", str(s4))
+        self.assertIn("x^2.0", str(s4))
+        self.assertEqual(s4(3.0), 15.0)
+
+
+class TestProdFunc(unittest.TestCase):
+    """
+    Unittests für die zusammengestzte Produkt-Funktion.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.f = ProdFunc("f", PowerFunc("", 1.0, 2.0), SinFunc())
+        self.g = ProdFunc("g", ExpFunc("", 2.0, 2.0), CosFunc("", 3.0))
+        self.h = ProdFunc("h", SinFunc("", -1.0, 0.5), PowerFunc("", -3.0, 1.5))
+
+    def test_01_call(self):
+        """
+        Testet korrekte Berechnung.
+        """
+        self.assertAlmostEqual(self.f(2.0), 3.637189707302727)
+        self.assertAlmostEqual(self.f(3.0), 1.2700800725388048)
+        self.assertAlmostEqual(self.g(2.0), -136.32508450571538)
+        self.assertAlmostEqual(self.g(1.0), 23.953944290647627)
+        self.assertAlmostEqual(self.g(-1.0), 0.43873179358835784)
+        self.assertAlmostEqual(self.g(2.5), -713.4015292690831)
+
+
+    def test_02_str(self):
+        """
+        Testet korrekte Ausgabe als String.
+        """
+        self.assertEqual(str(self.f),"f(x)=x^2.0*sin(x)")
+        self.assertEqual(str(self.g),"g(x)=6.0e^(2.0x)*cos(x)")
+        self.assertEqual(str(self.h),"h(x)=3.0sin(0.5x)*x^1.5")
+
+    def test_03_derive(self):
+        """
+        Testet einmalige Ableitung.
+        """
+        fd= self.f.derive()
+        gd= self.g.derive()
+        hd= self.h.derive()
+
+        self.assertTrue(type(fd) is SumFunc)
+        self.assertEqual(len(fd.terms), 2)
+        self.assertIn("f'(x)=(", str(fd))
+        self.assertIn("2.0x*sin(x)", str(fd))
+        self.assertIn("x^2.0*cos(x)", str(fd))
+
+        self.assertIn("12.0e^(2.0x)*cos(x)", str(gd))
+        self.assertIn("-6.0e^(2.0x)*sin(x)", str(gd))
+        self.assertAlmostEqual(gd(0.0), 12.0)
+
+        self.assertIn("1.5cos(0.5x)*x^1.5", str(hd))
+        self.assertIn("4.5sin(0.5x)*x^0.5", str(hd))
+        self.assertAlmostEqual(hd(math.pi), 7.976042329074822)
+
+
+    #Bonus-Aufgabe
+    def test_11_simplify(self):
+        """
+        Testet Die Vereinfachung/Zusammenfassung des Produkts.
+        Benötigt Bonusaufgabe NestedFunc!
+        """
+        p1 = ProdFunc.simplify(ProdFunc("p", ConstFunc("", 17.0), ConstFunc("", 4.0)))
+        self.assertTrue(type(p1) is ConstFunc)
+        self.assertAlmostEqual(p1.factor, 68.0)
+
+        p2 = ProdFunc.simplify(ProdFunc("p", PowerFunc("", 1.0, 2.0), PowerFunc("", 1.0, 3.0)))
+        self.assertTrue(type(p2) is PowerFunc)
+        self.assertAlmostEqual(p2.exponent, 5.0)
+
+        p3 = ProdFunc.simplify(ProdFunc("p", ProdFunc("s", SinFunc("", 2.0, 1.0), ConstFunc("", 4.0)), PowerFunc("", -2.0, 3.0)))
+        self.assertTrue(type(p3) is ProdFunc)
+        self.assertAlmostEqual(p3.factor, -16.0)
+        self.assertTrue(type(p3.left) in (SinFunc, PowerFunc))
+        self.assertTrue(type(p3.right) in (SinFunc, PowerFunc))
+        self.assertAlmostEqual(p3(1.0), -13.463535756926344)
+
+        p4 = ProdFunc.simplify(ProdFunc("p", SinFunc("", 1.0, 2.0), SinFunc("", 1.0, 2.0)))
+        self.assertTrue(type(p4) is NestedFunc)
+        self.assertEqual(str(p4), "p(x)=sin(2.0x)^2")
+
+
+    def test_12_derive_and_simplify(self):
+        """
+        Testet mehrfache Ableitung und simplify.
+        """
+        fdd= self.f.derive().derive()
+        gddd= self.g.derive().derive().derive()
+        hdd= self.h.derive().derive()
+
+        self.assertEqual(len(fdd.terms), 3)
+        self.assertIn("f''(x)=(", str(fdd))
+        self.assertIn("2.0sin(x)", str(fdd))
+        self.assertIn("4.0x*cos(x)", str(fdd))
+        self.assertIn("x^2.0*sin(x)", str(fdd))
+
+        self.assertEqual(len(gddd.terms), 2)
+        self.assertIn("12.0e^(2.0x)*cos(x)", str(gddd))
+        self.assertIn("-66.0e^(2.0x)*sin(x)", str(gddd))
+
+        self.assertEqual(len(hdd.terms), 3)
+        self.assertIn("-0.75sin(0.5x)*x^1.5", str(hdd))
+        self.assertIn("4.5cos(0.5x)*x^0.5", str(hdd))
+        self.assertIn("2.25sin(0.5x)*x^-0.5", str(hdd))
+
+
+class TestNestedFunc(unittest.TestCase):
+    """
+    Unittests für die verkettete Funktion.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.f = NestedFunc("f", PowerFunc("", 1.0, 2.0), SinFunc())
+        self.g = NestedFunc("g", CosFunc("", 3.0), ProdFunc("",  PowerFunc("", 1.0, 1.0), ExpFunc("", 1.0, 1.0)) )
+        self.h = NestedFunc("h", ExpFunc("", 2.0, 1.0), SumFunc("", [SinFunc(), CosFunc()]) )
+
+    def test_01_call(self):
+        """
+        Testet korrekte Berechnung.
+        """
+        self.assertAlmostEqual(self.f(0.0), 0.0)
+        self.assertAlmostEqual(self.f(1.0), 0.7080734182735712)
+        self.assertAlmostEqual(self.g(2.0), -1.7938600825330877)
+        self.assertAlmostEqual(self.g(-1.0), 2.7992762267946256)
+        self.assertAlmostEqual(self.h(-1.0), 1.479905895481268)
+        self.assertAlmostEqual(self.h(0.0), 5.43656365691809)
+
+
+    def test_02_str(self):
+        """
+        Testet korrekte Ausgabe als String.
+        """
+        self.assertEqual(str(self.f),"f(x)=sin(x)^2.0")
+        self.assertEqual(str(self.g),"g(x)=3.0cos(x*e^x)")
+        self.assertEqual(str(self.h),"h(x)=2.0e^((sin(x)+cos(x)))")
+
+    def test_03_derive(self):
+        """
+        Testet einmalige Ableitung.
+        """
+        fd= self.f.derive()
+        gd= self.g.derive()
+        hd= self.h.derive()
+
+        self.assertTrue(type(fd) is ProdFunc)
+        self.assertEqual(str(fd), "f'(x)=2.0sin(x)*cos(x)")
+        self.assertAlmostEqual(fd(1.0), 0.9092974268256818)
+
+        self.assertEqual(str(gd), "g'(x)=-3.0sin(x*e^x)*(e^x+x*e^x)")
+        self.assertAlmostEqual(gd(1.0), -6.699715904670079)
+
+        self.assertEqual(str(hd), "h'(x)=2.0e^((sin(x)+cos(x)))*(cos(x)-sin(x))")
+        self.assertAlmostEqual(hd(1.0), -2.398481179592898)
+
+    #Ultimative Bonus-Aufgabe - kombiniert alle bisherigen Bonus-Aufgaben (SumFunc und ProdFunc)
+    def test_11_derive_and_simplify(self):
+        """
+        Testet mehrfache Ableitung und simplify.
+        """
+        fdd= self.f.derive().derive()
+        gdd= self.g.derive().derive()
+        hdd= self.h.derive().derive()
+
+        self.assertEqual(len(fdd.terms), 2)
+        self.assertEqual(str(fdd), "f''(x)=(2.0cos(x)^2-2.0sin(x)^2)")
+        self.assertAlmostEqual(fdd(2.0), -1.3072872417272239)
+
+        self.assertEqual(len(gdd.terms), 2)
+        self.assertIn("-3.0cos(x*e^x)*(e^x+x*e^x)^2", str(gdd))
+        self.assertIn("-3.0sin(x*e^x)*(2.0e^x+x*e^x)", str(gdd))
+        self.assertAlmostEqual(gdd(1.0), 70.79266266689739)
+
+        self.assertEqual(len(hdd.terms), 2)
+        self.assertIn("2.0e^((sin(x)+cos(x)))*(cos(x)-sin(x))^2", str(hdd))
+        self.assertIn("2.0e^((sin(x)+cos(x)))*(-sin(x)-cos(x))", str(hdd))
+        self.assertAlmostEqual(hdd(0.0), 0.0)
+
+
+class QuadratF(Plottable):
+    """
+    Hilfsklasse (KEIN TEST): Plottable ohne Array-Pfad.
+    """
+    def __str__(self):
+        return "f(x)=x²"
+
+    def __call__(self, x: float):
+        return x ** 2
+
+
+class TestArrayEval(unittest.TestCase):
+    """
+    Unittests für die Berechnung auf Arrays.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.funcs = [
+            ConstFunc("c", 3.5),
+            ExpFunc("e", 2.0, -0.5),
+            SinFunc("s", 3.0, 2.0),
+            CosFunc("c", -1.0, 0.5),
+            PowerFunc("p", 0.5, 3.0),
+            SumFunc("f", [PowerFunc("", 2.5, 2.0), PowerFunc("", -4.0, 1.0), ConstFunc("", 3.0)]),
+            ProdFunc("g", ExpFunc("", 2.0, 2.0), CosFunc("", 3.0)),
+            NestedFunc("h", ExpFunc("", 2.0, 1.0), SumFunc("", [SinFunc(), CosFunc()])),
+            NestedFunc("k", CosFunc("", 3.0), ProdFunc("", PowerFunc("", 1.0, 1.0), ExpFunc("", 1.0, 1.0))),
+        ]
+        self.x = np.linspace(-3.0, 3.0, 101)
+
+    def test_01_evaluate(self):
+        """
+        Testet Übereinstimmung mit der Berechnung an einzelnen Stellen.
+        """
+        for f in self.funcs + [f.derive() for f in self.funcs]:
+            expected = [f(x) for x in self.x.tolist()]
+            np.testing.assert_allclose(f.evaluate(self.x), expected, rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(f(self.x), expected, rtol=1e-12, atol=1e-12)
+        self.assertIsInstance(self.funcs[1].evaluate(1.0), float)
+        self.assertAlmostEqual(self.funcs[6].evaluate(2.0), -136.32508450571538)
+
+    def test_02_nan(self):
+        """
+        Testet die Markierung ungültiger Stellen als NaN.
+        """
+        x = np.array([-4.0, -1.0, 0.0, 1.0, 4.0, 1000.0])
+        inverse = PowerFunc("f", 1.0, -1.0)
+        root = PowerFunc("g", 2.0, 0.5)
+        exp = ExpFunc("h", 1.0, 1.0)
+        for f in (inverse, root, exp):
+            expected = [f(xi) for xi in x.tolist()]
+            np.testing.assert_array_equal(f.evaluate(x), expected)
+        self.assertTrue(math.isnan(inverse.evaluate(x)[2]))
+        self.assertEqual(list(np.isnan(root.evaluate(x))), [True, True, False, False, False, False])
+        self.assertTrue(math.isnan(exp.evaluate(x)[-1]))
+
+    def test_03_sample(self):
+        """
+        Testet das Abtasten als Array, auch ohne Array-Pfad.
+        """
+        y = SinFunc("f").sample(0.0, math.pi, 5)
+        self.assertIsInstance(y, np.ndarray)
+        np.testing.assert_allclose(y, [0.0, math.sqrt(0.5), 1.0, math.sqrt(0.5), 0.0], atol=1e-15)
+        np.testing.assert_allclose(QuadratF().sample(-1.0, 1.0, 3), [1.0, 0.0, 1.0])
+        self.assertEqual(len(ExpFunc("f").sample(-1.0, 1.0, 10**6)), 10**6)
+
+
+class TestSimplify(unittest.TestCase):
+    """
+    Unittests für die Vereinfachung beliebiger Funktionsbäume.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.p = ProdFunc("p", ProdFunc("", SinFunc(), ConstFunc("", 2.0)),
+                          ProdFunc("", SinFunc(), ProdFunc("", PowerFunc("", 1.0, 2.0), PowerFunc())))
+        self.n = NestedFunc("n", PowerFunc("", 3.0, 1.0),
+                            SumFunc("", [ExpFunc(), NestedFunc("", ExpFunc(), ConstFunc("", 0.0))]))
+        self.x = np.linspace(0.1, 2.0, 20)
+
+    def test_01_rules(self):
+        """
+        Testet Flachmachen, Potenzen, Konstanten und Faktoren 0 und 1.
+        """
+        p = self.p.simplify()
+        self.assertEqual(str(p), "p(x)=2.0sin(x)^2*x^3.0")
+        self.assertLess(p.size(), self.p.size())
+        np.testing.assert_allclose(p(self.x), self.p(self.x))
+
+        n = self.n.simplify()
+        self.assertTrue(type(n) is SumFunc)
+        self.assertEqual(str(n), "n(x)=3.0(e^x+1.0)")
+        np.testing.assert_allclose(n(self.x), self.n(self.x))
+
+        q = ProdFunc("q", PowerFunc("", 2.0, 2.0), PowerFunc("", 1.0, -2.0)).simplify()
+        self.assertTrue(type(q) is ConstFunc)
+        self.assertEqual(q.factor, 2.0)
+        z = SumFunc("z", [SinFunc(), ProdFunc("", SinFunc(), ConstFunc("", 0.0))]).simplify()
+        self.assertEqual(str(z), "z(x)=sin(x)")
+        c = PowerFunc("c", 1.0, 0.0).simplify()
+        self.assertTrue(type(c) is ConstFunc)
+        self.assertEqual(str(c), "c(x)=1.0")
+
+    def test_02_fixpoint(self):
+        """
+        Testet Fixpunkt und Budget.
+        """
+        for f in (self.p, self.n):
+            once = f.simplify()
+            self.assertEqual(str(once.simplify()), str(once))
+            self.assertIs(f.simplify(budget=0), f)
+        g = NestedFunc("g", CosFunc("", 3.0), ProdFunc("", PowerFunc("", 1.0, 1.0), ExpFunc("", 1.0, 1.0)))
+        d = g
+        for order in range(4):
+            d = d.derive()
+            self.assertEqual(str(d.simplify()), str(d))
+
+
+class TestImmutable(unittest.TestCase):
+    """
+    Unittests für unveränderliche, geteilte Teilfunktionen.
+    """
+    def test_01_immutable(self):
+        """
+        Testet, dass Attribute nicht geändert werden können.
+        """
+        f = SinFunc("f", 2.0, 3.0)
+        with self.assertRaises(FunctionError):
+            f.factor = 1.0
+        with self.assertRaises(FunctionError):
+            f.sin_factor = 1.0
+        with self.assertRaises(FunctionError):
+            del f.name
+        s = SumFunc("s", [f, PowerFunc()])
+        with self.assertRaises(AttributeError):
+            s.terms.append(ConstFunc())
+        self.assertIs(f.clone(), f)
+
+    def test_02_sharing(self):
+        """
+        Testet, dass Teilfunktionen geteilt und nicht kopiert werden.
+        """
+        sin = SinFunc()
+        inner = SumFunc("", [sin, CosFunc()])
+        p = ProdFunc("p", sin, PowerFunc("", 3.0, 2.0))
+        self.assertIs(p.left, sin)
+        self.assertEqual(p.right.factor, 1.0)
+        self.assertEqual(p.factor, 3.0)
+        n = NestedFunc("n", ExpFunc("", 2.0), inner)
+        self.assertIs(n.inner, inner)
+        self.assertIs(inner.terms[0], sin)
+        self.assertEqual(str(n), "n(x)=2.0e^((sin(x)+cos(x)))")
+        self.assertEqual(str(inner), "(x)=(sin(x)+cos(x))")
+
+        # Geteilte Teilfunktionen zählen nur einmal
+        d = sin
+        for i in range(21):
+            d = ProdFunc("", d, d)
+        self.assertEqual(d.size(), 22)
+        self.assertEqual(str(d.simplify()), "(x)=sin(x)^2097152")
+
+    def test_03_deep(self):
+        """
+        Testet den Aufbau tiefer Funktionsbäume.
+        """
+        f = SinFunc()
+        g = PowerFunc()
+        for i in range(1000):
+            f = ProdFunc("", f, CosFunc("", 1.0, 1.0 + i % 3))
+            g = NestedFunc("", SinFunc(), g)
+        self.assertEqual(f.size(), 2001)
+        self.assertEqual(g.size(), 2001)
+        self.assertIsInstance(f.left.left.left, ProdFunc)
+
+        # Ausgabe und Berechnung ohne Rekursion, Vergleich mit einer Schleife
+        self.assertEqual(str(f).count("cos("), 1000)
+        self.assertEqual(str(g).count("sin("), 1000)
+        x = np.linspace(0, 1, 5)
+        expected_f = np.sin(x)
+        expected_g = x.copy()
+        for i in range(1000):
+            expected_f *= np.cos((1.0 + i % 3) * x)
+            expected_g = np.sin(expected_g)
+        np.testing.assert_allclose(f.evaluate(x), expected_f, rtol=1e-9, atol=1e-300)
+        np.testing.assert_allclose(g.evaluate(x), expected_g, rtol=1e-9)
+        for xi, fi, gi in zip(x, expected_f, expected_g):
+            self.assertAlmostEqual(f(xi), fi)
+            self.assertAlmostEqual(g(xi), gi)
+        self.assertAlmostEqual(f(0.05), math.sin(0.05) * math.prod(
+            math.cos((1.0 + i % 3) * 0.05) for i in range(1000)))
+        self.assertEqual(str(f.simplify()).count("cos("), 3)
+
+
+class TestDerivatives(unittest.TestCase):
+    """
+    Unittests für das automatische Differenzieren.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.funcs = [
+            ConstFunc("c", 3.5),
+            ExpFunc("e", 2.0, -0.5),
+            SinFunc("s", 3.0, 2.0),
+            CosFunc("c", -1.0, 0.5),
+            PowerFunc("p", 0.5, 3.0),
+            PowerFunc("q", 2.0, -1.0),
+            PowerFunc("r", 1.0, 0.5),
+            SumFunc("f", [PowerFunc("", 2.5, 2.0), PowerFunc("", -4.0, 1.0), ConstFunc("", 3.0)]),
+            ProdFunc("g", ExpFunc("", 2.0, 2.0), CosFunc("", 3.0)),
+            NestedFunc("h", ExpFunc("", 2.0, 1.0), SumFunc("", [SinFunc(), CosFunc()])),
+            NestedFunc("k", CosFunc("", 3.0), ProdFunc("", PowerFunc("", 1.0, 1.0), ExpFunc("", 1.0, 1.0))),
+        ]
+        self.x = np.linspace(-2.0, 2.0, 41)
+
+    def test_01_derive(self):
+        """
+        Testet Übereinstimmung mit den symbolischen Ableitungen.
+        """
+        for f in self.funcs:
+            values = f.derivatives(self.x, 5)
+            self.assertEqual(values.shape, (6, 41))
+            d = f
+            for k in range(6):
+                np.testing.assert_allclose(values[k], d.evaluate(self.x), rtol=1e-10, atol=1e-10,
+                                           equal_nan=True, err_msg=f"{f}, order {k}")
+                d = d.derive()
+
+    def test_02_args(self):
+        """
+        Testet Skalare, mehrdimensionale Arrays und die Ordnung.
+        """
+        np.testing.assert_allclose(SinFunc("f").derivatives(0.0, 4), [0.0, 1.0, 0.0, -1.0, 0.0])
+        np.testing.assert_array_equal(ExpFunc("f").derivatives(np.zeros((2, 3)), 2), np.ones((3, 2, 3)))
+        np.testing.assert_allclose(ExpFunc("f").derivatives([1.0, 2.0], 0), [[math.e, math.e**2]])
+        with self.assertRaises(FunctionError):
+            ExpFunc("f").derivatives(1.0, -1)
+
+    def test_03_high_order(self):
+        """
+        Testet hohe Ordnungen an einer tiefen Verkettung.
+        """
+        f = ExpFunc("f")
+        for i in range(10):
+            f = NestedFunc("f", SinFunc(), f)
+        values = f.derivatives(self.x, 8)
+        d = f.to_node().derive(8)
+        np.testing.assert_allclose(values[8], d.evaluate(self.x), rtol=1e-9, atol=1e-9)
+        # exp(2x): k-te Ableitung 2^k*exp(2x)
+        values = ExpFunc("g", 1.0, 2.0).derivatives(0.5, 20)
+        np.testing.assert_allclose(values, 2.0**np.arange(21)*math.e, rtol=1e-12)
+
+
+class StepF(Plottable):
+    """
+    Hilfsklasse (KEIN TEST): Sprungfunktion ohne Array-Pfad.
+    """
+    def __str__(self):
+        return "f(x)=[x>=0.3]"
+
+    def __call__(self, x: float):
+        return 0.0 if x < 0.3 else 1.0
+
+
+class TestAdaptive(unittest.TestCase):
+    """
+    Unittests für die adaptive Abtastung.
+    """
+    def test_01_smooth(self):
+        """
+        Testet Genauigkeit und Punktzahl bei einer glatten Funktion.
+        """
+        x, y = SinFunc("f").sample_adaptive(-10.0, 10.0)
+        self.assertIsInstance(x, np.ndarray)
+        self.assertIsInstance(y, np.ndarray)
+        self.assertTrue(np.all(np.diff(x) > 0))
+        self.assertEqual((x[0], x[-1]), (-10.0, 10.0))
+        fine = np.linspace(-10.0, 10.0, 10001)
+        self.assertLess(np.abs(np.interp(fine, x, y)-np.sin(fine)).max(), 2e-3)
+        self.assertLess(len(x), 500)
+        # Wo die Funktion gerade ist, wird nicht verfeinert
+        x, y = PowerFunc("g", 2.0, 1.0).sample_adaptive(0.0, 1.0, 11)
+        self.assertEqual(len(x), 11)
+
+    def test_02_refine(self):
+        """
+        Testet die Verfeinerung bei starker Krümmung und das Punktbudget.
+        """
+        x, y = ExpFunc("f").sample_adaptive(-5.0, 10.0)
+        widths = np.diff(x)
+        self.assertLess(widths[-1], widths[0]/4)
+        x, y = SinFunc("g", 1.0, 20.0).sample_adaptive(0.0, 10.0, max_samples=500)
+        self.assertEqual(len(x), 500)
+        with self.assertRaises(FunctionError):
+            SinFunc("g").sample_adaptive(1.0, 1.0)
+
+    def test_03_discontinuity(self):
+        """
+        Testet das Auftrennen an Sprung- und Polstellen und das Finden
+        des Randes des Definitionsbereichs.
+        """
+        x, y = StepF().sample_adaptive(-1.0, 1.0)
+        gaps = x[np.isnan(y)]
+        self.assertEqual(len(gaps), 1)
+        self.assertAlmostEqual(gaps[0], 0.3, places=5)
+        x, y = PowerFunc("g", 1.0, -1.0).sample_adaptive(-1.0, 1.0)
+        gap = np.flatnonzero(np.isnan(y))
+        self.assertEqual(len(gap), 1)
+        self.assertLess(y[gap[0]-1], 0.0)
+        self.assertGreater(y[gap[0]+1], 0.0)
+        self.assertFalse(np.isnan(PowerFunc("g", 1.0, -1.0).sample_adaptive(0.5, 3.0)[1]).any())
+        x, y = PowerFunc("h", 1.0, 0.5).sample_adaptive(-1.0, 1.0)
+        self.assertLess(abs(x[np.isfinite(y)][0]), 1e-5)
+
+    def test_04_multi(self):
+        """
+        Testet das gemeinsame Gitter für mehrere Funktionen.
+        """
+        funcs = [StepF(), SinFunc("f"), ExpFunc("g")]
+        x, ys = Plottable.multi_sample(funcs, -1.0, 1.0)
+        self.assertEqual(ys.shape, (3, len(x)))
+        for f, y in zip(funcs, ys):
+            valid = ~np.isnan(y)
+            np.testing.assert_allclose(y[valid], f.evaluate(x[valid]))
+        # Die Lücke gibt es nur bei der Sprungfunktion
+        self.assertEqual(np.isnan(ys).sum(axis=1).tolist(), [1, 0, 0])
+        # Das Gitter ist mindestens so fein wie für jede Funktion allein
+        for f in funcs:
+            self.assertGreaterEqual(len(x), len(f.sample_adaptive(-1.0, 1.0)[0]))
+        # Ohne Funktionen bleibt es beim Startgitter
+        x, ys = Plottable.multi_sample([], -1.0, 1.0, 10)
+        np.testing.assert_allclose(x, np.linspace(-1.0, 1.0, 10))
+        self.assertEqual(ys.shape, (0, 10))
+
+
+if __name__ == '__main__':
+    #Durchführung der Tests
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    #Hier können einzelne Tests auskommentiert werden
+    suite.addTest(TestConstFunc("test_01_call"))
+    suite.addTest(TestConstFunc("test_02_str"))
+    suite.addTest(TestConstFunc("test_03_derive"))
+    suite.addTest(TestExpFunc("test_01_call"))
+    suite.addTest(TestExpFunc("test_02_str"))
+    suite.addTest(TestExpFunc("test_03_derive"))
+    suite.addTest(TestSinCos("test_01_call_sin"))
+    suite.addTest(TestSinCos("test_02_call_cos"))
+    suite.addTest(TestSinCos("test_03_str_sin"))
+    suite.addTest(TestSinCos("test_04_str_cos"))
+    suite.addTest(TestSinCos("test_05_derive_once"))
+    suite.addTest(TestSinCos("test_06_derive_multiple"))
+    suite.addTest(TestPowerFunc("test_01_call"))
+    suite.addTest(TestPowerFunc("test_02_str"))
+    suite.addTest(TestPowerFunc("test_03_derive_to_power"))
+    suite.addTest(TestPowerFunc("test_04_derive_to_const"))
+    suite.addTest(TestSumFunc("test_01_call"))
+    suite.addTest(TestSumFunc("test_02_str"))
+    suite.addTest(TestSumFunc("test_03_derive_once"))
+    suite.addTest(TestSumFunc("test_04_derive_multiple"))
+    #Bonus-Aufgabe
+    suite.addTest(TestSumFunc("test_11_simplify"))
+    suite.addTest(TestProdFunc("test_01_call"))
+    suite.addTest(TestProdFunc("test_02_str"))
+    suite.addTest(TestProdFunc("test_03_derive"))
+    #Bonus-Aufgabe
+    suite.addTest(TestProdFunc("test_11_simplify"))
+    suite.addTest(TestProdFunc("test_12_derive_and_simplify"))
+    suite.addTest(TestNestedFunc("test_01_call"))
+    suite.addTest(TestNestedFunc("test_02_str"))
+    suite.addTest(TestNestedFunc("test_03_derive"))
+    #Bonus-Aufgabe
+    suite.addTest(TestNestedFunc("test_11_derive_and_simplify"))
+    suite.addTest(TestArrayEval("test_01_evaluate"))
+    suite.addTest(TestArrayEval("test_02_nan"))
+    suite.addTest(TestArrayEval("test_03_sample"))
+    suite.addTest(TestSimplify("test_01_rules"))
+    suite.addTest(TestSimplify("test_02_fixpoint"))
+    suite.addTest(TestImmutable("test_01_immutable"))
+    suite.addTest(TestImmutable("test_02_sharing"))
+    suite.addTest(TestImmutable("test_03_deep"))
+    suite.addTest(TestDerivatives("test_01_derive"))
+    suite.addTest(TestDerivatives("test_02_args"))
+    suite.addTest(TestDerivatives("test_03_high_order"))
+    suite.addTest(TestAdaptive("test_01_smooth"))
+    suite.addTest(TestAdaptive("test_02_refine"))
+    suite.addTest(TestAdaptive("test_03_discontinuity"))
+    suite.addTest(TestAdaptive("test_04_multi"))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
@@ -0,0 +1,125 @@
+import math
+import unittest
+import numpy as np
+from funktionen import (ConstFunc, ExpFunc, SinFunc, CosFunc, PowerFunc,
+                        SumFunc, ProdFunc, NestedFunc, FunctionError)
+from numerik import CountedFunction, newton, brent, integrate
+
+
+class TestNumerik(unittest.TestCase):
+    """
+    Unittests für Nullstellensuche und Integration.
+    """
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        # x³-2x-5, Nullstelle nach Newton
+        self.cubic = SumFunc("f", [PowerFunc("", 1.0, 3.0), PowerFunc("", -2.0, 1.0), ConstFunc("", -5.0)])
+        self.root = 2.0945514815423265
+        self.g = ProdFunc("g", ExpFunc("", 1.0, -1.0), SinFunc("", 1.0, 3.0))
+
+    def test_01_counter(self):
+        """
+        Testet die Zähler für Aufrufe und Stellen.
+        """
+        counted = CountedFunction(self.cubic)
+        y = counted(np.zeros((2, 3)))
+        np.testing.assert_array_equal(y, np.full((2, 3), -5.0))
+        counted([1.0, 2.0])
+        self.assertEqual((counted.calls, counted.points), (2, 8))
+        self.assertTrue(math.isnan(CountedFunction(PowerFunc("p", 1.0, -1.0))([0.0])[0]))
+
+    def test_02_newton(self):
+        """
+        Testet das Newton-Verfahren für viele Startwerte.
+        """
+        result = newton(self.cubic, np.linspace(-3.0, 3.0, 13))
+        self.assertTrue(result.converged.all())
+        np.testing.assert_allclose(result.x, self.root, rtol=1e-14)
+        self.assertEqual(result.calls, 2*result.iterations.max())
+        self.assertEqual(result.points, 2*result.iterations.sum())
+        # Nullstellen von cos, an der Stelle 0 ist die Ableitung 0
+        result = newton(CosFunc("c"), np.array([[0.5, 2.0], [4.0, 0.0]]))
+        self.assertEqual(result.x.shape, (2, 2))
+        np.testing.assert_allclose(result.x[0], [math.pi/2, math.pi/2])
+        self.assertAlmostEqual(result.x[1, 0], 3*math.pi/2)
+        self.assertEqual(result.converged.tolist(), [[True, True], [True, False]])
+        self.assertTrue(math.isnan(result.x[1, 1]))
+        # Nullstelle der Funktion selbst: sofort fertig
+        self.assertEqual(newton(self.cubic, self.root).iterations, 1)
+
+    def test_03_brent(self):
+        """
+        Testet das Verfahren von Brent für viele Intervalle.
+        """
+        result = brent(self.cubic, 2.0, 3.0)
+        self.assertTrue(result.converged)
+        self.assertAlmostEqual(float(result.x), self.root, places=12)
+        self.assertLess(result.iterations, 10)
+        # Nullstellen k*pi/3 von g, nur Intervalle mit Vorzeichenwechsel
+        a = np.arange(0.25, 10.0, 0.5)
+        result = brent(self.g, a, a+0.5)
+        roots = result.x[result.converged]
+        np.testing.assert_allclose(roots, np.arange(1, 10)*math.pi/3, rtol=1e-12)
+        self.assertTrue(np.isnan(result.x[~result.converged]).all())
+        self.assertEqual(result.calls, result.iterations.max()+1)
+        # Mehrfache Nullstelle (nur lineare Konvergenz)
+        result = brent(PowerFunc("p", 1.0, 3.0), -1.0, 2.0, tol=1e-8)
+        self.assertTrue(result.converged)
+        self.assertLess(abs(float(result.x)), 1e-8)
+        result = brent(PowerFunc("p", 1.0, 3.0), -1e6, 2e6)
+        self.assertTrue(result.converged)
+        self.assertLess(abs(float(result.x)), 1e-12)
+        # Vorzeichenwechsel an einer Polstelle ist keine Nullstelle
+        result = brent(PowerFunc("p", 1.0, -1.0), -1.0, 1.0)
+        self.assertFalse(result.converged)
+        self.assertTrue(np.isnan(result.x))
+        result = brent(PowerFunc("p", 1.0, -1.0), np.array([-1.0, 0.5]), np.array([1.0, 2.0]))
+        self.assertFalse(result.converged.any())
+
+    def test_04_integrate(self):
+        """
+        Testet die adaptive Integration mit beiden Regeln.
+        """
+        for rule in ("kronrod", "simpson"):
+            result = integrate(SinFunc("s"), 0.0, math.pi, rule=rule)
+            self.assertTrue(result.converged)
+            self.assertAlmostEqual(result.value, 2.0, places=12)
+            self.assertAlmostEqual(integrate(ExpFunc("e"), 1.0, 0.0, rule=rule).value, 1.0-math.e,
+                                   places=12)
+            # Singularität der Ableitung am Rand
+            result = integrate(PowerFunc("p", 1.0, 0.5), 0.0, 1.0, rule=rule)
+            self.assertAlmostEqual(result.value, 2/3, places=10)
+            self.assertGreater(result.intervals, 10)
+            # Schnelle Schwingung
+            result = integrate(SinFunc("s", 1.0, 50.0), 0.0, 3.0, rule=rule)
+            self.assertAlmostEqual(result.value, (1.0-math.cos(150.0))/50, places=12)
+        # Gauss-Kronrod ist für glatte Funktionen mit einem Intervall exakt
+        result = integrate(self.g, 0.0, 1.0)
+        self.assertEqual((result.intervals, result.calls, result.points), (1, 1, 15))
+        self.assertAlmostEqual(result.value, (3.0-math.exp(-1.0)*(math.sin(3.0)+3*math.cos(3.0)))/10,
+                               places=14)
+        self.assertEqual(integrate(self.g, 1.0, 1.0).value, 0.0)
+        self.assertFalse(integrate(PowerFunc("q", 1.0, -1.0), -1.0, 1.0).converged)
+        self.assertFalse(integrate(NestedFunc("h", SinFunc(), PowerFunc("", 1.0, -1.0)), 1e-3, 1.0,
+                                   max_intervals=50).converged)
+        with self.assertRaises(FunctionError):
+            integrate(self.g, 0.0, 1.0, rule="trapez")
+        with self.assertRaises(FunctionError):
+            integrate(self.g, 0.0, math.inf)
+
+
+if __name__ == '__main__':
+    #Durchführung der Tests
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    #Hier können einzelne Tests auskommentiert werden
+    suite.addTest(TestNumerik("test_01_counter"))
+    suite.addTest(TestNumerik("test_02_newton"))
+    suite.addTest(TestNumerik("test_03_brent"))
+    suite.addTest(TestNumerik("test_04_integrate"))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+
+"""Simulation des Ziegenproblems (Monty-Hall-Problem) aus Kapitel 2.
+
+Verallgemeinerung: Es gibt n Türen, hinter k davon steht ein Auto,
+hinter den anderen eine Ziege. Der Kandidat wählt eine Tür, danach
+öffnet der Moderator m der übrigen Türen, hinter denen jeweils eine
+Ziege steht. Anschließend bleibt der Kandidat bei seiner Tür ("stay"),
+wechselt zufällig auf eine der anderen geschlossenen Türen ("switch")
+oder entscheidet per Münzwurf ("random").
+
+Gespielt wird nicht interaktiv, sondern in Blöcken (batches) von
+vielen Spielen gleichzeitig mit NumPy. Die Blöcke können auf mehrere
+Prozesse verteilt werden. Jeder Block bekommt einen eigenen, aus dem
+Startwert abgeleiteten Zufallsgenerator, das Ergebnis hängt also
+nicht von der Anzahl der Prozesse ab.
+"""
+
+import math
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+
+class MontyHallError(Exception):
+    """
+    Für eigene Fehler bei der Simulation.
+    """
+    pass
+
+
+STRATEGIES = ("stay", "switch", "random")
+
+# Spiele pro Block (Speicher: etwa 3 * BATCH_SIZE * doors Werte)
+BATCH_SIZE = 200000
+
+
+def check_setup(doors, cars, opened):
+    """
+    Prüfe, ob das Spiel mit diesen Parametern spielbar ist: Der
+    Moderator muss auch dann genug Ziegen zeigen können, wenn der
+    Kandidat eine Ziege gewählt hat, und zum Wechseln muss eine Tür
+    übrig bleiben.
+    """
+    if doors < 3:
+        raise MontyHallError("Need at least three doors")
+    if cars < 1:
+        raise MontyHallError("Need at least one car")
+    if opened < 0:
+        raise MontyHallError("Number of opened doors must not be negative")
+    if doors - cars - 1 < opened:
+        raise MontyHallError("Not enough goats for the host to open that many doors")
+    if doors - 1 - opened < 1:
+        raise MontyHallError("No door left to switch to")
+
+
+def win_probability(strategy, doors=3, cars=1, opened=1):
+    """
+    Exakte Gewinnwahrscheinlichkeit einer Strategie.
+
+    Bleiben gewinnt mit k/n. Beim Wechseln ist die eigene Tür mit
+    Wahrscheinlichkeit k/n ein Auto, dann sind unter den n-m-1 anderen
+    geschlossenen Türen noch k-1 Autos, sonst k. Zusammen ergibt das
+    k(n-1) / (n(n-m-1)).
+    """
+    check_setup(doors, cars, opened)
+    stay = cars/doors
+    switch = cars*(doors-1)/(doors*(doors-opened-1))
+    if strategy == "stay":
+        return stay
+    if strategy == "switch":
+        return switch
+    if strategy == "random":
+        return (stay+switch)/2
+    raise MontyHallError(f"Unknown strategy '{strategy}'")
+
+
+def _random_choice(keys, eligible, count):
+    """
+    Wähle in jeder Zeile count zufällige Spalten unter den zulässigen
+    (eligible) aus. keys sind gleichverteilte Zufallszahlen; unzulässige
+    Spalten bekommen den Schlüssel unendlich und landen hinten.
+    """
+    keys = np.where(eligible, keys, np.inf)
+    if count == 1:
+        return np.argmin(keys, axis=1)[:, np.newaxis]
+    return np.argpartition(keys, count-1, axis=1)[:, :count]
+
+
+def play_batch(games, doors=3, cars=1, opened=1, strategy="switch", seed=None):
+    """
+    Spiele games Spiele gleichzeitig und gib die Anzahl der Gewinne
+    zurück.
+
+    Jede Zeile der (games, doors)-Arrays ist ein Spiel. Autos,
+    Wahl des Kandidaten, geöffnete Türen und der Wechsel werden
+    zeilenweise über Zufallsschlüssel ausgewählt.
+    """
+    check_setup(doors, cars, opened)
+    if strategy not in STRATEGIES:
+        raise MontyHallError(f"Unknown strategy '{strategy}'")
+    rng = np.random.default_rng(seed)
+    rows = np.arange(games)[:, np.newaxis]
+    everywhere = np.ones((games, doors), dtype=bool)
+
+    car = np.zeros((games, doors), dtype=bool)
+    car[rows, _random_choice(rng.random((games, doors)), everywhere, cars)] = True
+    choice = rng.integers(0, doors, size=games)
+
+    # Moderator: nur Ziegen, nicht die Tür des Kandidaten
+    closed = everywhere.copy()
+    closed[rows[:, 0], choice] = False
+    if opened > 0:
+        hostable = closed & ~car
+        shown = _random_choice(rng.random((games, doors)), hostable, opened)
+        closed[rows, shown] = False
+
+    switched = _random_choice(rng.random((games, doors)), closed, 1)[:, 0]
+    if strategy == "stay":
+        final = choice
+    elif strategy == "switch":
+        final = switched
+    else:
+        final = np.where(rng.random(games) < 0.5, choice, switched)
+    return int(car[rows[:, 0], final].sum())
+
+
+def _play_batch_args(args):
+    return play_batch(*args)
+
+
+class MontyHallResult:
+    """
+    Ergebnis einer Simulation: Schätzwert der Gewinnwahrscheinlichkeit
+    mit Konfidenzintervall und exakter Wahrscheinlichkeit zum Vergleich.
+    """
+    def __init__(self, strategy, games, wins, confidence, expected):
+        self.strategy = strategy
+        self.games = games
+        self.wins = wins
+        self.confidence = confidence
+        self.expected = expected
+        self.estimate = wins/games
+        self.interval = wilson_interval(wins, games, confidence)
+
+    def consistent(self):
+        """
+        Liegt die exakte Wahrscheinlichkeit im Konfidenzintervall?
+        """
+        return self.interval[0] <= self.expected <= self.interval[1]
+
+    def __repr__(self):
+        return (f"MontyHallResult({self.strategy}: {self.estimate:.5f} "
+                f"[{self.interval[0]:.5f}, {self.interval[1]:.5f}], "
+                f"exakt {self.expected:.5f}, {self.games} Spiele)")
+
+
+def wilson_interval(wins, games, confidence=0.95):
+    """
+    Konfidenzintervall für eine Erfolgswahrscheinlichkeit nach Wilson.
+    """
+    if games <= 0:
+        raise MontyHallError("Need at least one game")
+    z = NormalDist().inv_cdf(0.5+confidence/2)
+    p = wins/games
+    denominator = 1+z*z/games
+    center = (p+z*z/(2*games))/denominator
+    half = z*math.sqrt(p*(1-p)/games+z*z/(4*games*games))/denominator
+    return max(0.0, center-half), min(1.0, center+half)
+
+
+def _seed_sequence(seed):
+    """
+    SeedSequence aus einem Startwert (int, None oder SeedSequence).
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def simulate(games, doors=3, cars=1, opened=1, strategy="switch", seed=None,
+             workers=1, batch_size=None, confidence=0.95):
+    """
+    Spiele games Spiele mit der angegebenen Strategie.
+
+    Die Spiele werden in Blöcke zu batch_size aufgeteilt. Bei
+    workers > 1 werden die Blöcke in einem Prozess-Pool gespielt.
+    Gibt ein MontyHallResult zurück.
+    """
+    expected = win_probability(strategy, doors, cars, opened)
+    if games < 1:
+        raise MontyHallError("Need at least one game")
+    if batch_size is None:
+        batch_size = BATCH_SIZE
+    sizes = [min(batch_size, games-start) for start in range(0, games, batch_size)]
+    seeds = _seed_sequence(seed).spawn(len(sizes))
+    tasks = [(size, doors, cars, opened, strategy, s) for size, s in zip(sizes, seeds)]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            wins = sum(pool.map(_play_batch_args, tasks))
+    else:
+        wins = sum(map(_play_batch_args, tasks))
+    return MontyHallResult(strategy, games, wins, confidence, expected)
+
+
+def simulate_all(games, doors=3, cars=1, opened=1, seed=None, workers=1,
+                 batch_size=None, confidence=0.95):
+    """
+    Simuliere alle Strategien, Ergebnis ist ein Dictionary
+    Strategie -> MontyHallResult.
+    """
+    seeds = _seed_sequence(seed).spawn(len(STRATEGIES))
+    return {strategy: simulate(games, doors, cars, opened, strategy, s,
+                               workers, batch_size, confidence)
+            for strategy, s in zip(STRATEGIES, seeds)}
+
+
+if __name__ == '__main__':
+    for result in simulate_all(10**6, seed=42).values():
+        print(result)
+    for result in simulate_all(10**6, doors=10, cars=2, opened=5, seed=42).values():
+        print(result)
@@ -0,0 +1,85 @@
+import unittest
+from montyhall import (simulate, simulate_all, play_batch, win_probability,
+                       wilson_interval, MontyHallError)
+
+
+class TestMontyHall(unittest.TestCase):
+    """
+    Unittests für die Simulation des Ziegenproblems.
+    """
+
+    def test_01_closed_form(self):
+        """
+        Exakte Gewinnwahrscheinlichkeiten.
+        """
+        self.assertAlmostEqual(win_probability("stay"), 1/3)
+        self.assertAlmostEqual(win_probability("switch"), 2/3)
+        self.assertAlmostEqual(win_probability("random"), 1/2)
+        self.assertAlmostEqual(win_probability("switch", 10, 2, 5), 0.45)
+        self.assertAlmostEqual(win_probability("switch", 5, 1, 0), 0.2)
+
+    def test_02_simulation(self):
+        """
+        Die Schätzwerte passen zu den exakten Werten.
+        """
+        for doors, cars, opened in [(3, 1, 1), (10, 2, 5), (6, 2, 3), (4, 1, 0)]:
+            results = simulate_all(200000, doors, cars, opened, seed=1,
+                                   batch_size=50000, confidence=0.999)
+            for strategy, result in results.items():
+                self.assertEqual(result.games, 200000)
+                self.assertTrue(result.consistent(), result)
+
+    def test_03_reproducible(self):
+        """
+        Gleicher Startwert, gleiches Ergebnis - auch mit mehreren Prozessen.
+        """
+        single = simulate(40000, seed=7, batch_size=10000)
+        again = simulate(40000, seed=7, batch_size=10000)
+        parallel = simulate(40000, seed=7, batch_size=10000, workers=2)
+        self.assertEqual(single.wins, again.wins)
+        self.assertEqual(single.wins, parallel.wins)
+
+    def test_04_interval(self):
+        """
+        Konfidenzintervall nach Wilson, auch an den Rändern.
+        """
+        low, high = wilson_interval(0, 100)
+        self.assertEqual(low, 0.0)
+        self.assertTrue(0 < high < 0.05)
+        low, high = wilson_interval(100, 100)
+        self.assertEqual(high, 1.0)
+        low, high = wilson_interval(500, 1000)
+        self.assertAlmostEqual((low + high) / 2, 0.5)
+        self.assertTrue(wilson_interval(500, 1000, 0.99)[0] < low)
+        self.assertEqual(play_batch(1000, 3, 1, 1, "stay", 3),
+                         play_batch(1000, 3, 1, 1, "stay", 3))
+
+    def test_05_errors(self):
+        """
+        Fehlerbehandlung.
+        """
+        with self.assertRaises(MontyHallError):
+            win_probability("stay", 2, 1, 0)
+        with self.assertRaises(MontyHallError):
+            win_probability("switch", 3, 2, 1)
+        with self.assertRaises(MontyHallError):
+            win_probability("switch", 3, 1, 2)
+        with self.assertRaises(MontyHallError):
+            simulate(10, strategy="dance")
+        with self.assertRaises(MontyHallError):
+            simulate(0)
+
+
+if __name__ == '__main__':
+    # Durchführung der Tests
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestMontyHall("test_01_closed_form"))
+    suite.addTest(TestMontyHall("test_02_simulation"))
+    suite.addTest(TestMontyHall("test_03_reproducible"))
+    suite.addTest(TestMontyHall("test_04_interval"))
+    suite.addTest(TestMontyHall("test_05_errors"))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
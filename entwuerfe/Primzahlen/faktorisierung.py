@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+
+"""Primfaktorzerlegung (Kapitel 1).
+
+Statt jede Zahl einzeln durch Probedivision zu zerlegen, wird für
+alle n <= N eine Tabelle der kleinsten Primfaktoren (smallest prime
+factor, SPF) mit dem Sieb aufgebaut. Damit ist die Zerlegung einer
+Zahl nur noch eine Folge von Tabellenzugriffen, und die Zerlegungen
+aller Zahlen bis N werden für alle Zahlen gleichzeitig mit NumPy
+berechnet.
+
+Einzelne große Zahlen werden nach Probedivision durch kleine
+Primzahlen mit dem Miller-Rabin-Test und dem Verfahren von Pollard
+(rho) zerlegt.
+
+Zerlegungen werden als kompakte Arrays geliefert: für eine Zahl ein
+aufsteigend sortiertes Array der Primfaktoren (mit Vielfachheit), für
+alle Zahlen bis N ein gemeinsames Array aller Faktoren mit
+Startpositionen (offsets) wie bei einer CSR-Matrix.
+"""
+
+import math
+import numpy as np
+
+from primzahlen import PrimeError, simple_sieve
+
+
+# Probedivision bei Einzelzahlen bis zu dieser Grenze
+TRIAL_LIMIT = 1000
+
+# Basen für Miller-Rabin: deterministisch für n < 3.3 * 10^24
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+_trial_primes = simple_sieve(TRIAL_LIMIT).tolist()
+
+
+def _table_dtype(limit):
+    """
+    Kleinster Ganzzahltyp für Einträge <= limit.
+    """
+    return np.int32 if limit <= np.iinfo(np.int32).max else np.int64
+
+
+def smallest_prime_factors(limit):
+    """
+    Tabelle der kleinsten Primfaktoren: Eintrag n ist der kleinste
+    Primfaktor von n für 2 <= n <= limit, Einträge 0 und 1 sind 0.
+
+    Jede ungerade Primzahl p bis Wurzel(limit) trägt sich bei den
+    ungeraden Vielfachen ab p² ein, an denen noch nichts steht. Was
+    danach frei bleibt, ist selbst eine Primzahl.
+    """
+    if limit < 0:
+        raise PrimeError("Limit must not be negative")
+    spf = np.zeros(limit+1, dtype=_table_dtype(limit))
+    spf[2::2] = 2
+    for p in simple_sieve(math.isqrt(limit))[1:].tolist():
+        multiples = spf[p*p::2*p]
+        multiples[multiples == 0] = p
+    free = np.flatnonzero(spf == 0)
+    free = free[free >= 2]
+    spf[free] = free
+    return spf
+
+
+def factorize_all(limit, spf=None):
+    """
+    Zerlegung aller Zahlen 0 <= n <= limit.
+
+    Gibt (offsets, factors) zurück: Die Primfaktoren von n stehen
+    aufsteigend in factors[offsets[n]:offsets[n+1]], für 0 und 1 ist
+    der Bereich leer. Alle Zahlen werden gleichzeitig zerlegt, in
+    Runde k wird von allen noch nicht fertigen Zahlen der k-te Faktor
+    abgespalten.
+    """
+    if spf is None:
+        spf = smallest_prime_factors(limit)
+    elif len(spf) <= limit:
+        raise PrimeError("Factor table too small")
+    dtype = _table_dtype(limit)
+    numbers = np.arange(2, limit+1, dtype=dtype)
+
+    # 1. Durchlauf: Anzahl der Primfaktoren
+    count = np.zeros(limit+1, dtype=np.int64)
+    index, rest = numbers, numbers
+    while len(index) > 0:
+        count[index] += 1
+        rest = rest//spf[rest]
+        keep = rest > 1
+        index, rest = index[keep], rest[keep]
+    offsets = np.zeros(limit+2, dtype=np.int64)
+    np.cumsum(count, out=offsets[1:])
+
+    # 2. Durchlauf: Faktoren an ihre Position schreiben
+    factors = np.empty(offsets[-1], dtype=spf.dtype)
+    position, rest = offsets[2:-1], numbers
+    while len(position) > 0:
+        p = spf[rest]
+        factors[position] = p
+        rest = rest//p
+        keep = rest > 1
+        position, rest = position[keep]+1, rest[keep]
+    return offsets, factors
+
+
+def is_probable_prime(n):
+    """
+    Primzahltest nach Miller-Rabin.
+
+    Mit den Basen aus MILLER_RABIN_BASES ist das Ergebnis für
+    n < 3.3 * 10^24 sicher, darüber ist eine zusammengesetzte Zahl
+    nur mit verschwindend kleiner Wahrscheinlichkeit "prim".
+    """
+    if n < 2:
+        return False
+    for p in MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n-1, 0
+    while d % 2 == 0:
+        d, s = d//2, s+1
+    for a in MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n-1:
+            continue
+        for i in range(s-1):
+            x = x*x % n
+            if x == n-1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_rho(n):
+    """
+    Ein echter Teiler der zusammengesetzten Zahl n nach Pollard (rho),
+    in der Variante von Brent (Zyklensuche mit Zweierpotenzen, gcd
+    nur für Blöcke von Produkten).
+    """
+    if n % 2 == 0:
+        return 2
+    for c in range(1, n):
+        y, r, q, g = 2, 1, 1, 1
+        while g == 1:
+            x = y
+            for i in range(r):
+                y = (y*y+c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for i in range(min(128, r-k)):
+                    y = (y*y+c) % n
+                    q = q*abs(x-y) % n
+                g = math.gcd(q, n)
+                k += 128
+            r *= 2
+        if g == n:
+            # Block zu grob: schrittweise wiederholen
+            g = 1
+            while g == 1:
+                ys = (ys*ys+c) % n
+                g = math.gcd(abs(x-ys), n)
+        if g != n:
+            return g
+    raise PrimeError(f"No factor found for {n}")
+
+
+def _split(n, factors):
+    """
+    Zerlege n (ohne Primfaktoren <= TRIAL_LIMIT) rekursiv.
+    """
+    if n == 1:
+        return
+    if n < TRIAL_LIMIT*TRIAL_LIMIT or is_probable_prime(n):
+        factors.append(n)
+        return
+    d = pollard_rho(n)
+    _split(d, factors)
+    _split(n//d, factors)
+
+
+def factorize(n, spf=None):
+    """
+    Primfaktoren von n (mit Vielfachheit) als aufsteigend sortiertes
+    Array.
+
+    Liegt n in der Tabelle spf, wird nur nachgeschlagen. Sonst wird
+    durch die Primzahlen bis TRIAL_LIMIT geteilt und der Rest mit
+    Miller-Rabin und Pollard-rho zerlegt. Passen die Faktoren nicht in
+    int64, ist das Array vom Typ object.
+    """
+    n = int(n)
+    if n < 1:
+        raise PrimeError("Can only factorize positive integers")
+    if spf is not None and n < len(spf):
+        factors = []
+        while n > 1:
+            p = int(spf[n])
+            factors.append(p)
+            n //= p
+        return np.array(factors, dtype=np.int64)
+    factors = []
+    for p in _trial_primes:
+        if p*p > n:
+            break
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+    _split(n, factors)
+    factors.sort()
+    dtype = np.int64 if not factors or factors[-1] <= np.iinfo(np.int64).max else object
+    return np.array(factors, dtype=dtype)
+
+
+def prime_powers(factors):
+    """
+    Primfaktoren mit Exponenten: (primes, exponents) aus einem
+    sortierten Faktor-Array, z.B. [2, 2, 3] -> ([2, 3], [2, 1]).
+    """
+    return np.unique(np.asarray(factors), return_counts=True)
+
+
+def factorization_string(n, spf=None):
+    """
+    Zerlegung als Text wie in der Übung, z.B. "780=2*2*3*5*13".
+    """
+    return f"{n}=" + "*".join(str(p) for p in factorize(n, spf).tolist())
+
+
+if __name__ == '__main__':
+    print(factorization_string(780))
+    print(factorization_string(2**64+1))
+    offsets, factors = factorize_all(30)
+    for n in range(2, 31):
+        print(n, factors[offsets[n]:offsets[n+1]])
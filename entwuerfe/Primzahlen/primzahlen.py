@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+
+"""Primzahlen mit dem Sieb des Eratosthenes (Kapitel 1 und 4).
+
+Statt ein Array für den ganzen Bereich 0..n anzulegen, wird
+segmentiert gesiebt: Der Bereich wird in Abschnitte zerlegt, die in
+den L2-Cache passen, und jeder Abschnitt wird mit den Primzahlen bis
+Wurzel(n) ("Basisprimzahlen") gesiebt. Gerade Zahlen werden gar
+nicht erst gespeichert, ein Byte (uint8) steht für eine ungerade Zahl.
+
+Primzahlen werden als Generator oder in Blöcken (NumPy-Arrays)
+geliefert. Das Zählen von Primzahlen braucht nur ein Segment
+gleichzeitig im Speicher und kann auf mehrere Prozesse verteilt
+werden.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+
+class PrimeError(Exception):
+    """
+    Für eigene Fehler bei der Primzahlberechnung.
+    """
+    pass
+
+
+# Ungerade Zahlen pro Segment (ein Byte je Zahl, 256 KiB ~ L2-Cache)
+SEGMENT_SIZE = 2**18
+
+
+def simple_sieve(limit):
+    """
+    Alle Primzahlen <= limit mit einem nicht segmentierten Sieb, das
+    nur ungerade Zahlen speichert. Für kleine limit (z.B. die
+    Basisprimzahlen bis Wurzel(n)).
+    """
+    if limit < 2:
+        return np.zeros(0, dtype=np.int64)
+    # is_prime[i] steht für die Zahl 2i+1
+    is_prime = np.ones((limit+1)//2, dtype=np.uint8)
+    is_prime[0] = 0
+    for i in range(1, (math.isqrt(limit)+1)//2):
+        if is_prime[i]:
+            p = 2*i+1
+            is_prime[p*p//2::p] = 0
+    return np.concatenate(([2], 2*np.flatnonzero(is_prime)+1)).astype(np.int64)
+
+
+def _sieve_segment(low, high, base, segment=None):
+    """
+    Siebe die ungeraden Zahlen in [low, high) mit den (ungeraden)
+    Basisprimzahlen base. low muss ungerade sein.
+
+    Gibt ein uint8-Array zurück, Eintrag i steht für die Zahl low+2i.
+    Kleine Primzahlen markieren ihre Vielfachen per Slice, große
+    Primzahlen treffen ein Segment nur wenige Male - für sie werden
+    alle Treffer einer Runde gemeinsam vektorisiert markiert.
+    """
+    size = (high-low+1)//2
+    if segment is None or len(segment) < size:
+        segment = np.empty(size, dtype=np.uint8)
+    seg = segment[:size]
+    seg[:] = 1
+    if low == 1:
+        seg[0] = 0
+    base = base[base*base < high]
+    if len(base) == 0:
+        return seg
+    # Erstes ungerades Vielfaches >= max(p², low)
+    first = np.maximum(base*base, (low+base-1)//base*base)
+    first += base*(first % 2 == 0)
+    index = (first-low)//2
+    small = np.searchsorted(base, max(64, size//32))
+    for p, i in zip(base[:small].tolist(), index[:small].tolist()):
+        seg[i::p] = 0
+    big, index = base[small:], index[small:]
+    while len(index) > 0:
+        hit = index < size
+        index, big = index[hit], big[hit]
+        seg[index] = 0
+        index = index+big
+    return seg
+
+
+def _segment_size(segment_size):
+    """
+    Segmentgröße prüfen, None steht für SEGMENT_SIZE.
+    """
+    if segment_size is None:
+        return SEGMENT_SIZE
+    if segment_size < 1:
+        raise PrimeError("Segment size must be positive")
+    return segment_size
+
+
+def _segments(low, high, segment_size):
+    """
+    Zerlege [low, high) in ungerade beginnende Segmente.
+    """
+    start = low | 1
+    step = 2*segment_size
+    for seg_low in range(start, high, step):
+        yield seg_low, min(seg_low+step, high)
+
+
+def primes_chunked(limit, low=2, segment_size=None):
+    """
+    Alle Primzahlen p mit low <= p <= limit, als Folge von int64-Arrays
+    (ein Array pro Segment, leere Segmente werden übersprungen).
+    """
+    segment_size = _segment_size(segment_size)
+    if limit < 2 or low > limit:
+        return
+    if low <= 2:
+        yield np.array([2], dtype=np.int64)
+    base = simple_sieve(math.isqrt(limit))[1:]
+    buffer = np.empty(segment_size, dtype=np.uint8)
+    for seg_low, seg_high in _segments(max(low, 3), limit+1, segment_size):
+        seg = _sieve_segment(seg_low, seg_high, base, buffer)
+        found = seg_low+2*np.flatnonzero(seg).astype(np.int64)
+        if len(found) > 0:
+            yield found
+
+
+def primes(limit, low=2, segment_size=None):
+    """
+    Generator über alle Primzahlen p mit low <= p <= limit.
+    """
+    for chunk in primes_chunked(limit, low, segment_size):
+        yield from chunk.tolist()
+
+
+def erathosethenes_sieve(max_val):
+    """
+    Alle Primzahlen bis max_val als ein NumPy-Array.
+    """
+    chunks = list(primes_chunked(max_val))
+    if not chunks:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(chunks)
+
+
+def _count_range(args):
+    """
+    Anzahl der ungeraden Primzahlen in [low, high), ein Segment nach
+    dem anderen.
+    """
+    low, high, base, segment_size = args
+    buffer = np.empty(segment_size, dtype=np.uint8)
+    count = 0
+    for seg_low, seg_high in _segments(low, high, segment_size):
+        count += int(np.count_nonzero(_sieve_segment(seg_low, seg_high, base, buffer)))
+    return count
+
+
+def count_primes(limit, workers=1, segment_size=None):
+    """
+    Anzahl der Primzahlen <= limit (Primzahlfunktion pi(limit)).
+
+    Es liegt pro Prozess nur ein Segment im Speicher. Mit workers > 1
+    wird der Bereich in gleich große Teile zerlegt, die in einem
+    Prozess-Pool gesiebt werden.
+    """
+    segment_size = _segment_size(segment_size)
+    if limit < 2:
+        return 0
+    base = simple_sieve(math.isqrt(limit))[1:]
+    # Teilbereiche auf Segmentgrenzen legen, mehrere Teile pro Prozess
+    # gleichen unterschiedliche Laufzeiten aus
+    step = 2*segment_size
+    segments = (limit-1)//step+1
+    parts = max(1, min(segments, 4*workers))
+    per_part = -(-segments//parts)
+    tasks = [(3+i*per_part*step, min(3+(i+1)*per_part*step, limit+1), base, segment_size)
+             for i in range(parts) if 3+i*per_part*step <= limit]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return 1+sum(pool.map(_count_range, tasks))
+    return 1+sum(map(_count_range, tasks))
@@ -0,0 +1,95 @@
+import unittest
+import numpy as np
+from primzahlen import PrimeError
+from faktorisierung import (smallest_prime_factors, factorize_all, factorize,
+                            is_probable_prime, pollard_rho, prime_powers,
+                            factorization_string)
+
+
+def trial_division(n):
+    """
+    Hilfsfunktion (KEIN TEST): Zerlegung durch Probedivision.
+    """
+    factors = []
+    d = 2
+    while d * d <= n:
+        while n % d == 0:
+            factors.append(d)
+            n //= d
+        d += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+class TestFaktorisierung(unittest.TestCase):
+    """
+    Unittests für die Primfaktorzerlegung.
+    """
+
+    def test_01_example(self):
+        """
+        Beispiel aus der Übung.
+        """
+        self.assertEqual(factorization_string(780), "780=2*2*3*5*13")
+        self.assertEqual(list(factorize(780)), [2, 2, 3, 5, 13])
+        self.assertEqual(list(factorize(1)), [])
+        primes, exponents = prime_powers(factorize(780))
+        self.assertEqual(list(primes), [2, 3, 5, 13])
+        self.assertEqual(list(exponents), [2, 1, 1, 1])
+        with self.assertRaises(PrimeError):
+            factorize(0)
+
+    def test_02_table(self):
+        """
+        Tabelle der kleinsten Primfaktoren und Zerlegung aller Zahlen.
+        """
+        spf = smallest_prime_factors(2000)
+        self.assertEqual(list(spf[:10]), [0, 0, 2, 3, 2, 5, 2, 7, 2, 3])
+        offsets, factors = factorize_all(2000, spf)
+        self.assertEqual(offsets[2], 0)
+        for n in range(2001):
+            self.assertEqual(list(factors[offsets[n]:offsets[n+1]]), trial_division(n))
+            self.assertEqual(list(factorize(n or 1, spf)), trial_division(n or 1))
+        offsets, factors = factorize_all(1)
+        self.assertEqual(len(factors), 0)
+
+    def test_03_miller_rabin(self):
+        """
+        Primzahltest, auch für starke Pseudoprimzahlen.
+        """
+        small = [n for n in range(2000) if is_probable_prime(n)]
+        self.assertEqual(small, [n for n in range(2, 2000) if trial_division(n) == [n]])
+        self.assertFalse(is_probable_prime(561))
+        self.assertFalse(is_probable_prime(3215031751))
+        self.assertTrue(is_probable_prime(2**61 - 1))
+        self.assertTrue(is_probable_prime(2**89 - 1))
+        self.assertFalse(is_probable_prime((2**31 - 1) * (2**61 - 1)))
+
+    def test_04_large(self):
+        """
+        Große Zahlen mit Pollard-rho.
+        """
+        self.assertIn(pollard_rho(1000003 * 1000033), (1000003, 1000033))
+        self.assertEqual(list(factorize(2**64 + 1)), [274177, 67280421310721])
+        self.assertEqual(list(factorize(999983 * 1000003 * 1000033)),
+                         [999983, 1000003, 1000033])
+        self.assertEqual(list(factorize((2**31 - 1) * (2**61 - 1) * 12)),
+                         [2, 2, 3, 2**31 - 1, 2**61 - 1])
+        big = factorize((2**89 - 1) * 3)
+        self.assertEqual(big.dtype, object)
+        self.assertEqual(list(big), [3, 2**89 - 1])
+
+
+if __name__ == '__main__':
+    # Durchführung der Tests
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestFaktorisierung("test_01_example"))
+    suite.addTest(TestFaktorisierung("test_02_table"))
+    suite.addTest(TestFaktorisierung("test_03_miller_rabin"))
+    suite.addTest(TestFaktorisierung("test_04_large"))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
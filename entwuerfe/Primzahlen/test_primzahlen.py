@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from primzahlen import (simple_sieve, primes_chunked, primes, count_primes,
+                        erathosethenes_sieve, PrimeError)
+
+
+def is_prime(n):
+    """
+    Hilfsfunktion (KEIN TEST): Primzahltest durch Probedivision.
+    """
+    if n < 2:
+        return False
+    d = 2
+    while d * d <= n:
+        if n % d == 0:
+            return False
+        d += 1
+    return True
+
+
+class TestPrimzahlen(unittest.TestCase):
+    """
+    Unittests für das segmentierte Sieb.
+    """
+
+    def test_01_small(self):
+        """
+        Die ersten Primzahlen, auch für sehr kleine Grenzen.
+        """
+        self.assertEqual(list(erathosethenes_sieve(53)),
+                         [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53])
+        self.assertEqual(list(erathosethenes_sieve(1)), [])
+        self.assertEqual(list(erathosethenes_sieve(2)), [2])
+        self.assertEqual(list(erathosethenes_sieve(3)), [2, 3])
+        self.assertEqual(list(simple_sieve(30)), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+
+    def test_02_segments(self):
+        """
+        Kleine Segmente: Ergebnis unabhängig von den Segmentgrenzen.
+        """
+        expected = [n for n in range(2000) if is_prime(n)]
+        for segment_size in [1, 3, 16, 100, 1000]:
+            chunks = list(primes_chunked(1999, segment_size=segment_size))
+            self.assertEqual(list(np.concatenate(chunks)), expected)
+        self.assertEqual(list(primes(1999, 1000, segment_size=7)),
+                         [p for p in expected if p >= 1000])
+        self.assertEqual(list(primes(100, 90)), [97])
+        self.assertEqual(list(primes(10, 11)), [])
+
+    def test_03_large(self):
+        """
+        Vergleich mit dem einfachen Sieb und bekannten Werten.
+        """
+        self.assertTrue(np.array_equal(erathosethenes_sieve(10**6), simple_sieve(10**6)))
+        self.assertEqual(count_primes(10**6), 78498)
+        self.assertEqual(count_primes(10**7), 664579)
+        # Primzahlquadrate an der Grenze
+        self.assertEqual(count_primes(997 * 997), len(simple_sieve(997 * 997)))
+
+    def test_04_count(self):
+        """
+        Zählen mit mehreren Prozessen und kleinen Segmenten.
+        """
+        for limit in [0, 1, 2, 3, 10, 100, 12345]:
+            expected = sum(1 for n in range(limit + 1) if is_prime(n))
+            self.assertEqual(count_primes(limit, segment_size=64), expected)
+        self.assertEqual(count_primes(10**6, workers=2, segment_size=5000), 78498)
+        with self.assertRaises(PrimeError):
+            count_primes(100, segment_size=0)
+
+
+if __name__ == '__main__':
+    # Durchführung der Tests
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestPrimzahlen("test_01_small"))
+    suite.addTest(TestPrimzahlen("test_02_segments"))
+    suite.addTest(TestPrimzahlen("test_03_large"))
+    suite.addTest(TestPrimzahlen("test_04_count"))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+from wuerfel import (roll_dice, roll_dice_chunked, count_eyes, eye_sums,
+                     running_frequency, count_sums_streamed,
+                     count_eyes_streamed, roll_two_dice_a, plot_six, DiceError)
+
+
+class TestWuerfel(unittest.TestCase):
+    """
+    Unittests für die Würfelsimulationen.
+    """
+
+    def test_01_roll_dice(self):
+        """
+        Form, Wertebereich und Reproduzierbarkeit der Würfe.
+        """
+        rolls = roll_dice(1000, rng=1)
+        self.assertEqual(rolls.shape, (1000,))
+        self.assertTrue(np.all((rolls >= 1) & (rolls <= 6)))
+        self.assertEqual(set(rolls), {1, 2, 3, 4, 5, 6})
+        self.assertTrue(np.array_equal(rolls, roll_dice(1000, rng=1)))
+        self.assertEqual(roll_dice(10, 3, 20, rng=2).shape, (10, 3))
+        self.assertTrue(roll_dice(10, 1, 1000, rng=2).max() <= 1000)
+
+    def test_02_count_eyes(self):
+        """
+        Relative Häufigkeiten und Augensummen.
+        """
+        props = count_eyes([1, 2, 2, 6, 6, 6])
+        self.assertTrue(np.allclose(props, [1/6, 2/6, 0, 0, 0, 3/6]))
+        self.assertAlmostEqual(count_eyes(roll_dice(10000, rng=3)).sum(), 1.0)
+        self.assertEqual(list(eye_sums([[1, 2], [6, 6]])), [3, 12])
+
+    def test_03_running_frequency(self):
+        """
+        Laufende relative Häufigkeit über kumulierte Summen.
+        """
+        freq = running_frequency([6, 1, 6, 2])
+        self.assertTrue(np.allclose(freq, [1, 1/2, 2/3, 2/4]))
+
+    def test_04_streamed(self):
+        """
+        Blockweise Zählung: reproduzierbar und konsistent.
+        """
+        counts = count_sums_streamed(100000, 2, 6, seed=4, chunk_size=30000)
+        self.assertEqual(counts.sum(), 100000)
+        self.assertEqual(counts[0] + counts[1], 0)
+        self.assertTrue(np.array_equal(
+            counts, count_sums_streamed(100000, 2, 6, seed=4, chunk_size=30000)))
+        chunks = list(roll_dice_chunked(25, chunk_size=10, rng=5))
+        self.assertEqual([len(c) for c in chunks], [10, 10, 5])
+        props = count_eyes_streamed(600000, seed=6)
+        self.assertTrue(np.allclose(props, 1/6, atol=0.01))
+        # P(A) = 1 - 3/36
+        self.assertAlmostEqual(roll_two_dice_a(10**6, seed=7), 33/36, places=2)
+
+    def test_05_errors(self):
+        """
+        Fehlerbehandlung.
+        """
+        with self.assertRaises(DiceError):
+            roll_dice(-1)
+        with self.assertRaises(DiceError):
+            roll_dice(10, 0)
+        with self.assertRaises(DiceError):
+            roll_dice(10, 1, 1)
+        with self.assertRaises(DiceError):
+            count_eyes([])
+        with self.assertRaises(DiceError):
+            count_eyes(roll_dice(10, sides=20, rng=1))
+        with self.assertRaises(DiceError):
+            count_eyes([0, 1, 2])
+        with self.assertRaises(DiceError):
+            plot_six(0)
+        with self.assertRaises(DiceError):
+            plot_six(-1)
+
+
+if __name__ == '__main__':
+    # Durchführung der Tests
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTest(TestWuerfel("test_01_roll_dice"))
+    suite.addTest(TestWuerfel("test_02_count_eyes"))
+    suite.addTest(TestWuerfel("test_03_running_frequency"))
+    suite.addTest(TestWuerfel("test_04_streamed"))
+    suite.addTest(TestWuerfel("test_05_errors"))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+
+"""Würfelsimulationen (Monte-Carlo) aus Kapitel 2.
+
+Statt einzelner Aufrufe von random.randint() werden alle Würfe mit
+einem einzigen NumPy-Aufruf erzeugt. Häufigkeiten werden mit
+np.bincount() gezählt, laufende relative Häufigkeiten über kumulierte
+Summen berechnet.
+
+Sehr viele Würfe (z.B. 10^8) werden in Blöcken (chunks) erzeugt und
+gezählt, so dass der Speicherbedarf unabhängig von der Anzahl der
+Würfe ist.
+
+Alle Funktionen nehmen optional einen Zufallsgenerator (rng) oder
+einen Startwert (seed). Mit gleichem seed (und gleicher Blockgröße)
+sind die Ergebnisse reproduzierbar.
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+class DiceError(Exception):
+    """
+    Für eigene Fehler bei den Würfelsimulationen.
+    """
+    pass
+
+
+# Anzahl Würfe pro Block bei den Streaming-Funktionen
+CHUNK_SIZE = 10**7
+
+
+def make_rng(seed=None):
+    """
+    Zufallsgenerator aus einem Startwert. Ist seed schon ein
+    Generator, wird er unverändert zurückgegeben.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def _check(count, dice, sides):
+    if count < 0:
+        raise DiceError("Number of rolls must not be negative")
+    if dice < 1:
+        raise DiceError("Need at least one die")
+    if sides < 2:
+        raise DiceError("A die needs at least two sides")
+
+
+def _dtype(sides):
+    """
+    Kleinster Ganzzahltyp, in den die Augenzahlen passen.
+    """
+    return np.uint8 if sides <= np.iinfo(np.uint8).max else np.int64
+
+
+def roll_dice(count, dice=1, sides=6, rng=None):
+    """
+    Würfle count-mal mit dice Würfeln mit je sides Seiten.
+
+    Bei einem Würfel ist das Ergebnis ein Array der Länge count, sonst
+    ein (count, dice)-Array mit einer Zeile pro Wurf.
+    """
+    _check(count, dice, sides)
+    rng = make_rng(rng)
+    shape = count if dice == 1 else (count, dice)
+    return rng.integers(1, sides+1, size=shape, dtype=_dtype(sides))
+
+
+def roll_dice_chunked(count, dice=1, sides=6, rng=None, chunk_size=None):
+    """
+    Wie roll_dice(), liefert die Würfe aber als Folge von Blöcken mit
+    höchstens chunk_size Würfen.
+    """
+    _check(count, dice, sides)
+    rng = make_rng(rng)
+    if chunk_size is None:
+        chunk_size = CHUNK_SIZE
+    for start in range(0, count, chunk_size):
+        yield roll_dice(min(chunk_size, count-start), dice, sides, rng)
+
+
+def count_eyes(rolls, sides=6):
+    """
+    Relative Häufigkeiten der Augenzahlen 1 bis sides.
+
+    Ergebnis ist ein Array der Länge sides, Eintrag i gehört zur
+    Augenzahl i+1. Augenzahlen außerhalb von 1 bis sides sind ein
+    Fehler.
+    """
+    rolls = np.asarray(rolls)
+    if rolls.size == 0:
+        raise DiceError("Need at least one roll")
+    if rolls.min() < 1 or rolls.max() > sides:
+        raise DiceError(f"Rolls must be between 1 and {sides}")
+    counts = np.bincount(rolls.ravel(), minlength=sides+1)[1:]
+    return counts/rolls.size
+
+
+def eye_sums(rolls):
+    """
+    Augensumme jedes Wurfs bei mehreren Würfeln.
+    """
+    rolls = np.asarray(rolls)
+    if rolls.ndim == 1:
+        return rolls.astype(np.int64)
+    return rolls.sum(axis=1, dtype=np.int64)
+
+
+def running_frequency(rolls, eyes=6):
+    """
+    Laufende relative Häufigkeit der Augenzahl eyes: Eintrag i ist der
+    Anteil von eyes unter den ersten i+1 Würfen.
+    """
+    rolls = np.asarray(rolls)
+    return np.cumsum(rolls == eyes)/np.arange(1, len(rolls)+1)
+
+
+def count_sums_streamed(count, dice=1, sides=6, seed=None, chunk_size=None):
+    """
+    Absolute Häufigkeiten der Augensummen für count Würfe, blockweise
+    berechnet (konstanter Speicherbedarf).
+
+    Ergebnis ist ein Array der Länge dice*sides+1, Eintrag s ist die
+    Anzahl der Würfe mit Augensumme s.
+    """
+    counts = np.zeros(dice*sides+1, dtype=np.int64)
+    for rolls in roll_dice_chunked(count, dice, sides, make_rng(seed), chunk_size):
+        counts += np.bincount(eye_sums(rolls), minlength=dice*sides+1)
+    return counts
+
+
+def count_eyes_streamed(count, sides=6, seed=None, chunk_size=None):
+    """
+    Relative Häufigkeiten der Augenzahlen für count Würfe eines
+    Würfels, blockweise berechnet.
+    """
+    if count == 0:
+        raise DiceError("Need at least one roll")
+    return count_sums_streamed(count, 1, sides, seed, chunk_size)[1:]/count
+
+
+def roll_two_dice_a(count, seed=None, chunk_size=None):
+    """
+    Relativer Anteil des Ereignisses A ("Augensumme kleiner als 11")
+    bei count Würfen mit zwei Würfeln.
+    """
+    if count == 0:
+        raise DiceError("Need at least one roll")
+    sums = count_sums_streamed(count, 2, 6, seed, chunk_size)
+    return sums[:11].sum()/count
+
+
+def vis_eyes_prop(props):
+    """
+    Balkendiagramm der relativen Häufigkeiten der Augenzahlen.
+    """
+    eyes = np.arange(1, len(props)+1)
+    plt.bar(eyes, props)
+    plt.axhline(y=1/len(props), color='red', linestyle='--', linewidth=1)
+    plt.xlabel("Augenzahl")
+    plt.ylabel("Relative Häufigkeit")
+    plt.show()
+
+
+def hist_roll_dice(rolls, seed=None):
+    """
+    Würfle rolls-mal und zeige die relativen Häufigkeiten.
+    """
+    vis_eyes_prop(count_eyes_streamed(rolls, seed=seed))
+
+
+def plot_six(n, seed=None):
+    """
+    Laufende relative Häufigkeit der Augenzahl 6 über n Würfe.
+    """
+    if n == 0:
+        raise DiceError("Need at least one roll")
+    six = running_frequency(roll_dice(n, rng=make_rng(seed)), 6)
+    plt.figure(figsize=(10,5))
+    plt.grid(True)
+    print(f'Anteil der Augenzahl 6 an allen Würfen {six[-1]}')
+    plt.plot(np.arange(1, n+1), six, label="Relative Häufigkeit")
+    plt.axhline(y=1/6, color='red', linestyle='--', linewidth=1, label=f"P(6) = 1/6 = {1/6:.5f}")
+    plt.xlabel("Anzahl Würfe")
+    plt.ylabel("Anteil Augenzahl 6")
+    plt.title(f"Anteil der Augenzahl 6 innerhalb einer Wurffolge von {n} Würfen")
+    plt.legend()
+    plt.show()
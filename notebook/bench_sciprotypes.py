@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+
+"""Benchmarks für die Datentypen aus sciprotypes.
+
+Aufruf: python bench_sciprotypes.py [name ...]
+
+Ohne Argumente werden alle Benchmarks ausgeführt, sonst nur die
+angegebenen (z.B. "matmul").
+"""
+
+import sys
+import timeit
+import tracemalloc
+import numpy as np
+
+import sciprotypes
+from sciprotypes import Matrix, Vector, SparseMatrix, COOBuilder, lazy_evaluation
+
+
+def best_time(func, repeat=3, number=1):
+    """Beste Laufzeit (in Sekunden) für einen Aufruf von func.
+    """
+    return min(timeit.repeat(func, repeat=repeat, number=number))/number
+
+
+def bench_matmul():
+    """Vergleiche die Multiplikations-Backends für quadratische Matrizen.
+
+    Das naive Backend wird nur für kleine Matrizen gemessen. Die
+    Spalte "tiled/numpy" zeigt, ab welcher Größe sich das Kacheln
+    lohnt (Werte < 1).
+    """
+    rng = np.random.default_rng(42)
+    big_a = Matrix(rng.random((500, 500)))
+    big_b = Matrix(rng.random((500, 500)))
+    print(f"{'n':>6} {'naive':>10} {'numpy':>10} {'tiled':>10} {'tiled/numpy':>12}")
+    for n in [16, 64, 128, 256, 512, 1024, 2048, 4096]:
+        a = Matrix(rng.random((n, n)))
+        b = Matrix(rng.random((n, n)))
+        repeat = 3 if n <= 1024 else 1
+        t_naive = best_time(lambda: a.matrix_mul(b, "naive"), 1) \
+            if n <= 128 else float('nan')
+        t_numpy = best_time(lambda: a.matrix_mul(b, "numpy"), repeat)
+        t_tiled = best_time(lambda: a.matrix_mul(b, "tiled"), repeat)
+        print(f"{n:>6} {t_naive:>10.5f} {t_numpy:>10.5f} {t_tiled:>10.5f} "
+              f"{t_tiled/t_numpy:>12.2f}")
+    print(f"auto: tiled ab n >= {sciprotypes.MATMUL_TILED_THRESHOLD}, "
+          f"Blockgröße {sciprotypes.MATMUL_BLOCK_SIZE}")
+    print(f"500x500 Produkt (auto): "
+          f"{best_time(lambda: big_a*big_b):.5f}s")
+
+
+def laplace_2d(k):
+    """2d-Laplace-Matrix (5-Punkte-Stern) auf einem k x k Gitter.
+    """
+    n = k*k
+    idx = np.arange(n).reshape(k, k)
+    builder = COOBuilder(n, n)
+    builder.add_entries(idx.ravel(), idx.ravel(), np.full(n, 4.0))
+    for a, b in [(idx[1:, :], idx[:-1, :]), (idx[:, 1:], idx[:, :-1])]:
+        builder.add_entries(a.ravel(), b.ravel(), np.full(a.size, -1.0))
+        builder.add_entries(b.ravel(), a.ravel(), np.full(a.size, -1.0))
+    return builder.build()
+
+
+def bench_sparse():
+    """Vergleiche dünne und dichte Matrizen für die 2d-Laplace-Matrix.
+
+    Gemessen werden Matrix-Vektor-Produkt und Lösen von A*x = b
+    (dicht über die LU-Zerlegung, dünn mit CG). Das dichte Produkt
+    läuft nur bis n = 4096, die LU-Zerlegung bis n = 1024 Unbekannte.
+    """
+    print(f"{'n':>7} {'nnz':>8} {'mv dense':>10} {'mv sparse':>10} "
+          f"{'lu dense':>10} {'cg sparse':>10}")
+    for k in [16, 32, 64, 128, 256]:
+        a = laplace_2d(k)
+        n = k*k
+        x = Vector(np.random.default_rng(k).random(n))
+        b = a*x
+        t_mv_sparse = best_time(lambda: a*x)
+        t_cg = best_time(lambda: a.solve(b, "cg"), 1)
+        if n <= 4096:
+            dense = a.to_dense()
+            t_mv_dense = best_time(lambda: dense.matrix@x.vec)
+        else:
+            t_mv_dense = float('nan')
+        t_lu = best_time(lambda: dense.lu().solve(b), 1) \
+            if n <= 1024 else float('nan')
+        print(f"{n:>7} {a.nnz():>8} {t_mv_dense:>10.5f} {t_mv_sparse:>10.5f} "
+              f"{t_lu:>10.5f} {t_cg:>10.5f}")
+
+
+def peak_memory(func):
+    """Höchster zusätzlicher Speicherbedarf (in MB) während func().
+    """
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak/2**20
+
+
+def bench_inplace():
+    """Vergleiche r = a + b - c*2 mit Operatoren und in-place.
+
+    Die Operatoren legen pro Schritt eine neue Matrix an, die
+    In-place-Variante schreibt alles in eine vorhandene Matrix r.
+    Gemessen wird auch der zusätzliche Speicher während der
+    Berechnung.
+    """
+    rng = np.random.default_rng(1)
+    print(f"{'n':>6} {'operator':>10} {'inplace':>10} {'MB op':>8} {'MB in':>8}")
+    for n in [256, 1024, 2048]:
+        a, b, c = (Matrix(rng.random((n, n))) for i in range(3))
+        r = Matrix(np.empty((n, n)))
+
+        def operators():
+            return a+b-c*2.0
+
+        def inplace():
+            return c.skalar_multiplication(-2.0, out=r).add(a, out=r).add(b, out=r)
+
+        np.testing.assert_allclose(operators().matrix, inplace().matrix)
+        print(f"{n:>6} {best_time(operators):>10.5f} {best_time(inplace):>10.5f} "
+              f"{peak_memory(operators):>8.1f} {peak_memory(inplace):>8.1f}")
+    a = Matrix(rng.random((2048, 2048)))
+    print(f"transpose 2048x2048: {best_time(a.transpose, 5, 100)*1e6:.1f}µs")
+
+
+def bench_lazy():
+    """Vergleiche sofortige und verzögerte Auswertung.
+
+    Produktketten mit stark wechselnden Dimensionen werden sofort von
+    links nach rechts multipliziert, verzögert in der optimalen
+    Reihenfolge. "mult ratio" ist das Verhältnis der skalaren
+    Multiplikationen. Dazu kommt der Ausdruck a*b + c*2 - d.
+    """
+    rng = np.random.default_rng(2)
+    chains = {
+        "1000-10-1000-10-1000-5": [1000, 10, 1000, 10, 1000, 5],
+        "5-1000-5-1000-5-1000": [5, 1000, 5, 1000, 5, 1000],
+        "2000-2-2000-2000-2": [2000, 2, 2000, 2000, 2],
+        "random 12": list(rng.integers(2, 600, 13)),
+    }
+    print(f"{'chain':>24} {'eager':>10} {'lazy':>10} {'mult ratio':>11}")
+    for name, dims in chains.items():
+        factors = [Matrix(rng.random((dims[i], dims[i+1]))) for i in range(len(dims)-1)]
+
+        def eager():
+            res = factors[0]
+            for m in factors[1:]:
+                res = res*m
+            return res
+
+        with lazy_evaluation():
+            expr = eager()
+        eager_cost = sum(dims[0]*dims[i]*dims[i+1] for i in range(1, len(dims)-1))
+        np.testing.assert_allclose(expr.evaluate().matrix, eager().matrix, rtol=1e-8)
+        print(f"{name:>24} {best_time(eager):>10.5f} {best_time(expr.evaluate):>10.5f} "
+              f"{eager_cost/expr.multiplication_cost():>11.1f}")
+
+    n = 1500
+    a, b, c, d = (Matrix(rng.random((n, n))) for i in range(4))
+    with lazy_evaluation():
+        expr = a*b + c*2 - d
+    t_eager = best_time(lambda: a*b + c*2 - d)
+    t_lazy = best_time(expr.evaluate)
+    print(f"a*b + c*2 - d (n={n}): eager {t_eager:.5f}s "
+          f"{peak_memory(lambda: a*b + c*2 - d):.1f} MB, "
+          f"lazy {t_lazy:.5f}s {peak_memory(expr.evaluate):.1f} MB")
+
+
+def bench_rref():
+    """Vergleiche gaussian_elimination() mit der RREF von row_echelon().
+
+    gaussian_elimination() arbeitet zeilenweise mit swap_rows() und
+    add_to_row() auf einer Kopie und erreicht nur die Stufenform,
+    row_echelon() rechnet die vollständige reduzierte Form mit einer
+    Rang-1-Aktualisierung pro Spalte. Dazu kommt der Rang von
+    Matrizen mit Rangdefekt (n x 2n, Rang n/2).
+    """
+    rng = np.random.default_rng(3)
+    print(f"{'n':>6} {'gauss':>10} {'rref':>10} {'rank n x 2n':>12} {'rank':>6}")
+    for n in [50, 100, 200, 400]:
+        a = Matrix(rng.random((n, n)))
+        low = Matrix(rng.random((n, n//2))@rng.random((n//2, 2*n)))
+        t_gauss = best_time(lambda: Matrix(a).gaussian_elimination(), 1) \
+            if n <= 200 else float('nan')
+        t_rref = best_time(a.row_echelon)
+        t_rank = best_time(low.rank)
+        print(f"{n:>6} {t_gauss:>10.5f} {t_rref:>10.5f} {t_rank:>12.5f} {low.rank():>6}")
+
+
+BENCHMARKS = {
+    "matmul": bench_matmul,
+    "sparse": bench_sparse,
+    "inplace": bench_inplace,
+    "lazy": bench_lazy,
+    "rref": bench_rref,
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"### {name}")
+        BENCHMARKS[name]()
+        print()
@@ -1,5 +1,6 @@
 import numpy as np
 import math
+import contextlib
 
 
 
@@ -169,6 +170,391 @@ class Vector:
 
 ### SOLUTION END
 
+# Viele Vektoren gleicher Dimension auf einmal verarbeiten
+
+class VectorBatch:
+    """
+    N Vektoren der Dimension d in einem zusammenhängenden
+    (N,d)-Array. Die Operationen entsprechen denen von Vector, werden
+    aber für alle Vektoren gleichzeitig (zeilenweise) ausgeführt.
+    Ergebnisse, die bei Vector Skalare sind, sind hier Arrays der
+    Länge N.
+
+    Überall wo ein VectorBatch erwartet wird, kann auch ein einzelner
+    Vector stehen, der dann mit allen Vektoren verknüpft wird.
+    """
+    def __init__(self, data):
+        if isinstance(data, VectorBatch):
+            data = data.vecs
+        self.vecs = np.ascontiguousarray(data, dtype='float64')
+        if self.vecs.ndim != 2:
+            raise VectorError("Data for a vector batch must be two-dimensional")
+
+    @staticmethod
+    def from_vectors(vectors):
+        """Erzeuge einen VectorBatch aus einer Liste von Vektoren.
+        """
+        if len(vectors) == 0:
+            raise VectorError("Cannot build a batch from no vectors")
+        if len(set(len(v) for v in vectors)) != 1:
+            raise VectorError("All vectors need to be the same length")
+        return VectorBatch(np.stack([v.vec for v in vectors]))
+
+    def to_vectors(self):
+        """Wandle in eine Liste von Vektoren um.
+        """
+        return [Vector(row) for row in self.vecs]
+
+    def __len__(self):
+        """
+        Anzahl der Vektoren (nicht deren Dimension).
+        """
+        return self.vecs.shape[0]
+
+    def get_dim(self):
+        """
+        Dimension der einzelnen Vektoren.
+        """
+        return self.vecs.shape[1]
+
+    def __getitem__(self, key):
+        """
+        Einzelner Vektor (bei ganzzahligem Index) oder Teil-Batch.
+        """
+        if isinstance(key, (int, np.integer)):
+            return Vector(self.vecs[key])
+        return VectorBatch(self.vecs[key])
+
+    def __eq__(self, other):
+        if type(self)!=type(other):
+            return False
+        return np.array_equal(self.vecs, other.vecs)
+
+    def __str__(self):
+        return "\n".join(str(v) for v in self.to_vectors())
+
+    def __repr__(self):
+        return "VectorBatch("+str(self.vecs)+")"
+
+    def _operand(self, other):
+        """Array für den zweiten Operanden, passend zum Broadcasting.
+        """
+        if isinstance(other, Vector):
+            if len(other) != self.get_dim():
+                raise VectorError("Both arguments need to be the same length")
+            return other.vec
+        if isinstance(other, VectorBatch):
+            if other.vecs.shape != self.vecs.shape:
+                raise VectorError("Both batches need to be the same shape")
+            return other.vecs
+        raise VectorError("Argument needs to be a vector or a vector batch")
+
+    def __neg__(self):
+        return VectorBatch(-self.vecs)
+
+    def __add__(self, other):
+        return VectorBatch(self.vecs + self._operand(other))
+
+    def __sub__(self, other):
+        return VectorBatch(self.vecs - self._operand(other))
+
+    def skalar_multiplication(self, skalar):
+        """Skaliere alle Vektoren.
+
+        skalar ist eine Zahl oder ein Array mit einem Skalar pro
+        Vektor.
+        """
+        skalar = np.asarray(skalar, dtype='float64')
+        if skalar.ndim == 1:
+            if len(skalar) != len(self):
+                raise VectorError("Need one scalar per vector")
+            skalar = skalar[:, np.newaxis]
+        return VectorBatch(self.vecs*skalar)
+
+    def __mul__(self, other):
+        """
+        Mit Vector oder VectorBatch: zeilenweises Skalarprodukt, sonst
+        Skalarmultiplikation.
+        """
+        if isinstance(other, (Vector, VectorBatch)):
+            return self.inner_product(other)
+        return self.skalar_multiplication(other)
+
+    def __rmul__(self, other):
+        return self*other
+
+    def inner_product(self, other):
+        """Zeilenweises Skalarprodukt.
+        """
+        other = self._operand(other)
+        if other.ndim == 1:
+            return self.vecs @ other
+        return np.einsum('ij,ij->i', self.vecs, other)
+
+    def norm(self):
+        """Euklidische Längen aller Vektoren.
+        """
+        return np.sqrt(np.einsum('ij,ij->i', self.vecs, self.vecs))
+
+    def is_zero(self):
+        """Welche Vektoren sind 0-Vektoren?
+        """
+        return ~np.any(self.vecs, axis=1)
+
+    def euclid_dist(self, other):
+        """Euklidische Abstände, zeilenweise.
+        """
+        diff = self.vecs - self._operand(other)
+        return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+    def manhattan_dist(self, other):
+        """Abstände in der Manhattan-Metrik, zeilenweise.
+        """
+        return np.abs(self.vecs - self._operand(other)).sum(axis=1)
+
+    def cosine_similarity(self, other):
+        """Kosinus-Ähnlichkeiten, zeilenweise.
+        """
+        other_vecs = self._operand(other)
+        other_norm = np.sqrt(np.einsum('...i,...i->...', other_vecs, other_vecs))
+        norms = self.norm()*other_norm
+        if np.any(norms == 0):
+            raise VectorError("Cosine similarity is only defined for two non-zero-vectors")
+        return self.inner_product(other)/norms
+
+
+# Abstandsmatrizen und nächste Nachbarn für Mengen von Vektoren
+
+# Speicherbudget (in Bytes) für einen Block der Abstandsmatrix
+DISTANCE_CHUNK_BYTES = 64*2**20
+# Bis zu dieser Dimension verwendet knn() einen k-d-Baum
+KDTREE_MAX_DIM = 10
+
+def _as_point_array(points):
+    """(N,d)-Array aus VectorBatch, Liste von Vektoren oder Array.
+    """
+    if isinstance(points, VectorBatch):
+        return points.vecs
+    if len(points) > 0 and isinstance(points[0], Vector):
+        return VectorBatch.from_vectors(points).vecs
+    res = np.asarray(points, dtype='float64')
+    if res.ndim != 2:
+        raise VectorError("Points must be given as a two-dimensional array")
+    return res
+
+def _distance_block(a, b, metric, b_sq=None):
+    """Abstände aller Zeilen von a zu allen Zeilen von b.
+
+    Metriken: "euclid", "manhattan" und "cosine" (Kosinus-Abstand,
+    also 1 - Kosinus-Ähnlichkeit).
+    """
+    if metric == "euclid":
+        # |a-b|² = |a|² + |b|² - 2ab, das Produkt läuft über BLAS
+        if b_sq is None:
+            b_sq = np.einsum('ij,ij->i', b, b)
+        a_sq = np.einsum('ij,ij->i', a, a)
+        res = a @ b.T
+        res *= -2
+        res += a_sq[:, np.newaxis]
+        res += b_sq[np.newaxis, :]
+        np.maximum(res, 0, out=res)
+        return np.sqrt(res, out=res)
+    if metric == "manhattan":
+        # Differenzen als (Zeilen,Nb,d)-Block, so viele Zeilen wie ins
+        # Speicherbudget passen
+        res = np.empty((a.shape[0], b.shape[0]))
+        rows = max(1, DISTANCE_CHUNK_BYTES//(8*max(1, b.size)))
+        for i in range(0, a.shape[0], rows):
+            diff = np.abs(a[i:i+rows, np.newaxis, :] - b[np.newaxis, :, :])
+            res[i:i+rows] = diff.sum(axis=2)
+        return res
+    if metric == "cosine":
+        norms = np.outer(np.linalg.norm(a, axis=1), np.linalg.norm(b, axis=1))
+        if np.any(norms == 0):
+            raise VectorError("Cosine similarity is only defined for two non-zero-vectors")
+        return 1 - (a @ b.T)/norms
+    raise VectorError(f"Unknown metric '{metric}'")
+
+def _chunk_rows(n_other, chunk_size):
+    """Anzahl Zeilen pro Block, so dass ein Block ins Budget passt.
+    """
+    if chunk_size is not None:
+        return max(1, chunk_size)
+    return max(1, DISTANCE_CHUNK_BYTES//(8*max(1, n_other)))
+
+def pairwise_distances_chunked(a, b=None, metric="euclid", chunk_size=None):
+    """Abstandsmatrix blockweise berechnen.
+
+    Liefert Paare (start, block), wobei block die Abstände der Zeilen
+    start bis start+len(block)-1 von a zu allen Zeilen von b enthält.
+    Es liegt immer nur ein Block im Speicher.
+    """
+    a = _as_point_array(a)
+    b = a if b is None else _as_point_array(b)
+    if a.shape[1] != b.shape[1]:
+        raise VectorError("Both point sets need to have the same dimension")
+    b_sq = np.einsum('ij,ij->i', b, b) if metric == "euclid" else None
+    rows = _chunk_rows(b.shape[0], chunk_size)
+    for start in range(0, a.shape[0], rows):
+        yield start, _distance_block(a[start:start+rows], b, metric, b_sq)
+
+def pairwise_distances(a, b=None, metric="euclid", chunk_size=None):
+    """Vollständige Abstandsmatrix zwischen zwei Punktmengen.
+
+    Ohne b werden die Abstände innerhalb von a berechnet.
+    """
+    blocks = [block for start, block in
+              pairwise_distances_chunked(a, b, metric, chunk_size)]
+    return np.concatenate(blocks)
+
+def _smallest_k(dist, k):
+    """Spaltenindizes der k kleinsten Werte jeder Zeile, aufsteigend.
+    """
+    if k < dist.shape[1]:
+        idx = np.argpartition(dist, k-1, axis=1)[:, :k]
+    else:
+        idx = np.broadcast_to(np.arange(dist.shape[1]), dist.shape)
+    part = np.take_along_axis(dist, idx, axis=1)
+    order = np.argsort(part, axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1), \
+        np.take_along_axis(idx, order, axis=1)
+
+
+class KDTree:
+    """
+    k-d-Baum für die Suche nach nächsten Nachbarn in niedrigen
+    Dimensionen (euklidische oder Manhattan-Metrik).
+
+    Jeder innere Knoten teilt seine Punkte am Median der Dimension mit
+    der größten Ausdehnung. Blätter enthalten bis zu leaf_size Punkte,
+    die vektorisiert verglichen werden.
+    """
+    def __init__(self, points, leaf_size=32):
+        self.points = _as_point_array(points)
+        self.leaf_size = leaf_size
+        self.index = np.arange(self.points.shape[0])
+        # Knoten als parallele Listen: Dimension und Wert der Teilung,
+        # Kinder (-1 bei Blättern) und Bereich in self.index
+        self.split_dim = []
+        self.split_val = []
+        self.left = []
+        self.right = []
+        self.start = []
+        self.end = []
+        self._build(0, self.points.shape[0])
+
+    def _new_node(self, start, end):
+        for attr in (self.split_dim, self.split_val, self.left, self.right):
+            attr.append(-1)
+        self.start.append(start)
+        self.end.append(end)
+        return len(self.start)-1
+
+    def _build(self, start, end):
+        node = self._new_node(start, end)
+        if end-start <= self.leaf_size:
+            return node
+        pts = self.points[self.index[start:end]]
+        dim = int(np.argmax(pts.max(axis=0)-pts.min(axis=0)))
+        mid = (end-start)//2
+        order = np.argpartition(pts[:, dim], mid)
+        self.index[start:end] = self.index[start:end][order]
+        self.split_dim[node] = dim
+        self.split_val[node] = self.points[self.index[start+mid], dim]
+        self.left[node] = self._build(start, start+mid)
+        self.right[node] = self._build(start+mid, end)
+        return node
+
+    def _query_point(self, q, k, metric):
+        best_d = np.full(k, np.inf)
+        best_i = np.full(k, -1)
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound > best_d[-1]:
+                continue
+            if self.left[node] == -1:
+                idx = self.index[self.start[node]:self.end[node]]
+                diff = self.points[idx]-q
+                if metric == "euclid":
+                    d = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+                else:
+                    d = np.abs(diff).sum(axis=1)
+                cand_d = np.concatenate((best_d, d))
+                cand_i = np.concatenate((best_i, idx))
+                order = np.argsort(cand_d, kind='stable')[:k]
+                best_d = cand_d[order]
+                best_i = cand_i[order]
+                continue
+            # Abstand zur Teilungsebene ist für beide Metriken eine
+            # untere Schranke - die nähere Seite zuerst durchsuchen
+            delta = q[self.split_dim[node]]-self.split_val[node]
+            near, far = (self.left[node], self.right[node]) if delta < 0 \
+                else (self.right[node], self.left[node])
+            stack.append((far, max(bound, abs(delta))))
+            stack.append((near, bound))
+        return best_d, best_i
+
+    def query(self, queries, k=1, metric="euclid"):
+        """Die k nächsten Nachbarn für jeden Anfragepunkt.
+
+        Gibt zwei (Nq,k)-Arrays mit Abständen und Indizes zurück,
+        jeweils aufsteigend nach Abstand sortiert.
+        """
+        if metric not in ("euclid", "manhattan"):
+            raise VectorError(f"KDTree does not support metric '{metric}'")
+        queries = _as_point_array(queries)
+        if queries.shape[1] != self.points.shape[1]:
+            raise VectorError("Both point sets need to have the same dimension")
+        k = min(k, self.points.shape[0])
+        dist = np.empty((queries.shape[0], k))
+        idx = np.empty((queries.shape[0], k), dtype=np.intp)
+        for i, q in enumerate(queries):
+            dist[i], idx[i] = self._query_point(q, k, metric)
+        return dist, idx
+
+
+def knn(data, queries, k=1, metric="euclid", method="auto", chunk_size=None):
+    """Suche die k nächsten Nachbarn aus data für jeden Anfragepunkt.
+
+    method ist "kdtree", "brute" oder "auto" (k-d-Baum bis zur
+    Dimension KDTREE_MAX_DIM, darüber vektorisierte Brute-Force-Suche).
+    Die Brute-Force-Suche arbeitet blockweise, der Speicherbedarf ist
+    durch chunk_size bzw. DISTANCE_CHUNK_BYTES beschränkt.
+
+    Gibt zwei (Nq,k)-Arrays mit Abständen und Indizes zurück.
+    """
+    data = _as_point_array(data)
+    queries = _as_point_array(queries)
+    if k < 1:
+        raise VectorError("k must be at least 1")
+    if method == "auto":
+        if data.shape[1] <= KDTREE_MAX_DIM and metric in ("euclid", "manhattan"):
+            method = "kdtree"
+        else:
+            method = "brute"
+    if method == "kdtree":
+        return KDTree(data).query(queries, k, metric)
+    if method != "brute":
+        raise VectorError(f"Unknown search method '{method}'")
+    k = min(k, data.shape[0])
+    dist = np.empty((queries.shape[0], k))
+    idx = np.empty((queries.shape[0], k), dtype=np.intp)
+    for start, block in pairwise_distances_chunked(queries, data, metric,
+                                                   chunk_size):
+        end = start+block.shape[0]
+        dist[start:end], idx[start:end] = _smallest_k(block, k)
+        if metric == "euclid":
+            # Die Zerlegung |a|²+|b|²-2ab verliert bei kleinen
+            # Abständen Stellen - für die gefundenen Nachbarn direkt
+            # nachrechnen
+            diff = data[idx[start:end]] - queries[start:end, np.newaxis, :]
+            exact = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+            order = np.argsort(exact, axis=1, kind='stable')
+            dist[start:end] = np.take_along_axis(exact, order, axis=1)
+            idx[start:end] = np.take_along_axis(idx[start:end], order, axis=1)
+    return dist, idx
+
 
 
 ###Aus Kapitel 5###
@@ -185,6 +571,97 @@ def zero_2d_array(m, n):
     return res.reshape(m,n)
 
 
+################################################################
+# Multiplikations-Backends für Matrix.matrix_mul(). Alle Backends
+# bekommen zwei kompatible 2d float64-Arrays und liefern ein neues
+# 2d-Array zurück.
+################################################################
+
+MATMUL_BLOCK_SIZE = 256
+# Ab dieser Dimension kachelt "auto". None heißt: nie automatisch
+# kacheln - mit OpenBLAS ist der direkte Aufruf bei allen gemessenen
+# Größen schneller (siehe bench_sciprotypes.py).
+MATMUL_TILED_THRESHOLD = None
+
+
+def matmul_naive(a, b):
+    """Referenz-Implementierung der Matrixmultiplikation.
+
+    Berechnet jedes Ergebnis-Element als Skalarprodukt von Zeile und
+    Spalte. Sehr langsam, aber leicht nachzuvollziehen - dient als
+    Vergleich für Tests und Benchmarks.
+    """
+    res = zero_2d_array(a.shape[0], b.shape[1])
+    for i in range(a.shape[0]):
+        for j in range(b.shape[1]):
+            res[i,j] = sum(a[i,:]*b[:,j])
+    return res
+
+def matmul_numpy(a, b, out=None):
+    """Matrixmultiplikation über NumPy (und damit BLAS).
+    """
+    return np.matmul(a, b, out=out)
+
+def matmul_tiled(a, b, block=None, out=None):
+    """Blockweise (gekachelte) Matrixmultiplikation.
+
+    Zerlegt beide Operanden in Kacheln der Größe block x block, die
+    in den Cache passen, und akkumuliert die Teilprodukte direkt im
+    Ergebnis-Array (oder in out, das sich nicht mit a oder b
+    überschneiden darf). Damit bleibt der Speicherbedarf für
+    Zwischenergebnisse auf eine Kachel beschränkt.
+    """
+    if block is None:
+        block = MATMUL_BLOCK_SIZE
+    m, k = a.shape
+    n = b.shape[1]
+    if out is None:
+        res = zero_2d_array(m, n)
+    else:
+        res = out
+        res[...] = 0
+    tmp = np.empty((min(block, m), min(block, n)), dtype='float64')
+    for i in range(0, m, block):
+        i_end = min(i+block, m)
+        for j in range(0, n, block):
+            j_end = min(j+block, n)
+            target = res[i:i_end, j:j_end]
+            part = tmp[:i_end-i, :j_end-j]
+            for p in range(0, k, block):
+                p_end = min(p+block, k)
+                np.matmul(a[i:i_end, p:p_end], b[p:p_end, j:j_end], out=part)
+                target += part
+    return res
+
+MATMUL_BACKENDS = {
+    "naive": matmul_naive,
+    "numpy": matmul_numpy,
+    "tiled": matmul_tiled,
+}
+
+# Backends, die direkt in ein vorgegebenes Array schreiben können
+MATMUL_OUT_BACKENDS = {matmul_numpy, matmul_tiled}
+
+def register_matmul_backend(name, func):
+    """Registriere ein weiteres Multiplikations-Backend.
+
+    func bekommt zwei 2d-Arrays und muss deren Produkt zurückgeben.
+    """
+    MATMUL_BACKENDS[name] = func
+
+def select_matmul_backend(m, k, n):
+    """Wähle automatisch ein Backend für ein (m,k)x(k,n)-Produkt.
+
+    Unterhalb der Schwelle MATMUL_TILED_THRESHOLD wird direkt BLAS
+    aufgerufen, darüber wird gekachelt, damit die Zwischenergebnisse
+    im Cache bleiben.
+    """
+    if MATMUL_TILED_THRESHOLD is not None and \
+       max(m, k, n) >= MATMUL_TILED_THRESHOLD:
+        return "tiled"
+    return "numpy"
+
+
 
 
 
@@ -192,7 +669,13 @@ class Matrix:
     """
     Diese Klasse repräsentiert einfache Vektoren.
     """
-    def __init__(self, data):
+    # Standard-Backend für matrix_mul(), siehe MATMUL_BACKENDS
+    matmul_backend = "auto"
+    # Mit True bauen +, - und * Ausdrücke auf (siehe MatrixExpr), die
+    # erst mit evaluate() berechnet werden; siehe auch lazy_evaluation()
+    lazy_mode = False
+
+    def __init__(self, data, copy=True):
         """Konstruktor der Matrix-Klasse
 
         Wir stützen uns auf np.ndarray(). Um die üblichen
@@ -200,11 +683,18 @@ class Matrix:
         [0..m-1] und [0..n-1]. Das muss bei allen Algorithmen
         berücksichtigt werden, spielt aber zum Glück nirgendwo
         eine große Rolle.
+
+        Mit copy=False wird ein float64-Array (oder das einer anderen
+        Matrix) nicht kopiert, sondern mitbenutzt. Die neue Matrix ist
+        dann eine Sicht (view) auf dieselben Daten.
         """
         if(type(data)==type(self)):
             data = data.matrix
         try:
-            self.matrix = np.array(data, dtype='float64')
+            if copy:
+                self.matrix = np.array(data, dtype='float64')
+            else:
+                self.matrix = np.asarray(data, dtype='float64')
         except ValueError:
             raise MatrixError("Data for a matrix must be compatible with a 2d float64 ndaary, e.g. a list of lists of integers")
         if self.matrix.ndim != 2:
@@ -212,8 +702,13 @@ class Matrix:
 
     def __eq__(self, other):
          """
-         Teste, ob zwei Matrizen gleich sind.
+         Teste, ob zwei Matrizen gleich sind. Eine dünne Matrix wird
+         mit ihrer dichten Form verglichen.
          """
+         if isinstance(other, SparseMatrix):
+             other = other.to_dense()
+         if not isinstance(other, Matrix):
+             return False
          return np.array_equal(self.matrix, other.matrix)
 
     def __str__(self):
@@ -276,9 +771,17 @@ class Matrix:
 
     def transpose(self):
         """Berechne die transponierte Matrix.
+
+        Das Ergebnis ist eine Sicht auf dieselben Daten, es wird nichts
+        kopiert. Änderungen an der einen Matrix sind in der anderen
+        sichtbar, eine unabhängige Matrix liefert transpose().copy().
+        """
+        return Matrix(self.matrix.T, copy=False)
+
+    def copy(self):
+        """Unabhängige Kopie (auch von einer Sicht).
         """
-        res = [self.get_col_view(i) for i in range(self.get_col_no())]
-        return Matrix(res)
+        return Matrix(self.matrix.copy(), copy=False)
 
 ### SOLUTION END
 
@@ -291,52 +794,164 @@ class Matrix:
         if self.get_type() != other.get_type():
             raise MatrixError("Both arguments need to be the same type")
 
+    @staticmethod
+    def _target(out, shape):
+        """Array, in das ein Ergebnis vom Typ shape geschrieben wird:
+        None für eine neue Matrix, sonst out.matrix.
+        """
+        if out is None:
+            return None
+        if type(out)!=Matrix or out.get_type()!=shape:
+            raise MatrixError("Output needs to be a matrix of type "+str(shape))
+        return out.matrix
+
+    @staticmethod
+    def _result(res, out):
+        return Matrix(res, copy=False) if out is None else out
+
+    def negate(self, out=None):
+        """Negation, Ergebnis in out (falls angegeben).
+        """
+        res = np.negative(self.matrix, out=self._target(out, self.get_type()))
+        return self._result(res, out)
+
+    def add(self, other, out=None):
+        """Komponentenweise Addition, Ergebnis in out (falls angegeben).
+
+        out ist eine Matrix passenden Typs, darf auch self oder other
+        sein. So lassen sich Ausdrücke ohne Zwischenergebnisse
+        berechnen, z.B. a.add(b, out=r).subtract(c, out=r).
+        """
+        self.check_type(other)
+        res = np.add(self.matrix, other.matrix, out=self._target(out, self.get_type()))
+        return self._result(res, out)
+
+    def subtract(self, other, out=None):
+        """Komponentenweise Subtraktion, Ergebnis in out (falls angegeben).
+        """
+        self.check_type(other)
+        res = np.subtract(self.matrix, other.matrix, out=self._target(out, self.get_type()))
+        return self._result(res, out)
+
     def __neg__(self):
         """
         Negiere die Matrix, d.h. berechne das inverse Element in
         Bezug auf die Addition.
         """
-        return Matrix(self.matrix*-1)
+        if self.lazy_mode:
+            return -self.lazy()
+        return self.negate()
 
     def __add__(self, other):
         """
         Matrizen werden komponentenweise addiert.
         """
-        self.check_type(other)
-        return Matrix(self.matrix+other.matrix)
+        if isinstance(other, SparseMatrix):
+            return other+self
+        if isinstance(other, MatrixExpr) or self.lazy_mode:
+            return self.lazy()+other
+        return self.add(other)
 
     def __sub__(self, other):
         """
-        Subtraktion ist einfach Addition mit der negierten Matrix.
+        Komponentenweise Subtraktion (ohne negierte Zwischenmatrix).
         """
-        self.check_type(other)
-        return self+ -other
+        if isinstance(other, SparseMatrix):
+            return -other+self
+        if isinstance(other, MatrixExpr) or self.lazy_mode:
+            return self.lazy()-other
+        return self.subtract(other)
 
-    def skalar_multiplication(self, skalar):
+    def __iadd__(self, other):
+        """
+        a += b ändert a direkt, ohne eine neue Matrix anzulegen. Ist a
+        eine Sicht, ändert sich auch die zugrunde liegende Matrix.
+        """
+        if isinstance(other, SparseMatrix):
+            other.check_type(self)
+            self.matrix[other._row_ids(), other.indices] += other.data
+            return self
+        return self.add(other, out=self)
+
+    def __isub__(self, other):
+        """
+        a -= b ändert a direkt.
+        """
+        if isinstance(other, SparseMatrix):
+            other.check_type(self)
+            self.matrix[other._row_ids(), other.indices] -= other.data
+            return self
+        return self.subtract(other, out=self)
+
+    def __imul__(self, other):
+        """
+        a *= s mit einem Skalar ändert a direkt. Bei a *= b mit einer
+        Matrix muss b quadratisch sein, damit a seinen Typ behält; das
+        Produkt wird dann in a zurückgeschrieben.
+        """
+        if type(other) in [type(1), type(1.0)]:
+            return self.skalar_multiplication(other, out=self)
+        if isinstance(other, SparseMatrix):
+            other = other.to_dense()
+        if type(other)==type(self):
+            return self.matrix_mul(other, out=self)
+        raise MatrixError
+
+    def skalar_multiplication(self, skalar, out=None):
         """Multiplikation zwischen Skalar und Matrix
 
-        Multiplikation zwischen Vektor und Skalar.
+        Multiplikation zwischen Vektor und Skalar, Ergebnis in out
+        (falls angegeben).
         """
-        return Matrix(self.matrix*skalar)
+        res = np.multiply(self.matrix, skalar, out=self._target(out, self.get_type()))
+        return self._result(res, out)
 
-    def matrix_mul(self,other):
+    def matrix_mul(self, other, backend=None, out=None):
         """Multipliziere zwei Matrizen.
+
+        backend ist einer der Namen aus MATMUL_BACKENDS ("numpy",
+        "tiled", "naive") oder "auto". Ohne Angabe wird
+        Matrix.matmul_backend verwendet. Mit out wird das Produkt in
+        diese Matrix geschrieben; überschneidet sie sich mit einem
+        Faktor, wird über ein Zwischenergebnis gerechnet.
         """
 
         if self.get_col_no()!=other.get_row_no():
             raise MatrixError("Matrices are not compatible for multiplication")
-        res = zero_2d_array(self.get_row_no(), other.get_col_no())
-        for i in range(self.get_row_no()):
-            for j in range(other.get_col_no()):
-                res[i,j] = sum(self.get_row_view(i)*other.get_col_view(j))
-        return Matrix(res)
+        if backend is None:
+            backend = self.matmul_backend
+        if backend == "auto":
+            backend = select_matmul_backend(self.get_row_no(),
+                                            self.get_col_no(),
+                                            other.get_col_no())
+        try:
+            func = MATMUL_BACKENDS[backend]
+        except KeyError:
+            raise MatrixError(f"Unknown multiplication backend '{backend}'")
+        target = self._target(out, (self.get_row_no(), other.get_col_no()))
+        if target is None:
+            return Matrix(func(self.matrix, other.matrix), copy=False)
+        if func in MATMUL_OUT_BACKENDS and \
+           not np.may_share_memory(target, self.matrix) and \
+           not np.may_share_memory(target, other.matrix):
+            func(self.matrix, other.matrix, out=target)
+        else:
+            target[...] = func(self.matrix, other.matrix)
+        return out
 
     def __mul__(self, other):
         """
         Multiplikation geht mit Skalar und Matrix.
         """
+        if self.lazy_mode and (type(other) in [type(1), type(1.0), type(self)] or
+                               isinstance(other, MatrixExpr)):
+            return self.lazy()*other
         if type(other)==type(self):
             return self.matrix_mul(other)
+        elif isinstance(other, SparseMatrix):
+            return Matrix(other._rmul_dense(self.matrix), copy=False)
+        elif isinstance(other, MatrixExpr):
+            return self.lazy()*other
         elif type(other) in [type(1), type(1.0)]:
             return self.skalar_multiplication(other)
         raise MatrixError
@@ -348,10 +963,43 @@ class Matrix:
         """
         return self*other
         
+    @staticmethod
+    def _as_slice(key, length):
+        """Einzelnen Index als Slice der Länge 1.
+        """
+        if isinstance(key, slice):
+            return key
+        i = range(length)[key]
+        return slice(i, i+1)
+
     def __getitem__(self, key):
+        """
+        a[i, j] ist das Element als Zahl. Mit Slices, z.B. a[1:3, :],
+        entsteht eine Sicht auf den Teilbereich ohne Kopie.
+        """
         key1, key2 = key
+        if isinstance(key1, slice) or isinstance(key2, slice):
+            key1 = self._as_slice(key1, self.get_row_no())
+            key2 = self._as_slice(key2, self.get_col_no())
+            return Matrix(self.matrix[key1, key2], copy=False)
         return self.matrix[key1, key2].item()
 
+    def __setitem__(self, key, value):
+        """
+        Setze ein Element oder (mit Slices) einen Teilbereich auf eine
+        Zahl oder die Werte einer passenden Matrix.
+        """
+        key1, key2 = key
+        if isinstance(value, Matrix):
+            value = value.matrix
+            if not (isinstance(key1, slice) and isinstance(key2, slice)):
+                key1 = self._as_slice(key1, self.get_row_no())
+                key2 = self._as_slice(key2, self.get_col_no())
+        try:
+            self.matrix[key1, key2] = value
+        except ValueError:
+            raise MatrixError("Value does not fit into the selected part of the matrix")
+
 ### SOLUTION END
 
 # Platz für Ihren Code (Aufgabe Determinatenberechnung)
@@ -364,7 +1012,7 @@ class Matrix:
         Erzeugt neue Matrix ohne den angegebenen Zeilenvektor.
         """
         sel=[x for x in range(self.get_row_no()) if x!=row]
-        return Matrix(self.matrix[sel, :])
+        return Matrix(self.matrix[sel, :], copy=False)
 
     def reduce_by_col(self, col):
         """Entferne eine Spalte.
@@ -372,28 +1020,17 @@ class Matrix:
         Erzeugt neue Matrix ohne den angegebenen Spaltenvektor.
         """
         sel=[x for x in range(self.get_col_no()) if x!=col]
-        return Matrix(self.matrix[:, sel])
+        return Matrix(self.matrix[:, sel], copy=False)
 
 
     def compute_determinant_simple(self):
         """Berechne Determinate
 
         Verwendet den Determinaten-Entwicklungssatz zunächst mit
-        fester Entwicklung nach der ersten Zeile.
+        fester Entwicklung nach der ersten Zeile. Die Unterdeterminanten
+        werden gemerkt, siehe determinant(method="cofactor").
         """
-        print(self)
-        if self.get_row_no()!=self.get_col_no():
-            raise MatrixError("Determinants are only defined on square matrices")
-
-        if self.get_row_no()==1:
-            return self.matrix[0,0]
-        row0 = self.get_row_view(0)
-        rest = self.reduce_by_row(0)
-        res = 0
-        for i in range(self.get_col_no()):
-            submatrix = rest.reduce_by_col(i)
-            res += ((-1)**i)*row0[i]*submatrix.compute_determinant_simple()
-        return res
+        return self.determinant("cofactor")
 
 ### SOLUTION END
 
@@ -481,4 +1118,1189 @@ class Matrix:
         sign = self.gaussian_elimination()
         return sign*self.main_diag_product()
 
-### SOLUTION END
\ No newline at end of file
+### SOLUTION END
+
+# Determinante mit Auswahl des Verfahrens
+
+    def determinant(self, method="auto"):
+        """Berechne die Determinante.
+
+        method ist eines von
+        - "closed":   geschlossene Formeln für n <= 3
+        - "lu":       Gauß-Elimination über die LU-Zerlegung, O(n³)
+        - "bareiss":  exakter, bruchfreier Bareiss-Algorithmus für
+                      ganzzahlige Matrizen, Ergebnis ist ein int
+        - "cofactor": Entwicklungssatz mit gemerkten Unterdeterminanten
+        - "auto":     closed für n <= 3, bareiss für ganzzahlige,
+                      sonst lu
+
+        Mit "auto" ist das Ergebnis für ganzzahlige Matrizen immer ein
+        (exakter) int, sonst ein float.
+        """
+        if self.get_row_no()!=self.get_col_no():
+            raise MatrixError("Determinants are only defined on square matrices")
+        n = self.get_row_no()
+        if method == "auto":
+            if n <= 3:
+                method = "closed"
+            elif self.is_integer_valued():
+                method = "bareiss"
+            else:
+                method = "lu"
+        if method == "closed":
+            return self._determinant_closed()
+        if method == "lu":
+            return self.lu().det()
+        if method == "bareiss":
+            return self._determinant_bareiss()
+        if method == "cofactor":
+            return self._determinant_cofactor()
+        raise MatrixError(f"Unknown determinant method '{method}'")
+
+    def is_integer_valued(self):
+        """Sind alle Matrixelemente ganze Zahlen?
+        """
+        return bool(np.all(np.isfinite(self.matrix)) and
+                    np.all(self.matrix == np.round(self.matrix)))
+
+    def _determinant_closed(self):
+        """Geschlossene Formeln für 1x1, 2x2 und 3x3 (Regel von Sarrus).
+
+        Ganzzahlige Matrizen werden wie bei Bareiss exakt mit
+        Python-ints gerechnet, das Ergebnis ist dann ein int.
+        """
+        n = self.get_row_no()
+        if n > 3:
+            raise MatrixError("Closed formulas are only available for n <= 3")
+        a = self.matrix.tolist()
+        if self.is_integer_valued():
+            a = [[int(v) for v in row] for row in a]
+        if n == 1:
+            return a[0][0]
+        if n == 2:
+            return a[0][0]*a[1][1] - a[0][1]*a[1][0]
+        return (a[0][0]*a[1][1]*a[2][2] + a[0][1]*a[1][2]*a[2][0]
+                + a[0][2]*a[1][0]*a[2][1] - a[0][2]*a[1][1]*a[2][0]
+                - a[0][0]*a[1][2]*a[2][1] - a[0][1]*a[1][0]*a[2][2])
+
+    def _determinant_bareiss(self):
+        """Bruchfreie Elimination nach Bareiss.
+
+        Alle Zwischenergebnisse sind ganze Zahlen (die Division durch
+        das vorherige Pivot-Element geht immer auf), gerechnet wird mit
+        Python-ints, damit nichts überläuft.
+        """
+        if not self.is_integer_valued():
+            raise MatrixError("Bareiss algorithm requires an integer matrix")
+        m = np.array([[int(x) for x in row] for row in self.matrix], dtype=object)
+        n = m.shape[0]
+        sign = 1
+        prev = 1
+        for k in range(n-1):
+            if m[k,k] == 0:
+                nonzero = np.nonzero(m[k+1:,k])[0]
+                if len(nonzero) == 0:
+                    return 0
+                pivot = k+1+nonzero[0]
+                m[[k, pivot], :] = m[[pivot, k], :]
+                sign = -sign
+            m[k+1:,k+1:] = (m[k+1:,k+1:]*m[k,k]
+                            - np.multiply.outer(m[k+1:,k], m[k,k+1:]))//prev
+            prev = m[k,k]
+        return sign*int(m[n-1,n-1])
+
+    def _determinant_cofactor(self):
+        """Entwicklungssatz nach der jeweils ersten Zeile.
+
+        Jede Unterdeterminante ist durch die Menge der verbleibenden
+        Spalten eindeutig bestimmt (die Zeilen ergeben sich aus deren
+        Anzahl). Diese Menge wird als Bitmaske kodiert und das Ergebnis
+        gemerkt - statt O(n!) gibt es nur 2^n verschiedene
+        Unterdeterminanten.
+        """
+        a = self.matrix.tolist()
+        n = len(a)
+        memo = {0: 1}
+
+        def minor(mask):
+            if mask in memo:
+                return memo[mask]
+            row = a[n - bin(mask).count("1")]
+            res = 0
+            sign = 1
+            for j in range(n):
+                if mask & (1 << j):
+                    res += sign*row[j]*minor(mask & ~(1 << j))
+                    sign = -sign
+            memo[mask] = res
+            return res
+
+        return minor((1 << n) - 1)
+
+# LU-Zerlegung für wiederholtes Lösen von Gleichungssystemen
+
+    def lu(self):
+        """LU-Zerlegung mit Zeilenpivotisierung.
+
+        Gibt ein LUDecomposition-Objekt zurück, mit dem beliebig viele
+        rechte Seiten in O(n²) gelöst werden können. Die Matrix selbst
+        bleibt unverändert.
+        """
+        return LUDecomposition(self)
+
+# Reduzierte Zeilenstufenform, Rang und Unterräume
+
+    def row_echelon(self, tol=None):
+        """Reduzierte Zeilenstufenform (RREF) mit Pivotspalten.
+
+        Gibt ein RowEchelonForm-Objekt zurück, funktioniert auch für
+        nicht quadratische Matrizen und solche mit abhängigen Zeilen.
+        Einträge mit Betrag <= tol gelten als 0. Die Matrix selbst
+        bleibt unverändert.
+        """
+        return RowEchelonForm(self, tol)
+
+    def rref(self, tol=None):
+        """Reduzierte Zeilenstufenform als neue Matrix.
+        """
+        return self.row_echelon(tol).get_rref()
+
+    def rank(self, tol=None):
+        """Rang der Matrix (Anzahl der Pivotspalten).
+        """
+        return self.row_echelon(tol).rank()
+
+    def nullspace(self, tol=None):
+        """Basis des Kerns {x | A*x = 0} als Spalten einer Matrix.
+        """
+        return self.row_echelon(tol).nullspace()
+
+    def column_space(self, tol=None):
+        """Basis des Spaltenraums (die Pivotspalten von A).
+        """
+        return self.row_echelon(tol).column_space()
+
+    def solve_least_squares(self, b, tol=None):
+        """Minimiere |A*x - b| (bei mehreren Lösungen die kürzeste).
+        """
+        return self.row_echelon(tol).solve_least_squares(b)
+
+    def lazy(self):
+        """Ausdruck für verzögerte Auswertung, siehe MatrixExpr.
+
+        Mit a.lazy()*b*c + d rechnet erst evaluate(). Die Matrix wird
+        nicht kopiert, sondern beim Auswerten gelesen.
+        """
+        return MatrixExpr._leaf(self.matrix)
+
+    def to_sparse(self):
+        """Umwandlung in eine dünn besetzte Matrix (CSR).
+        """
+        return SparseMatrix(self)
+
+
+class LUDecomposition:
+    """
+    LU-Zerlegung P*A = L*U einer quadratischen Matrix A.
+
+    L (untere Dreiecksmatrix mit Einsen auf der Diagonalen) und U
+    (obere Dreiecksmatrix) werden gemeinsam in einem Array gespeichert,
+    die Zeilenvertauschungen in einem Permutationsvektor.
+    """
+    def __init__(self, matrix):
+        """Berechne die Zerlegung.
+
+        Die Elimination läuft spaltenweise, jeder Schritt ist eine
+        einzige vektorisierte Rang-1-Aktualisierung der Restmatrix.
+        """
+        if matrix.get_row_no() != matrix.get_col_no():
+            raise MatrixError("LU decomposition is only defined for square matrices")
+        lu = np.array(matrix.matrix, dtype='float64')
+        n = lu.shape[0]
+        perm = np.arange(n)
+        sign = 1
+        singular = False
+        for k in range(n):
+            pivot = k + np.argmax(np.abs(lu[k:, k]))
+            if pivot != k:
+                lu[[k, pivot], :] = lu[[pivot, k], :]
+                perm[[k, pivot]] = perm[[pivot, k]]
+                sign = -sign
+            if lu[k, k] == 0:
+                # Ganze Restspalte ist 0 -> nichts zu eliminieren
+                singular = True
+                continue
+            lu[k+1:, k] /= lu[k, k]
+            lu[k+1:, k+1:] -= np.outer(lu[k+1:, k], lu[k, k+1:])
+        self.lu = lu
+        self.perm = perm
+        self.sign = sign
+        self.singular = singular
+
+    def get_l(self):
+        """Untere Dreiecksmatrix L.
+        """
+        return Matrix(np.tril(self.lu, -1) + np.eye(self.lu.shape[0]), copy=False)
+
+    def get_u(self):
+        """Obere Dreiecksmatrix U.
+        """
+        return Matrix(np.triu(self.lu), copy=False)
+
+    def get_p(self):
+        """Permutationsmatrix P mit P*A = L*U.
+        """
+        return Matrix(np.eye(self.lu.shape[0])[self.perm], copy=False)
+
+    def det(self):
+        """Determinante als Produkt der Diagonale von U.
+        """
+        return self.sign*np.prod(np.diag(self.lu)).item()
+
+    def _solve_array(self, b):
+        """Löse L*U*x = P*b für ein 1d- oder 2d-Array b.
+
+        Vorwärts- und Rückwärtseinsetzen kosten je O(n²) pro rechter
+        Seite, bei 2d-Arrays werden alle Spalten gleichzeitig gelöst.
+        """
+        if self.singular:
+            raise MatrixError("Matrix is singular")
+        n = self.lu.shape[0]
+        if b.shape[0] != n:
+            raise MatrixError("Right-hand side does not match the matrix")
+        y = np.array(b[self.perm], dtype='float64')
+        for i in range(1, n):
+            y[i] -= self.lu[i, :i] @ y[:i]
+        for i in range(n-1, -1, -1):
+            y[i] -= self.lu[i, i+1:] @ y[i+1:]
+            y[i] /= self.lu[i, i]
+        return y
+
+    def solve(self, b):
+        """Löse A*x = b.
+
+        b kann ein Vector (oder eine Liste) sein, dann ist das Ergebnis
+        ein Vector. Ist b eine Matrix, wird für jede Spalte ein
+        Gleichungssystem gelöst und das Ergebnis als Matrix
+        zurückgegeben.
+        """
+        if isinstance(b, Matrix):
+            return Matrix(self._solve_array(b.matrix), copy=False)
+        if isinstance(b, Vector):
+            b = b.vec
+        b = np.asarray(b, dtype='float64')
+        if b.ndim == 2:
+            return Matrix(self._solve_array(b), copy=False)
+        return Vector(self._solve_array(b))
+
+    def inverse(self):
+        """Inverse Matrix durch Lösen von A*X = E.
+        """
+        return Matrix(self._solve_array(np.eye(self.lu.shape[0])), copy=False)
+
+
+class RowEchelonForm:
+    """
+    Reduzierte Zeilenstufenform R einer beliebigen mxn-Matrix A.
+
+    Die Elimination läuft spaltenweise auf einer einzigen Arbeitskopie:
+    In jeder Spalte wird das betragsgrößte Element unterhalb der
+    bisherigen Pivotzeilen gesucht. Ist es nicht größer als tol, wird
+    die Spalte übersprungen (keine Pivotspalte), sonst wird die Zeile
+    normiert und die Spalte in allen anderen Zeilen mit einer
+    vektorisierten Rang-1-Aktualisierung eliminiert. Die Pivotspalten
+    werden in pivots festgehalten.
+    """
+    def __init__(self, matrix, tol=None):
+        """Berechne die Zeilenstufenform von matrix.
+
+        Ohne tol wird 10*max(m,n)*eps*|A| mit der Zeilensummennorm |A|
+        verwendet: In der Größenordnung max(m,n)*eps*|A| liegen die
+        Rundungsfehler der Elimination, der Faktor 10 lässt Reserve für
+        das Fehlerwachstum über viele Schritte.
+        """
+        work = np.array(matrix.matrix, dtype='float64')
+        m, n = work.shape
+        if tol is None:
+            norm = np.abs(work).sum(axis=1).max() if work.size else 0.0
+            tol = 10*max(m, n)*np.finfo('float64').eps*norm
+        pivots = []
+        row = 0
+        for col in range(n):
+            if row == m:
+                break
+            candidates = np.abs(work[row:, col])
+            pivot = row+np.argmax(candidates)
+            if candidates[pivot-row] <= tol:
+                # Keine Pivotspalte, Reste sind Rundungsfehler
+                work[row:, col] = 0
+                continue
+            if pivot != row:
+                work[[row, pivot], col:] = work[[pivot, row], col:]
+            work[row, col:] /= work[row, col]
+            factors = work[:, col].copy()
+            factors[row] = 0
+            work[:, col:] -= np.outer(factors, work[row, col:])
+            work[:, col] = 0
+            work[row, col] = 1
+            pivots.append(col)
+            row += 1
+        work[row:, :] = 0
+        # A wird für column_space() und solve_least_squares() gebraucht,
+        # aber nie verändert
+        self.matrix = matrix.matrix
+        self.rref = work
+        self.pivots = pivots
+        self.tol = tol
+
+    def get_rref(self):
+        """Die reduzierte Zeilenstufenform als Matrix.
+        """
+        return Matrix(self.rref)
+
+    def rank(self):
+        """Rang = Anzahl der Pivotspalten.
+        """
+        return len(self.pivots)
+
+    def free_columns(self):
+        """Spalten ohne Pivot (freie Variablen).
+        """
+        pivots = set(self.pivots)
+        return [j for j in range(self.rref.shape[1]) if j not in pivots]
+
+    def _nullspace_array(self):
+        n = self.rref.shape[1]
+        free = self.free_columns()
+        basis = np.zeros((n, len(free)))
+        # Freie Variable j = 1, die Pivotvariablen aus R*x = 0
+        basis[free, np.arange(len(free))] = 1
+        basis[self.pivots, :] = -self.rref[:self.rank()][:, free]
+        return basis
+
+    def nullspace(self):
+        """Basis des Kerns als Spalten einer nx(n-r)-Matrix.
+        """
+        return Matrix(self._nullspace_array(), copy=False)
+
+    def column_space(self):
+        """Basis des Spaltenraums: die Pivotspalten von A (mxr-Matrix).
+        """
+        return Matrix(self.matrix[:, self.pivots], copy=False)
+
+    def solve_least_squares(self, b):
+        """Lösung x mit minimalem |A*x - b|, unter allen solchen die
+        mit minimaler Länge.
+
+        Die Pivotspalten A_p sind linear unabhängig, darauf wird das
+        Ausgleichsproblem über eine QR-Zerlegung gelöst (ohne die
+        Kondition wie bei A^T*A zu quadrieren). Bei Rang < n wird
+        danach der Anteil im Kern abgezogen. b kann ein Vector (oder
+        eine Liste) sein, dann ist das Ergebnis ein Vector, bei einer
+        Matrix wird jede Spalte gelöst.
+        """
+        as_matrix = isinstance(b, Matrix)
+        if as_matrix:
+            b = b.matrix
+        elif isinstance(b, Vector):
+            b = b.vec
+        b = np.asarray(b, dtype='float64')
+        m, n = self.matrix.shape
+        if b.ndim not in (1, 2) or b.shape[0] != m:
+            raise MatrixError("Right-hand side does not match the matrix")
+        x = np.zeros((n,)+b.shape[1:])
+        if self.pivots:
+            q, r = np.linalg.qr(self.matrix[:, self.pivots])
+            x[self.pivots] = np.linalg.solve(r, q.T @ b)
+        null = self._nullspace_array()
+        if null.shape[1] > 0:
+            x -= null @ np.linalg.solve(null.T @ null, null.T @ x)
+        if as_matrix or b.ndim == 2:
+            return Matrix(x, copy=False)
+        return Vector(x)
+
+
+# Dünn besetzte Matrizen
+
+def _coo_to_csr(rows, cols, values, shape):
+    """CSR-Arrays (indptr, indices, data) aus Koordinaten-Listen.
+
+    Einträge an derselben Position werden addiert, Nullen entfernt,
+    die Spalten jeder Zeile sind danach aufsteigend sortiert.
+    """
+    m, n = shape
+    rows = np.asarray(rows, dtype=np.int64).reshape(-1)
+    cols = np.asarray(cols, dtype=np.int64).reshape(-1)
+    values = np.asarray(values, dtype='float64').reshape(-1)
+    if not len(rows) == len(cols) == len(values):
+        raise MatrixError("Rows, columns and values need to be the same length")
+    if np.any((rows < 0) | (rows >= m) | (cols < 0) | (cols >= n)):
+        raise MatrixError("Index out of range for a matrix of type "+str(shape))
+    # Position als eine Zahl, stabil sortiert gehen Duplikate nicht
+    # durcheinander
+    key = rows*n+cols
+    order = np.argsort(key, kind='stable')
+    key, values = key[order], values[order]
+    if len(key) > 0:
+        first = np.flatnonzero(np.concatenate(([True], key[1:] != key[:-1])))
+        values = np.add.reduceat(values, first)
+        key = key[first]
+    keep = values != 0
+    key, values = key[keep], values[keep]
+    indptr = np.zeros(m+1, dtype=np.int64)
+    if n > 0:
+        np.cumsum(np.bincount(key//n, minlength=m), out=indptr[1:])
+        return indptr, key % n, values
+    return indptr, key, values
+
+
+class SparseMatrix:
+    """
+    Dünn besetzte Matrix im CSR-Format (compressed sparse row).
+
+    Gespeichert werden nur die Elemente ungleich 0: data enthält die
+    Werte zeilenweise, indices die Spalte jedes Werts und indptr den
+    Beginn jeder Zeile, Zeile i steht also in
+    data[indptr[i]:indptr[i+1]]. Innerhalb einer Zeile sind die Spalten
+    aufsteigend sortiert und jede Position kommt höchstens einmal vor.
+
+    Die Operationen entsprechen denen von Matrix. Ergebnisse, die
+    dünn besetzt bleiben (Summe und Produkt dünner Matrizen,
+    Transponierte), sind wieder SparseMatrix, mit einer dichten Matrix
+    verknüpft entsteht eine Matrix, mit einem Vector ein Vector.
+    """
+    def __init__(self, data):
+        """Dünne Matrix aus einer dichten Matrix, einem Vector (als
+        Spalte), einer Liste von Listen oder einer SparseMatrix.
+        Größere Matrizen baut man mit COOBuilder oder from_coo() auf,
+        ohne dass eine dichte Matrix entsteht.
+        """
+        if isinstance(data, SparseMatrix):
+            self._set(data.indptr.copy(), data.indices.copy(), data.data.copy(), data.shape)
+            return
+        if isinstance(data, Matrix):
+            dense = data.matrix
+        elif isinstance(data, Vector):
+            dense = np.asarray(data.vec, dtype='float64').reshape(-1, 1)
+        else:
+            try:
+                dense = np.array(data, dtype='float64')
+            except ValueError:
+                raise MatrixError("Data for a matrix must be compatible with a 2d float64 ndaary, e.g. a list of lists of integers")
+        if dense.ndim != 2:
+            raise MatrixError("Data for a matrix must be two-dimensional only")
+        rows, cols = np.nonzero(dense)
+        indptr = np.zeros(dense.shape[0]+1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=dense.shape[0]), out=indptr[1:])
+        self._set(indptr, cols.astype(np.int64), dense[rows, cols], dense.shape)
+
+    def _set(self, indptr, indices, data, shape):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (int(shape[0]), int(shape[1]))
+
+    @staticmethod
+    def _from_csr(indptr, indices, data, shape):
+        """SparseMatrix aus fertigen (kanonischen) CSR-Arrays.
+        """
+        res = SparseMatrix.__new__(SparseMatrix)
+        res._set(indptr, indices, data, shape)
+        return res
+
+    @staticmethod
+    def from_coo(rows, cols, values, shape):
+        """SparseMatrix aus Koordinaten: Element (rows[k], cols[k]) hat
+        den Wert values[k], mehrfach angegebene Positionen werden
+        addiert.
+        """
+        return SparseMatrix._from_csr(*_coo_to_csr(rows, cols, values, shape), shape)
+
+    @staticmethod
+    def identity(n):
+        """Einheitsmatrix der Dimension n.
+        """
+        return SparseMatrix._from_csr(np.arange(n+1, dtype=np.int64), np.arange(n, dtype=np.int64),
+                                      np.ones(n), (n, n))
+
+    def to_coo(self):
+        """Koordinaten (rows, cols, values) aller Elemente ungleich 0.
+        """
+        return self._row_ids(), self.indices.copy(), self.data.copy()
+
+    def to_dense(self):
+        """Umwandlung in eine (dichte) Matrix.
+        """
+        res = zero_2d_array(*self.shape)
+        res[self._row_ids(), self.indices] = self.data
+        return Matrix(res, copy=False)
+
+    def to_vector(self):
+        """Umwandlung einer Spalte (oder Zeile) in einen Vector.
+        """
+        if self.shape[1] != 1 and self.shape[0] != 1:
+            raise MatrixError("Only a single row or column can be converted to a vector")
+        return Vector(self.to_dense().matrix.reshape(-1))
+
+    def _row_ids(self):
+        """Zeilennummer jedes gespeicherten Elements.
+        """
+        return np.repeat(np.arange(self.shape[0], dtype=np.int64), np.diff(self.indptr))
+
+    def __eq__(self, other):
+        """
+        Teste, ob zwei dünne Matrizen gleich sind. Eine dichte Matrix
+        wird mit der dichten Form verglichen.
+        """
+        if isinstance(other, Matrix):
+            return self.to_dense() == other
+        if type(self)!=type(other):
+            return False
+        return (self.shape == other.shape and np.array_equal(self.indptr, other.indptr)
+                and np.array_equal(self.indices, other.indices)
+                and np.array_equal(self.data, other.data))
+
+    def __str__(self):
+        """Nutzer-freundliche Ausgabe: ein Element ungleich 0 pro Zeile.
+        """
+        entries = [f"({i}, {j})\t{v}" for i, j, v in
+                   zip(self._row_ids().tolist(), self.indices.tolist(), self.data.tolist())]
+        return "\n".join(entries)
+
+    def __repr__(self):
+        return f"SparseMatrix({self.shape[0]}x{self.shape[1]}, {self.nnz()} Elemente)"
+
+    def get_type(self):
+        """Typ ist (m,n) für eine mxn Matrix.
+        """
+        return self.shape
+
+    def get_row_no(self):
+        """Anzahl der Zeilen ('m')
+        """
+        return self.shape[0]
+
+    def get_col_no(self):
+        """Anzahl der Spalten ('n')
+        """
+        return self.shape[1]
+
+    def nnz(self):
+        """Anzahl der gespeicherten Elemente (alle ungleich 0).
+        """
+        return len(self.data)
+
+    def is_zero(self):
+        """Sind alle Matrixelemente 0?
+        """
+        return self.nnz() == 0
+
+    def __getitem__(self, key):
+        """Element (i, j), Suche in der sortierten Zeile i.
+        """
+        i, j = key
+        m, n = self.shape
+        if not (-m <= i < m and -n <= j < n):
+            raise IndexError("Index out of range for a matrix of type "+str(self.shape))
+        i, j = i % m, j % n
+        start, end = self.indptr[i], self.indptr[i+1]
+        pos = start+np.searchsorted(self.indices[start:end], j)
+        if pos < end and self.indices[pos] == j:
+            return self.data[pos].item()
+        return 0.0
+
+    def transpose(self):
+        """Berechne die transponierte Matrix (wieder im CSR-Format).
+        """
+        return SparseMatrix.from_coo(self.indices, self._row_ids(), self.data,
+                                     (self.shape[1], self.shape[0]))
+
+    def check_type(self, other):
+        if not isinstance(other, (SparseMatrix, Matrix)):
+            raise MatrixError("Both arguments need to be matrices")
+        if self.get_type() != other.get_type():
+            raise MatrixError("Both arguments need to be the same type")
+
+    def __neg__(self):
+        return SparseMatrix._from_csr(self.indptr.copy(), self.indices.copy(), -self.data, self.shape)
+
+    def _add(self, other, sign):
+        self.check_type(other)
+        if isinstance(other, Matrix):
+            res = np.array(other.matrix)*sign
+            res[self._row_ids(), self.indices] += self.data
+            return Matrix(res, copy=False)
+        rows, cols, values = other.to_coo()
+        return SparseMatrix.from_coo(np.concatenate((self._row_ids(), rows)),
+                                     np.concatenate((self.indices, cols)),
+                                     np.concatenate((self.data, sign*values)), self.shape)
+
+    def __add__(self, other):
+        """
+        Matrizen werden komponentenweise addiert. Mit einer dichten
+        Matrix ist das Ergebnis dicht.
+        """
+        return self._add(other, 1.0)
+
+    def __sub__(self, other):
+        """
+        Komponentenweise Subtraktion.
+        """
+        return self._add(other, -1.0)
+
+    def skalar_multiplication(self, skalar):
+        """Multiplikation zwischen Skalar und Matrix
+        """
+        if skalar == 0:
+            return SparseMatrix._from_csr(np.zeros(self.shape[0]+1, dtype=np.int64),
+                                          np.zeros(0, dtype=np.int64), np.zeros(0), self.shape)
+        return SparseMatrix._from_csr(self.indptr.copy(), self.indices.copy(),
+                                      self.data*skalar, self.shape)
+
+    def _mul_dense(self, b):
+        """Produkt mit einem dichten 1d- oder 2d-Array: Jede Zeile des
+        Ergebnisses ist die Summe der mit den Werten gewichteten
+        Zeilen von b.
+        """
+        if b.ndim == 1:
+            return np.bincount(self._row_ids(), weights=self.data*b[self.indices],
+                               minlength=self.shape[0])
+        res = zero_2d_array(self.shape[0], b.shape[1])
+        filled = np.flatnonzero(np.diff(self.indptr))
+        if len(filled) > 0:
+            res[filled] = np.add.reduceat(self.data[:, np.newaxis]*b[self.indices],
+                                          self.indptr[filled], axis=0)
+        return res
+
+    def _mul_sparse(self, other):
+        """Produkt zweier dünner Matrizen: Jedes Element a_ik trifft
+        alle Elemente b_kj der Zeile k, die Teilprodukte werden als
+        Koordinaten (i, j) gesammelt und zusammengefasst.
+        """
+        counts = np.diff(other.indptr)[self.indices]
+        total = int(counts.sum())
+        # Für jedes Teilprodukt: welches Element von self, welches von other
+        left = np.repeat(np.arange(self.nnz()), counts)
+        starts = np.repeat(other.indptr[self.indices]-(np.cumsum(counts)-counts), counts)
+        right = starts+np.arange(total)
+        return SparseMatrix.from_coo(self._row_ids()[left], other.indices[right],
+                                     self.data[left]*other.data[right],
+                                     (self.shape[0], other.shape[1]))
+
+    def matrix_mul(self, other):
+        """Multipliziere mit einer dünnen oder dichten Matrix.
+        """
+        if self.get_col_no()!=other.get_row_no():
+            raise MatrixError("Matrices are not compatible for multiplication")
+        if isinstance(other, SparseMatrix):
+            return self._mul_sparse(other)
+        return Matrix(self._mul_dense(other.matrix), copy=False)
+
+    def _rmul_dense(self, a):
+        """Produkt a*self mit einem dichten 2d-Array a.
+        """
+        if a.shape[1] != self.shape[0]:
+            raise MatrixError("Matrices are not compatible for multiplication")
+        return self.transpose()._mul_dense(a.T).T
+
+    def __mul__(self, other):
+        """
+        Multiplikation mit Skalar, Matrix, SparseMatrix oder Vector.
+        """
+        if isinstance(other, (SparseMatrix, Matrix)):
+            return self.matrix_mul(other)
+        if isinstance(other, Vector):
+            if self.get_col_no() != len(other):
+                raise MatrixError("Matrix and vector are not compatible for multiplication")
+            return Vector(self._mul_dense(np.asarray(other.vec, dtype='float64')))
+        if isinstance(other, (int, float, np.number)):
+            return self.skalar_multiplication(other)
+        raise MatrixError("Can only multiply with a number, a matrix or a vector")
+
+    def __rmul__(self, other):
+        """
+        Skalare können auch von vorne anmultipliziert werden.
+        """
+        return self*other
+
+    def diagonal(self):
+        """Hauptdiagonale als Array.
+        """
+        rows = self._row_ids()
+        on_diagonal = rows == self.indices
+        res = np.zeros(min(self.shape))
+        res[rows[on_diagonal]] = self.data[on_diagonal]
+        return res
+
+    def is_symmetric(self):
+        """Ist die Matrix gleich ihrer Transponierten?
+        """
+        return self == self.transpose()
+
+    def solve(self, b, method="auto", tol=1e-10, max_iter=None):
+        """Löse A*x = b iterativ, ohne A dicht zu speichern.
+
+        method ist
+        - "cg":       Verfahren der konjugierten Gradienten, nur für
+                      symmetrische positiv definite Matrizen
+        - "bicgstab": BiCGSTAB für beliebige reguläre Matrizen
+        - "auto":     cg für symmetrische, sonst bicgstab
+        Beide Verfahren verwenden die Diagonale als Vorkonditionierer
+        (Jacobi). Fertig ist die Iteration, wenn das Residuum
+        |b-A*x| höchstens tol*|b| ist. Ergebnis ist ein Vector.
+        """
+        if self.get_row_no() != self.get_col_no():
+            raise MatrixError("Can only solve systems with a square matrix")
+        if isinstance(b, Vector):
+            b = b.vec
+        b = np.asarray(b, dtype='float64')
+        if b.shape != (self.shape[0],):
+            raise MatrixError("Right-hand side does not match the matrix")
+        if max_iter is None:
+            max_iter = 10*max(1, self.shape[0])
+        if method == "auto":
+            method = "cg" if self.is_symmetric() else "bicgstab"
+        if method not in SPARSE_SOLVERS:
+            raise MatrixError(f"Unknown solver '{method}'")
+        diagonal = self.diagonal()
+        inv_diagonal = np.divide(1.0, diagonal, out=np.ones_like(diagonal), where=diagonal != 0)
+        x, converged = SPARSE_SOLVERS[method](self._mul_dense, b, inv_diagonal, tol, max_iter)
+        if not converged:
+            raise MatrixError(f"Solver '{method}' did not converge")
+        return Vector(x)
+
+
+def _solve_cg(mul, b, inv_diagonal, tol, max_iter):
+    """Vorkonditioniertes Verfahren der konjugierten Gradienten.
+    """
+    x = np.zeros_like(b)
+    limit = tol*np.linalg.norm(b)
+    r = b.copy()
+    if np.linalg.norm(r) <= limit:
+        return x, True
+    z = r*inv_diagonal
+    p = z.copy()
+    rz = r @ z
+    for i in range(max_iter):
+        ap = mul(p)
+        alpha = rz/(p @ ap)
+        x += alpha*p
+        r -= alpha*ap
+        if np.linalg.norm(r) <= limit:
+            return x, True
+        z = r*inv_diagonal
+        rz, rz_old = r @ z, rz
+        p *= rz/rz_old
+        p += z
+    return x, False
+
+
+def _solve_bicgstab(mul, b, inv_diagonal, tol, max_iter):
+    """BiCGSTAB (van der Vorst) mit Jacobi-Vorkonditionierung.
+    """
+    x = np.zeros_like(b)
+    limit = tol*np.linalg.norm(b)
+    r = b.copy()
+    if np.linalg.norm(r) <= limit:
+        return x, True
+    r0 = r.copy()
+    rho = alpha = omega = 1.0
+    v = np.zeros_like(b)
+    p = np.zeros_like(b)
+    for i in range(max_iter):
+        rho, rho_old = r0 @ r, rho
+        if rho == 0.0 or omega == 0.0:
+            return x, False
+        p = r+(rho/rho_old)*(alpha/omega)*(p-omega*v)
+        p_hat = p*inv_diagonal
+        v = mul(p_hat)
+        alpha = rho/(r0 @ v)
+        s = r-alpha*v
+        if np.linalg.norm(s) <= limit:
+            return x+alpha*p_hat, True
+        s_hat = s*inv_diagonal
+        t = mul(s_hat)
+        omega = (t @ s)/(t @ t)
+        x += alpha*p_hat+omega*s_hat
+        r = s-omega*t
+        if np.linalg.norm(r) <= limit:
+            return x, True
+    return x, False
+
+
+SPARSE_SOLVERS = {
+    "cg": _solve_cg,
+    "bicgstab": _solve_bicgstab,
+}
+
+
+class COOBuilder:
+    """
+    Baut eine SparseMatrix aus einzelnen Elementen auf (Koordinaten-
+    oder COO-Format), ohne dass eine dichte Matrix entsteht. Mehrfach
+    angegebene Positionen werden addiert, das ist z.B. beim
+    Zusammensetzen von Finite-Elemente-Matrizen praktisch.
+    """
+    def __init__(self, m, n):
+        self.shape = (m, n)
+        self._rows = []
+        self._cols = []
+        self._values = []
+        self._blocks = []
+
+    def add(self, row, col, value):
+        """Ein Element hinzufügen.
+        """
+        self._rows.append(row)
+        self._cols.append(col)
+        self._values.append(value)
+
+    def add_entries(self, rows, cols, values):
+        """Viele Elemente auf einmal hinzufügen (Arrays gleicher Länge).
+        """
+        self._blocks.append((np.asarray(rows), np.asarray(cols), np.asarray(values, dtype='float64')))
+
+    def build(self):
+        """Die fertige SparseMatrix (CSR).
+        """
+        blocks = self._blocks+[(np.array(self._rows, dtype=np.int64),
+                                np.array(self._cols, dtype=np.int64),
+                                np.array(self._values, dtype='float64'))]
+        return SparseMatrix.from_coo(np.concatenate([b[0] for b in blocks]),
+                                     np.concatenate([b[1] for b in blocks]),
+                                     np.concatenate([b[2] for b in blocks]), self.shape)
+
+
+# Verzögerte Auswertung von Matrix-Ausdrücken
+
+def matrix_chain_order(dims):
+    """Optimale Klammerung eines Matrix-Produkts A_0*A_1*...*A_{k-1}.
+
+    A_i hat den Typ (dims[i], dims[i+1]). Dynamische Programmierung
+    über alle Teilketten: cost[i][j] ist die minimale Anzahl von
+    Multiplikationen für A_i*...*A_j. Ergebnis ist (Kosten, Klammerung),
+    die Klammerung als verschachtelte Tupel von Indices, z.B.
+    ((0, 1), 2).
+    """
+    k = len(dims)-1
+    cost = [[0]*k for i in range(k)]
+    split = [[0]*k for i in range(k)]
+    for length in range(2, k+1):
+        for i in range(k-length+1):
+            j = i+length-1
+            best = None
+            for s in range(i, j):
+                c = cost[i][s]+cost[s+1][j]+dims[i]*dims[s+1]*dims[j+1]
+                if best is None or c < best:
+                    best, split[i][j] = c, s
+            cost[i][j] = best
+
+    def order(i, j):
+        if i == j:
+            return i
+        return (order(i, split[i][j]), order(split[i][j]+1, j))
+
+    return cost[0][k-1], order(0, k-1)
+
+
+@contextlib.contextmanager
+def lazy_evaluation():
+    """Kontext, in dem Matrix-Operatoren Ausdrücke aufbauen:
+
+        with lazy_evaluation():
+            expr = a*b + c*2 - d
+        result = expr.evaluate()
+    """
+    previous = Matrix.lazy_mode
+    Matrix.lazy_mode = True
+    try:
+        yield
+    finally:
+        Matrix.lazy_mode = previous
+
+
+class _BufferPool:
+    """Freie Zwischenergebnis-Arrays, nach Typ sortiert, damit eine
+    Auswertung nicht für jeden Schritt neuen Speicher anfordert.
+    """
+    def __init__(self):
+        self.free = {}
+
+    def get(self, shape):
+        buffers = self.free.get(shape)
+        if buffers:
+            return buffers.pop()
+        return np.empty(shape, dtype='float64')
+
+    def release(self, array):
+        self.free.setdefault(array.shape, []).append(array)
+
+
+class MatrixExpr:
+    """
+    Knoten eines Ausdrucksgraphen für Matrizen (verzögerte Auswertung).
+
+    Man erhält einen Ausdruck mit Matrix.lazy(). Die Operatoren +, -,
+    * und transpose() rechnen dann nicht, sondern bauen einen Graphen
+    auf, erst evaluate() liefert die Matrix. Dabei werden
+    - Produkte zu Ketten zusammengefasst und in der günstigsten
+      Reihenfolge multipliziert (siehe matrix_chain_order()),
+    - Summen, Differenzen und Skalare zu einer Linearkombination
+      zusammengefasst, die in einem einzigen Ergebnis-Array
+      aufsummiert wird,
+    - Zwischenergebnisse wiederverwendet, sobald sie nicht mehr
+      gebraucht werden.
+
+    Art des Knotens (kind):
+    - "leaf":    operands = [ndarray]
+    - "product": operands = Faktoren, coef = Skalar vor dem Produkt
+    - "sum":     operands = Summanden, coefs = Skalare der Summanden
+    """
+    def __init__(self, kind, shape, operands, coefs=None, coef=1.0):
+        self.kind = kind
+        self.shape = shape
+        self.operands = operands
+        self.coefs = coefs
+        self.coef = coef
+
+    @staticmethod
+    def _leaf(array):
+        return MatrixExpr("leaf", array.shape, [array])
+
+    @staticmethod
+    def _wrap(other):
+        if isinstance(other, MatrixExpr):
+            return other
+        if isinstance(other, Matrix):
+            return other.lazy()
+        raise MatrixError("Can only combine matrix expressions with matrices and numbers")
+
+    @staticmethod
+    def _linear(terms):
+        """Linearkombination sum(c*e), verschachtelte Summen und
+        Skalare vor Produkten werden in die Koeffizienten gezogen.
+        """
+        shape = terms[0][1].shape
+        operands, coefs = [], []
+        for c, e in terms:
+            if e.shape != shape:
+                raise MatrixError("Both arguments need to be the same type")
+            if e.kind == "sum":
+                operands.extend(e.operands)
+                coefs.extend(c*ci for ci in e.coefs)
+            elif e.kind == "product" and e.coef != 1.0:
+                operands.append(MatrixExpr("product", e.shape, e.operands))
+                coefs.append(c*e.coef)
+            else:
+                operands.append(e)
+                coefs.append(c)
+        return MatrixExpr("sum", shape, operands, coefs)
+
+    def __repr__(self):
+        if self.kind == "leaf":
+            return f"Matrix{self.shape}"
+        if self.kind == "product":
+            factors = "*".join(repr(e) for e in self.operands)
+            return factors if self.coef == 1.0 else f"{self.coef}*{factors}"
+        return "(" + " + ".join(f"{c}*{e!r}" for c, e in zip(self.coefs, self.operands)) + ")"
+
+    def get_type(self):
+        """Typ (m,n) der Matrix, die evaluate() liefern wird.
+        """
+        return self.shape
+
+    def __add__(self, other):
+        return MatrixExpr._linear([(1.0, self), (1.0, MatrixExpr._wrap(other))])
+
+    def __radd__(self, other):
+        return MatrixExpr._wrap(other)+self
+
+    def __sub__(self, other):
+        return MatrixExpr._linear([(1.0, self), (-1.0, MatrixExpr._wrap(other))])
+
+    def __rsub__(self, other):
+        return MatrixExpr._wrap(other)-self
+
+    def __neg__(self):
+        return self*-1.0
+
+    def __mul__(self, other):
+        """
+        Skalar oder Matrix(-Ausdruck), Produkte werden zu einer Kette
+        zusammengefasst.
+        """
+        if isinstance(other, (int, float, np.number)):
+            if self.kind == "product":
+                return MatrixExpr("product", self.shape, self.operands, coef=self.coef*other)
+            return MatrixExpr._linear([(float(other), self)])
+        other = MatrixExpr._wrap(other)
+        if self.shape[1] != other.shape[0]:
+            raise MatrixError("Matrices are not compatible for multiplication")
+        factors, coef = [], 1.0
+        for e in (self, other):
+            if e.kind == "product":
+                factors.extend(e.operands)
+                coef *= e.coef
+            else:
+                factors.append(e)
+        return MatrixExpr("product", (self.shape[0], other.shape[1]), factors, coef=coef)
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float, np.number)):
+            return self*other
+        return MatrixExpr._wrap(other)*self
+
+    def transpose(self):
+        """Transponierter Ausdruck, ohne etwas zu berechnen:
+        (A*B)^T = B^T*A^T, Summen werden summandenweise transponiert.
+        """
+        shape = (self.shape[1], self.shape[0])
+        if self.kind == "leaf":
+            return MatrixExpr._leaf(self.operands[0].T)
+        if self.kind == "product":
+            return MatrixExpr("product", shape, [e.transpose() for e in reversed(self.operands)],
+                              coef=self.coef)
+        return MatrixExpr("sum", shape, [e.transpose() for e in self.operands], list(self.coefs))
+
+    def multiplication_cost(self):
+        """Anzahl der skalaren Multiplikationen aller Produkte bei
+        optimaler Reihenfolge.
+        """
+        if self.kind == "leaf":
+            return 0
+        total = sum(e.multiplication_cost() for e in self.operands)
+        if self.kind == "product":
+            dims = [e.shape[0] for e in self.operands]+[self.shape[1]]
+            total += matrix_chain_order(dims)[0]
+        return total
+
+    def evaluate(self, backend=None):
+        """Werte den Ausdruck aus, Ergebnis ist eine neue Matrix.
+
+        backend wählt das Multiplikations-Backend wie bei
+        Matrix.matrix_mul(). Matrizen im Ausdruck werden erst jetzt
+        gelesen, aber nie verändert.
+        """
+        uses = {}
+        self._count_uses(uses)
+        evaluation = _Evaluation(uses, backend)
+        res, owned = evaluation.run(self)
+        if not owned:
+            res = res.copy()
+        return Matrix(res, copy=False)
+
+    def _count_uses(self, uses):
+        uses[id(self)] = uses.get(id(self), 0)+1
+        if uses[id(self)] == 1 and self.kind != "leaf":
+            for e in self.operands:
+                e._count_uses(uses)
+
+
+class _Evaluation:
+    """Zustand einer Auswertung von MatrixExpr: Puffer und die
+    Ergebnisse mehrfach verwendeter Teilausdrücke.
+
+    Jedes Zwischenergebnis ist ein Paar (Array, owned). Nur Arrays mit
+    owned=True gehören der Auswertung und dürfen überschrieben oder
+    zurück in den Puffer gegeben werden.
+    """
+    def __init__(self, uses, backend):
+        self.uses = uses
+        self.backend = Matrix.matmul_backend if backend is None else backend
+        self.pool = _BufferPool()
+        self.shared = {}
+
+    def release(self, array, owned):
+        if owned:
+            self.pool.release(array)
+
+    def run(self, node):
+        if node.kind == "leaf":
+            return node.operands[0], False
+        if id(node) in self.shared:
+            return self.shared[id(node)], False
+        if node.kind == "product":
+            res = self.product(node)
+        else:
+            res = self.linear(node)
+        if self.uses[id(node)] > 1:
+            self.shared[id(node)] = res[0]
+            return res[0], False
+        return res
+
+    def matmul(self, left, right):
+        """Produkt zweier Zwischenergebnisse in einen Puffer.
+        """
+        (a, a_owned), (b, b_owned) = left, right
+        backend = self.backend
+        if backend == "auto":
+            backend = select_matmul_backend(a.shape[0], a.shape[1], b.shape[1])
+        try:
+            func = MATMUL_BACKENDS[backend]
+        except KeyError:
+            raise MatrixError(f"Unknown multiplication backend '{backend}'")
+        if func in MATMUL_OUT_BACKENDS:
+            res = func(a, b, out=self.pool.get((a.shape[0], b.shape[1])))
+        else:
+            res = func(a, b)
+        self.release(a, a_owned)
+        self.release(b, b_owned)
+        return res, True
+
+    def scale(self, value, coef):
+        """value*coef, in place wenn möglich.
+        """
+        array, owned = value
+        target = array if owned else self.pool.get(array.shape)
+        np.multiply(array, coef, out=target)
+        return target, True
+
+    def product(self, node):
+        factors = [self.run(e) for e in node.operands]
+        dims = [f[0].shape[0] for f in factors]+[node.shape[1]]
+        if node.coef != 1.0:
+            # Skalar am kleinsten Faktor anbringen (oder am Ergebnis)
+            sizes = [f[0].size for f in factors]
+            smallest = int(np.argmin(sizes))
+            if sizes[smallest] < node.shape[0]*node.shape[1]:
+                factors[smallest] = self.scale(factors[smallest], node.coef)
+        order = matrix_chain_order(dims)[1]
+
+        def chain(part):
+            if isinstance(part, int):
+                return factors[part]
+            return self.matmul(chain(part[0]), chain(part[1]))
+
+        res = chain(order)
+        if node.coef != 1.0 and min(f[0].size for f in factors) >= res[0].size:
+            res = self.scale(res, node.coef)
+        return res
+
+    def linear(self, node):
+        # Summanden, die neue Arrays liefern, zuerst: einer davon wird
+        # zum Ergebnis-Array, in das alle anderen addiert werden
+        terms = sorted(zip(node.coefs, node.operands), key=lambda t: t[1].kind == "leaf")
+        acc = None
+        scratch = None
+        for c, e in terms:
+            value, owned = self.run(e)
+            if acc is None:
+                acc = self.scale((value, owned), c)[0] if c != 1.0 or not owned else value
+                continue
+            if c == 1.0:
+                np.add(acc, value, out=acc)
+            elif c == -1.0:
+                np.subtract(acc, value, out=acc)
+            else:
+                if owned:
+                    target = value
+                else:
+                    if scratch is None:
+                        scratch = self.pool.get(node.shape)
+                    target = scratch
+                np.multiply(value, c, out=target)
+                np.add(acc, target, out=acc)
+            self.release(value, owned)
+        if scratch is not None:
+            self.pool.release(scratch)
+        return acc, True
@@ -0,0 +1,733 @@
+#!/usr/bin/env python
+
+"""Unittests für die Datentypen aus sciprotypes.
+
+Die Tests aus den Notebooks (Kapitel 4 und 5) prüfen die
+Grundfunktionen. Hier werden die Erweiterungen getestet, die über die
+Aufgaben hinausgehen.
+"""
+
+import unittest
+import numpy as np
+import sciprotypes
+from sciprotypes import Matrix, MatrixError, Vector, VectorError, VectorBatch
+from sciprotypes import SparseMatrix, COOBuilder, MatrixExpr, lazy_evaluation, matrix_chain_order
+
+# Tests in der Reihenfolge, wie sie programmiert sind, ausführen
+unittest.TestLoader.sortTestMethodsUsing = None
+
+
+class TestVectorBatch(unittest.TestCase):
+    """
+    Unittests für VectorBatch - Vergleich mit den Vector-Operationen.
+    """
+
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.vs = [Vector([1, 2, 3]), Vector([3, 2, 1]), Vector([-1, 0, 4])]
+        self.ws = [Vector([0, 0, 1]), Vector([1, 1, 0]), Vector([2, -2, 2])]
+        self.a = VectorBatch.from_vectors(self.vs)
+        self.b = VectorBatch.from_vectors(self.ws)
+
+    def test_01_conversion(self):
+        """
+        Umwandlung von und zu Listen von Vektoren.
+        """
+        self.assertEqual(len(self.a), 3)
+        self.assertEqual(self.a.get_dim(), 3)
+        self.assertEqual(self.a.to_vectors(), self.vs)
+        self.assertEqual(self.a[1], self.vs[1])
+        self.assertEqual(len(self.a[1:]), 2)
+        self.assertTrue(self.a.vecs.flags['C_CONTIGUOUS'])
+
+    def test_02_arithmetic(self):
+        """
+        Addition, Subtraktion, Skalierung.
+        """
+        self.assertEqual((self.a+self.b).to_vectors(),
+                         [v+w for v, w in zip(self.vs, self.ws)])
+        self.assertEqual((self.a-self.b).to_vectors(),
+                         [v-w for v, w in zip(self.vs, self.ws)])
+        self.assertEqual((2*self.a).to_vectors(), [v*2 for v in self.vs])
+        self.assertEqual(self.a.skalar_multiplication([1, 0, -1])[2],
+                         -self.vs[2])
+        self.assertEqual((self.a+self.ws[0])[1], self.vs[1]+self.ws[0])
+
+    def test_03_metrics(self):
+        """
+        Skalarprodukt, Norm und Abstände.
+        """
+        pairs = list(zip(self.vs, self.ws))
+        self.assertTrue(np.allclose(self.a*self.b, [v*w for v, w in pairs]))
+        self.assertTrue(np.allclose(self.a.norm(), [v.norm() for v in self.vs]))
+        self.assertTrue(np.allclose(self.a.euclid_dist(self.b),
+                                    [v.euclid_dist(w) for v, w in pairs]))
+        self.assertTrue(np.allclose(self.a.manhattan_dist(self.b),
+                                    [v.manhattan_dist(w) for v, w in pairs]))
+        self.assertTrue(np.allclose(self.a.cosine_similarity(self.b),
+                                    [v.cosine_similarity(w) for v, w in pairs]))
+        self.assertTrue(np.allclose(self.a.euclid_dist(self.ws[0]),
+                                    [v.euclid_dist(self.ws[0]) for v in self.vs]))
+
+    def test_04_errors(self):
+        """
+        Fehlerbehandlung.
+        """
+        with self.assertRaises(VectorError):
+            VectorBatch.from_vectors([Vector([1, 2]), Vector([1, 2, 3])])
+        with self.assertRaises(VectorError):
+            self.a + Vector([1, 2])
+        with self.assertRaises(VectorError):
+            self.a + self.a[:2]
+        with self.assertRaises(VectorError):
+            VectorBatch([[0, 0, 0], [1, 0, 0]]).cosine_similarity(self.a[:2])
+
+
+class TestNeighbours(unittest.TestCase):
+    """
+    Unittests für Abstandsmatrizen und die Nachbarschaftssuche.
+    """
+
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        rng = np.random.default_rng(6)
+        self.vs = [Vector([1, 2, 3]), Vector([3, 2, 1]), Vector([-1, 0, 4])]
+        self.data = rng.random((500, 3))
+        self.queries = rng.random((40, 3))
+        self.high = rng.random((200, 50))
+
+    def test_01_pairwise(self):
+        """
+        Abstandsmatrizen stimmen mit den Vector-Methoden überein.
+        """
+        e = sciprotypes.pairwise_distances(self.vs)
+        m = sciprotypes.pairwise_distances(self.vs, metric="manhattan")
+        c = sciprotypes.pairwise_distances(self.vs, metric="cosine")
+        for i, v in enumerate(self.vs):
+            for j, w in enumerate(self.vs):
+                self.assertAlmostEqual(e[i, j], v.euclid_dist(w))
+                self.assertAlmostEqual(m[i, j], v.manhattan_dist(w))
+                self.assertAlmostEqual(c[i, j], 1-v.cosine_similarity(w))
+
+    def test_02_chunked(self):
+        """
+        Blockweise Berechnung liefert dieselbe Matrix.
+        """
+        full = sciprotypes.pairwise_distances(self.queries, self.data)
+        blocks = list(sciprotypes.pairwise_distances_chunked(
+            self.queries, self.data, chunk_size=7))
+        self.assertEqual(len(blocks), 6)
+        self.assertTrue(np.allclose(np.concatenate([b for s, b in blocks]), full))
+
+    def test_03_knn(self):
+        """
+        k-d-Baum und Brute-Force-Suche finden dieselben Nachbarn.
+        """
+        for metric in ["euclid", "manhattan"]:
+            d1, i1 = sciprotypes.knn(self.data, self.queries, 4, metric, "brute",
+                                     chunk_size=9)
+            d2, i2 = sciprotypes.knn(self.data, self.queries, 4, metric, "kdtree")
+            self.assertTrue(np.allclose(d1, d2))
+            self.assertTrue(np.array_equal(i1, i2))
+            full = sciprotypes.pairwise_distances(self.queries, self.data, metric)
+            self.assertTrue(np.allclose(d1, np.sort(full, axis=1)[:, :4]))
+        d, i = sciprotypes.knn(self.high, self.high[:5], 1)
+        self.assertTrue(np.array_equal(i[:, 0], np.arange(5)))
+        self.assertTrue(np.allclose(d, 0))
+        d, i = sciprotypes.knn(self.vs, self.vs, 10)
+        self.assertEqual(d.shape, (3, 3))
+
+    def test_04_errors(self):
+        """
+        Fehlerbehandlung.
+        """
+        with self.assertRaises(VectorError):
+            sciprotypes.pairwise_distances(self.data, self.high)
+        with self.assertRaises(VectorError):
+            sciprotypes.pairwise_distances(self.data, metric="chebyshev")
+        with self.assertRaises(VectorError):
+            sciprotypes.KDTree(self.data).query(self.queries, metric="cosine")
+        with self.assertRaises(VectorError):
+            sciprotypes.knn(self.data, self.queries, 0)
+
+
+class TestMatrixMul(unittest.TestCase):
+    """
+    Unittests für die Multiplikations-Backends.
+    """
+
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        rng = np.random.default_rng(1)
+        self.a = Matrix([[1, 2, 3], [4, 5, 6]])
+        self.b = Matrix([[7, 8], [9, 10], [11, 12]])
+        self.ab = Matrix([[58, 64], [139, 154]])
+        # Dimensionen, die keine Vielfachen der Blockgröße sind
+        self.c = Matrix(rng.random((37, 53)))
+        self.d = Matrix(rng.random((53, 29)))
+
+    def test_01_backends(self):
+        """
+        Alle Backends liefern dasselbe Ergebnis.
+        """
+        for backend in sciprotypes.MATMUL_BACKENDS:
+            self.assertEqual(self.a.matrix_mul(self.b, backend), self.ab)
+        expected = sciprotypes.matmul_naive(self.c.matrix, self.d.matrix)
+        self.assertTrue(np.allclose(self.c.matrix_mul(self.d, "numpy").matrix,
+                                    expected))
+        self.assertTrue(np.allclose(
+            sciprotypes.matmul_tiled(self.c.matrix, self.d.matrix, 8),
+            expected))
+
+    def test_02_operator(self):
+        """
+        Der *-Operator verwendet das eingestellte Backend.
+        """
+        self.assertEqual(self.a*self.b, self.ab)
+        try:
+            Matrix.matmul_backend = "tiled"
+            self.assertEqual(self.a*self.b, self.ab)
+        finally:
+            Matrix.matmul_backend = "auto"
+
+    def test_03_auto_selection(self):
+        """
+        Automatische Auswahl des Backends anhand der Größe.
+        """
+        self.assertEqual(sciprotypes.select_matmul_backend(10, 10, 10), "numpy")
+        old = sciprotypes.MATMUL_TILED_THRESHOLD
+        try:
+            sciprotypes.MATMUL_TILED_THRESHOLD = 100
+            self.assertEqual(sciprotypes.select_matmul_backend(10, 100, 10),
+                             "tiled")
+        finally:
+            sciprotypes.MATMUL_TILED_THRESHOLD = old
+
+    def test_04_errors(self):
+        """
+        Fehlerbehandlung.
+        """
+        with self.assertRaises(MatrixError):
+            self.a.matrix_mul(self.a)
+        with self.assertRaises(MatrixError):
+            self.a.matrix_mul(self.b, "quantum")
+
+
+class TestLUDecomposition(unittest.TestCase):
+    """
+    Unittests für die LU-Zerlegung.
+    """
+
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        self.a = Matrix([[0, 2, 1], [1, 1, 1], [2, 1, 3]])
+        self.s = Matrix([[1, 2], [2, 4]])
+        rng = np.random.default_rng(2)
+        self.r = Matrix(rng.random((20, 20)))
+
+    def test_01_factors(self):
+        """
+        P*A = L*U, die Ausgangsmatrix bleibt unverändert.
+        """
+        original = Matrix(self.a)
+        lu = self.a.lu()
+        self.assertEqual(self.a, original)
+        self.assertTrue(np.allclose((lu.get_p()*self.a).matrix,
+                                    (lu.get_l()*lu.get_u()).matrix))
+
+    def test_02_solve(self):
+        """
+        Lösen mit einer und mehreren rechten Seiten.
+        """
+        lu = self.a.lu()
+        x = lu.solve(Vector([3, 3, 6]))
+        self.assertTrue(type(x) is Vector)
+        self.assertTrue(np.allclose(x.vec, [1, 1, 1]))
+        b = Matrix(np.random.default_rng(3).random((3, 4)))
+        xs = lu.solve(b)
+        self.assertTrue(type(xs) is Matrix)
+        self.assertTrue(np.allclose((self.a*xs).matrix, b.matrix))
+        self.assertTrue(np.allclose(lu.solve([3, 3, 6]).vec, [1, 1, 1]))
+
+    def test_03_det_inverse(self):
+        """
+        Determinante und Inverse.
+        """
+        self.assertAlmostEqual(self.a.lu().det(), -3.0)
+        self.assertAlmostEqual(self.r.lu().det(), np.linalg.det(self.r.matrix))
+        inv = self.r.lu().inverse()
+        self.assertTrue(np.allclose((self.r*inv).matrix, np.eye(20)))
+
+    def test_04_singular(self):
+        """
+        Singuläre und nicht-quadratische Matrizen.
+        """
+        lu = self.s.lu()
+        self.assertEqual(lu.det(), 0.0)
+        with self.assertRaises(MatrixError):
+            lu.solve([1, 2])
+        with self.assertRaises(MatrixError):
+            lu.inverse()
+        with self.assertRaises(MatrixError):
+            Matrix([[1, 2, 3]]).lu()
+        with self.assertRaises(MatrixError):
+            self.a.lu().solve([1, 2])
+
+
+class TestDeterminant(unittest.TestCase):
+    """
+    Unittests für die Determinanten-Verfahren.
+    """
+
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        rng = np.random.default_rng(4)
+        self.i = Matrix(rng.integers(-9, 10, (7, 7)))
+        self.f = Matrix(rng.random((6, 6)))
+        self.z = Matrix([[0, 1, 2, 3], [0, 2, 4, 6], [1, 0, 0, 1], [2, 1, 1, 1]])
+        self.s3 = Matrix([[2, -1, 0], [1, 3, 4], [0, 5, 1]])
+
+    def test_01_methods_agree(self):
+        """
+        Alle Verfahren liefern (bis auf Rundung) dasselbe Ergebnis.
+        """
+        expected = np.linalg.det(self.i.matrix)
+        for method in ["auto", "lu", "bareiss", "cofactor"]:
+            self.assertAlmostEqual(self.i.determinant(method)/expected, 1.0)
+        self.assertEqual(self.s3.determinant("closed"), -33.0)
+        self.assertEqual(self.s3.determinant("cofactor"), -33.0)
+        self.assertEqual(self.s3.compute_determinant_simple(), -33.0)
+        self.assertAlmostEqual(self.f.determinant(), np.linalg.det(self.f.matrix))
+        self.assertAlmostEqual(self.f.determinant("cofactor"),
+                               np.linalg.det(self.f.matrix))
+
+    def test_02_exact(self):
+        """
+        Bareiss rechnet exakt und braucht einen Zeilentausch bei 0-Pivot.
+        """
+        d = self.i.determinant("bareiss")
+        self.assertTrue(type(d) is int)
+        self.assertEqual(d, self.i.determinant("cofactor"))
+        self.assertEqual(self.z.determinant("bareiss"), 0)
+        self.assertEqual(Matrix([[0, 1], [1, 0]]).determinant("bareiss"), -1)
+        # "auto" liefert für ganzzahlige Matrizen immer einen int
+        for m in (self.s3, self.i, Matrix(np.eye(2))):
+            self.assertTrue(type(m.determinant()) is int)
+        self.assertTrue(type(Matrix([[0.5, 1], [1, 0]]).determinant()) is float)
+        with self.assertRaises(MatrixError):
+            self.f.determinant("bareiss")
+
+    def test_03_large_cofactor(self):
+        """
+        Entwicklungssatz mit gemerkten Unterdeterminanten bei n=12.
+        """
+        m = Matrix(np.random.default_rng(5).integers(-3, 4, (12, 12)))
+        self.assertEqual(m.determinant("cofactor"), m.determinant("bareiss"))
+
+    def test_04_errors(self):
+        """
+        Fehlerbehandlung.
+        """
+        with self.assertRaises(MatrixError):
+            Matrix([[1, 2, 3]]).determinant()
+        with self.assertRaises(MatrixError):
+            self.i.determinant("closed")
+        with self.assertRaises(MatrixError):
+            self.i.determinant("magic")
+
+
+class TestSparseMatrix(unittest.TestCase):
+    """
+    Unittests für dünn besetzte Matrizen im CSR-Format.
+    """
+
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        rng = np.random.default_rng(6)
+        self.d = rng.random((12, 9))
+        self.d[self.d < 0.7] = 0
+        self.e = rng.random((9, 7))
+        self.e[self.e < 0.6] = 0
+        self.s = SparseMatrix(self.d)
+
+    @staticmethod
+    def laplace(n):
+        """
+        Hilfsfunktion (KEIN TEST): 1d-Laplace-Matrix tridiag(-1, 2, -1).
+        """
+        builder = COOBuilder(n, n)
+        i = np.arange(n)
+        builder.add_entries(i, i, np.full(n, 2.0))
+        builder.add_entries(i[1:], i[:-1], np.full(n-1, -1.0))
+        builder.add_entries(i[:-1], i[1:], np.full(n-1, -1.0))
+        return builder.build()
+
+    def test_01_conversion(self):
+        """
+        Umwandlung von und nach Matrix und Vector, COO mit Duplikaten.
+        """
+        self.assertEqual(self.s.to_dense(), Matrix(self.d))
+        self.assertEqual(Matrix(self.d).to_sparse(), self.s)
+        self.assertTrue(Matrix(self.d) == self.s)
+        self.assertTrue(self.s == Matrix(self.d))
+        self.assertFalse(Matrix(self.d) == self.s.transpose())
+        self.assertFalse(Matrix(self.d) == self.d)
+        self.assertEqual(self.s.nnz(), np.count_nonzero(self.d))
+        self.assertEqual(self.s.get_type(), (12, 9))
+        self.assertEqual(self.s[3, 4], self.d[3, 4])
+        self.assertEqual(self.s[-1, -2], self.d[-1, -2])
+        with self.assertRaises(IndexError):
+            self.s[12, 0]
+        column = SparseMatrix(Vector([0, 1.5, 0]))
+        self.assertEqual(column.get_type(), (3, 1))
+        self.assertEqual(column.to_vector(), Vector([0, 1.5, 0]))
+        coo = SparseMatrix.from_coo([0, 1, 0, 1], [2, 0, 2, 1], [1, 2, 3, 0], (2, 3))
+        self.assertEqual(coo.to_dense(), Matrix([[0, 0, 4], [2, 0, 0]]))
+        self.assertEqual(coo.nnz(), 2)
+        builder = COOBuilder(2, 2)
+        builder.add(1, 1, 2.0)
+        builder.add(1, 1, -2.0)
+        self.assertTrue(builder.build().is_zero())
+
+    def test_02_arithmetic(self):
+        """
+        Transponieren, Addition, Subtraktion, Skalare.
+        """
+        np.testing.assert_array_equal(self.s.transpose().to_dense().matrix, self.d.T)
+        self.assertEqual(self.s.transpose().transpose(), self.s)
+        np.testing.assert_allclose((self.s+self.s).to_dense().matrix, 2*self.d)
+        self.assertTrue((self.s-self.s).is_zero())
+        self.assertTrue((0*self.s).is_zero())
+        np.testing.assert_allclose((-self.s*2.5).to_dense().matrix, -2.5*self.d)
+        ones = Matrix(np.ones((12, 9)))
+        self.assertEqual(self.s+ones, Matrix(self.d+1))
+        self.assertEqual(ones+self.s, Matrix(self.d+1))
+        self.assertEqual(ones-self.s, Matrix(1-self.d))
+        with self.assertRaises(MatrixError):
+            self.s+self.s.transpose()
+
+    def test_03_products(self):
+        """
+        Produkte mit dünnen und dichten Matrizen sowie Vektoren.
+        """
+        expected = self.d@self.e
+        np.testing.assert_allclose((self.s*SparseMatrix(self.e)).to_dense().matrix, expected)
+        np.testing.assert_allclose((self.s*Matrix(self.e)).matrix, expected)
+        np.testing.assert_allclose((Matrix(self.e.T)*self.s.transpose()).matrix, expected.T)
+        v = np.arange(9.0)
+        np.testing.assert_allclose((self.s*Vector(v)).vec, self.d@v)
+        self.assertEqual(SparseMatrix.identity(12)*self.s, self.s)
+        with self.assertRaises(MatrixError):
+            self.s*self.s
+        with self.assertRaises(MatrixError):
+            self.s*Vector([1, 2])
+
+    def test_04_solve(self):
+        """
+        Iterative Löser für symmetrische und unsymmetrische Systeme.
+        """
+        a = self.laplace(200)
+        x = np.linspace(0, 1, 200)
+        b = a*Vector(x)
+        np.testing.assert_allclose(a.solve(b, "cg").vec, x, atol=1e-8)
+        np.testing.assert_allclose(a.solve(b).vec, x, atol=1e-8)
+        u = a+SparseMatrix.from_coo(np.arange(199), np.arange(1, 200), np.full(199, 0.5), (200, 200))
+        self.assertFalse(u.is_symmetric())
+        np.testing.assert_allclose(u.solve(u*Vector(x)).vec, x, atol=1e-8)
+        np.testing.assert_allclose(u.solve(u*Vector(x), "bicgstab").vec, x, atol=1e-8)
+        with self.assertRaises(MatrixError):
+            self.s.solve(np.ones(12))
+        with self.assertRaises(MatrixError):
+            a.solve(np.ones(200), "magic")
+
+
+class TestMatrixViews(unittest.TestCase):
+    """
+    Unittests für Sichten, In-place-Operatoren und out=.
+    """
+
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        rng = np.random.default_rng(7)
+        self.a = Matrix(rng.random((4, 5)))
+        self.b = Matrix(rng.random((4, 5)))
+        self.q = Matrix(rng.random((5, 5)))
+
+    def test_01_views(self):
+        """
+        Transponierte und Teilbereiche teilen die Daten, copy() nicht.
+        """
+        t = self.a.transpose()
+        self.assertTrue(np.shares_memory(t.matrix, self.a.matrix))
+        t[1, 2] = 42
+        self.assertEqual(self.a[2, 1], 42)
+        c = self.a.transpose().copy()
+        c[0, 0] = -1
+        self.assertNotEqual(self.a[0, 0], -1)
+        part = self.a[1:3, :]
+        self.assertEqual(part.get_type(), (2, 5))
+        part[0, 0] = 7
+        self.assertEqual(self.a[1, 0], 7)
+        self.assertEqual(self.a[-1, :].get_type(), (1, 5))
+        shared = Matrix(self.a, copy=False)
+        self.assertTrue(shared.matrix is self.a.matrix)
+        self.assertFalse(np.shares_memory(Matrix(self.a).matrix, self.a.matrix))
+        self.a[0, :] = 0
+        self.assertTrue(self.a[0, :].is_zero())
+
+    def test_02_inplace(self):
+        """
+        +=, -= und *= ändern die Matrix direkt, auch über Sichten.
+        """
+        expected = self.a.matrix+self.b.matrix
+        data = self.a.matrix
+        self.a += self.b
+        self.assertTrue(self.a.matrix is data)
+        np.testing.assert_allclose(self.a.matrix, expected)
+        self.a -= self.b
+        self.a *= 2
+        np.testing.assert_allclose(self.a.matrix, 2*(expected-self.b.matrix))
+        expected = self.a.matrix@self.q.matrix
+        self.a *= self.q
+        self.assertTrue(self.a.matrix is data)
+        np.testing.assert_allclose(self.a.matrix, expected)
+        before = self.a.matrix.copy()
+        self.a[1:3, 1:3] += Matrix(np.ones((2, 2)))
+        before[1:3, 1:3] += 1
+        np.testing.assert_array_equal(self.a.matrix, before)
+        self.a += SparseMatrix([[0, 0, 0, 0, 1]]*4)
+        before[:, 4] += 1
+        np.testing.assert_array_equal(self.a.matrix, before)
+
+    def test_03_out(self):
+        """
+        Ergebnisse werden in out geschrieben, auch wenn out ein Faktor ist.
+        """
+        r = Matrix(np.zeros((4, 5)))
+        res = self.a.add(self.b, out=r).subtract(self.b, out=r).skalar_multiplication(3, out=r)
+        self.assertTrue(res is r)
+        np.testing.assert_allclose(r.matrix, 3*self.a.matrix)
+        self.assertTrue(self.a.negate(out=r) is r)
+        np.testing.assert_array_equal(r.matrix, -self.a.matrix)
+        expected = self.a.matrix@self.q.matrix
+        for backend in ["numpy", "tiled", "naive"]:
+            r = self.a.copy()
+            self.assertTrue(r.matrix_mul(self.q, backend, out=r) is r)
+            np.testing.assert_allclose(r.matrix, expected)
+            p = Matrix(np.zeros((4, 5)))
+            self.a.matrix_mul(self.q, backend, out=p)
+            np.testing.assert_allclose(p.matrix, expected)
+
+    def test_04_errors(self):
+        """
+        Fehlerbehandlung.
+        """
+        with self.assertRaises(MatrixError):
+            self.a.add(self.b, out=Matrix(np.zeros((5, 4))))
+        with self.assertRaises(MatrixError):
+            self.a.matrix_mul(self.q, out=self.b.transpose())
+        with self.assertRaises(MatrixError):
+            self.a *= self.b
+        with self.assertRaises(MatrixError):
+            self.a *= "x"
+        with self.assertRaises(MatrixError):
+            self.a[0:2, :] = Matrix(np.ones((3, 5)))
+        with self.assertRaises(IndexError):
+            self.a[4, :]
+
+
+class TestMatrixExpr(unittest.TestCase):
+    """
+    Unittests für die verzögerte Auswertung von Matrix-Ausdrücken.
+    """
+
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        rng = np.random.default_rng(8)
+        self.a = Matrix(rng.random((20, 3)))
+        self.b = Matrix(rng.random((3, 30)))
+        self.c = Matrix(rng.random((20, 30)))
+        self.d = Matrix(rng.random((20, 30)))
+        self.chain = [Matrix(rng.random(shape)) for shape in
+                      [(40, 2), (2, 50), (50, 3), (3, 60), (60, 1)]]
+
+    def test_01_chain_order(self):
+        """
+        Optimale Klammerung per dynamischer Programmierung.
+        """
+        self.assertEqual(matrix_chain_order([10, 100, 5, 50]), (7500, ((0, 1), 2)))
+        self.assertEqual(matrix_chain_order([10, 20]), (0, 0))
+        cost, order = matrix_chain_order([30, 35, 15, 5, 10, 20, 25])
+        self.assertEqual(cost, 15125)
+        self.assertEqual(order, ((0, (1, 2)), ((3, 4), 5)))
+
+    def test_02_evaluate(self):
+        """
+        Ausdrücke liefern dasselbe wie die sofortige Auswertung.
+        """
+        a, b, c, d = self.a.matrix, self.b.matrix, self.c.matrix, self.d.matrix
+        with lazy_evaluation():
+            expr = self.a*self.b + self.c*2 - self.d
+            neg = -self.c + 3*self.d
+        self.assertFalse(Matrix.lazy_mode)
+        self.assertTrue(isinstance(expr, MatrixExpr))
+        self.assertEqual(expr.get_type(), (20, 30))
+        np.testing.assert_allclose(expr.evaluate().matrix, a@b+2*c-d)
+        np.testing.assert_allclose(neg.evaluate().matrix, 3*d-c)
+        np.testing.assert_allclose((self.c - self.a*self.b.lazy()*0.5).evaluate().matrix,
+                                   c-0.5*(a@b))
+        np.testing.assert_allclose(expr.transpose().evaluate().matrix, (a@b+2*c-d).T)
+        expected = self.chain[0].matrix
+        for m in self.chain[1:]:
+            expected = expected@m.matrix
+        lazy = self.chain[0].lazy()
+        for m in self.chain[1:]:
+            lazy = lazy*m
+        for backend in ["numpy", "tiled", "naive"]:
+            np.testing.assert_allclose((2*lazy).evaluate(backend).matrix, 2*expected)
+
+    def test_03_buffers(self):
+        """
+        Gemeinsame Teilausdrücke, Eingaben bleiben unverändert.
+        """
+        before = [m.matrix.copy() for m in (self.a, self.b, self.c)]
+        product = self.a.lazy()*self.b
+        expr = product + product*2 - self.c - self.c
+        np.testing.assert_allclose(expr.evaluate().matrix,
+                                   3*(before[0]@before[1])-2*before[2])
+        for m, old in zip((self.a, self.b, self.c), before):
+            np.testing.assert_array_equal(m.matrix, old)
+        result = self.c.lazy().evaluate()
+        self.assertFalse(np.shares_memory(result.matrix, self.c.matrix))
+        lazy = self.chain[0].lazy()
+        for m in self.chain[1:]:
+            lazy = lazy*m
+        self.assertEqual(lazy.multiplication_cost(), matrix_chain_order([40, 2, 50, 3, 60, 1])[0])
+
+    def test_04_errors(self):
+        """
+        Fehlerbehandlung beim Aufbau des Ausdrucks.
+        """
+        with self.assertRaises(MatrixError):
+            self.a.lazy()*self.c
+        with self.assertRaises(MatrixError):
+            self.a.lazy()+self.c
+        with self.assertRaises(MatrixError):
+            self.a.lazy()+"x"
+        with self.assertRaises(MatrixError):
+            (self.a.lazy()*self.b).evaluate("magic")
+
+
+class TestRowEchelonForm(unittest.TestCase):
+    """
+    Unittests für Zeilenstufenform, Rang, Kern und Ausgleichsrechnung.
+    """
+
+    def setUp(self):
+        """
+        Initialisiere Variablen für den Test.
+        """
+        rng = np.random.default_rng(9)
+        # Rang 3, dazu eine Nullspalte
+        self.low = rng.standard_normal((6, 3))@rng.standard_normal((3, 8))
+        self.low[:, 2] = 0
+        self.tall = rng.standard_normal((9, 4))
+        self.b = rng.standard_normal(9)
+
+    def test_01_rref(self):
+        """
+        RREF mit übersprungenen Spalten, Eingabe bleibt unverändert.
+        """
+        a = Matrix([[0, 1, 2], [0, 2, 4], [1, 0, 0], [2, 1, 1]])
+        before = a.matrix.copy()
+        echelon = a.row_echelon()
+        self.assertEqual(echelon.pivots, [0, 1, 2])
+        np.testing.assert_array_equal(a.matrix, before)
+        a = Matrix([[0, 1, 2, 3], [0, 2, 4, 7], [0, 3, 6, 9]])
+        echelon = a.row_echelon()
+        self.assertEqual(echelon.pivots, [1, 3])
+        self.assertEqual(echelon.free_columns(), [0, 2])
+        np.testing.assert_allclose(a.rref().matrix, [[0, 1, 2, 0], [0, 0, 0, 1], [0, 0, 0, 0]],
+                                   atol=1e-15)
+        self.assertEqual(Matrix(np.zeros((2, 3))).rank(), 0)
+
+    def test_02_rank_tolerance(self):
+        """
+        Rang mit Rundungsfehlern und mit vorgegebener Toleranz.
+        """
+        before = self.low.copy()
+        m = Matrix(self.low)
+        self.assertEqual(m.rank(), 3)
+        self.assertEqual(m.rank(), np.linalg.matrix_rank(self.low))
+        self.assertEqual(m.transpose().rank(), 3)
+        np.testing.assert_array_equal(m.matrix, before)
+        almost = Matrix([[1, 1], [1, 1+1e-10]])
+        self.assertEqual(almost.rank(), 2)
+        self.assertEqual(almost.rank(tol=1e-8), 1)
+
+    def test_03_subspaces(self):
+        """
+        Kern und Spaltenraum passen zu Rang und Matrix.
+        """
+        m = Matrix(self.low)
+        null = m.nullspace()
+        self.assertEqual(null.get_type(), (8, 5))
+        np.testing.assert_allclose((m*null).matrix, 0, atol=1e-12)
+        self.assertEqual(null.rank(), 5)
+        columns = m.column_space()
+        self.assertEqual(columns.get_type(), (6, 3))
+        self.assertEqual(columns.rank(), 3)
+        self.assertEqual(Matrix(np.hstack((columns.matrix, self.low))).rank(), 3)
+        self.assertEqual(Matrix(np.eye(3)).nullspace().get_type(), (3, 0))
+
+    def test_04_least_squares(self):
+        """
+        Ausgleichsrechnung, auch mit Rangdefekt (kürzeste Lösung).
+        """
+        a = Matrix(self.tall)
+        expected = np.linalg.lstsq(self.tall, self.b, rcond=None)[0]
+        np.testing.assert_allclose(a.solve_least_squares(Vector(self.b)).vec, expected)
+        np.testing.assert_allclose(a.solve_least_squares(list(self.b)).vec, expected)
+        rhs = np.random.default_rng(10).standard_normal((6, 2))
+        expected = np.linalg.lstsq(self.low, rhs, rcond=None)[0]
+        np.testing.assert_allclose(Matrix(self.low).solve_least_squares(Matrix(rhs)).matrix,
+                                   expected, atol=1e-12)
+        with self.assertRaises(MatrixError):
+            a.solve_least_squares([1, 2, 3])
+        with self.assertRaises(MatrixError):
+            a.solve_least_squares(1.0)
+
+
+if __name__ == '__main__':
+    # Durchführung der Tests
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestVectorBatch))
+    suite.addTests(loader.loadTestsFromTestCase(TestNeighbours))
+    suite.addTests(loader.loadTestsFromTestCase(TestMatrixMul))
+    suite.addTests(loader.loadTestsFromTestCase(TestLUDecomposition))
+    suite.addTests(loader.loadTestsFromTestCase(TestDeterminant))
+    suite.addTests(loader.loadTestsFromTestCase(TestSparseMatrix))
+    suite.addTests(loader.loadTestsFromTestCase(TestMatrixViews))
+    suite.addTests(loader.loadTestsFromTestCase(TestMatrixExpr))
+    suite.addTests(loader.loadTestsFromTestCase(TestRowEchelonForm))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)